@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Batch One-Way ANOVA Engine for the IIT Internet Connectivity Study
+Computes group sufficient statistics (count, sum, sum of squares) for every
+dependent column in one grouped pass per factor, and derives F, p and
+eta-squared for all independent/dependent pairs as NumPy arrays. Pairwise
+cross-product sums give correlation matrices the same blocked way.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+class GroupStats(NamedTuple):
+    """Per-level sufficient statistics of several dependents for one factor.
+
+    ``n``, ``s`` and ``ss`` have shape (levels, dependents); a dependent's
+    missing values are simply left out of its own counts.
+    """
+    factor: str
+    levels: np.ndarray
+    dependents: list
+    n: np.ndarray
+    s: np.ndarray
+    ss: np.ndarray
+
+
+def flatten_vars(variables):
+    """Accept a category dict (as in perform_anova.py) or a plain list of columns."""
+    if isinstance(variables, dict):
+        return [col for cols in variables.values() for col in cols]
+    return list(variables)
+
+
+def factorize_levels(values):
+    """Return (codes, levels) with levels sorted and missing factor values coded -1."""
+    codes, levels = pd.factorize(pd.Series(values), sort=True)
+    return codes, np.asarray(levels)
+
+
+BLOCK_ROWS = 1 << 16
+
+
+def mask_groups(valid):
+    """Group column indices of a (rows, cols) validity mask by identical missing patterns.
+
+    Returns a list of (row_mask, column_indices); columns in one group share the
+    same complete cases and can be processed together.
+    """
+    groups = {}
+    for j in range(valid.shape[1]):
+        groups.setdefault(valid[:, j].tobytes(), []).append(j)
+    return [(valid[:, cols[0]], cols) for cols in groups.values()]
+
+
+def multi_group_stats(df, factors, dependents, block_rows=BLOCK_ROWS):
+    """Group statistics of all ``dependents`` for several factors in one blocked pass.
+
+    Each row block is converted to float once and shared by every factor's
+    one-hot product. A factor is never used as its own dependent.
+    Returns a dict mapping factor name to GroupStats.
+    """
+    factors = list(dict.fromkeys(flatten_vars(factors)))
+    dependents = list(dict.fromkeys(flatten_vars(dependents)))
+    m = len(dependents)
+    coded = {factor: factorize_levels(df[factor]) for factor in factors}
+    totals = {factor: np.zeros((len(levels), 3 * m)) for factor, (_, levels) in coded.items()}
+    y_all = df[dependents].to_numpy()
+    for start in range(0, len(df), block_rows):
+        y = y_all[start:start + block_rows].astype(np.float64)
+        valid = ~np.isnan(y)
+        y[~valid] = 0.0
+        # Counts, sums and sums of squares share one matrix product per factor
+        stacked = np.concatenate([valid, y, y * y], axis=1)
+        for factor, (codes, levels) in coded.items():
+            level_ids = np.arange(len(levels))[:, None]
+            onehot = (level_ids == codes[start:start + block_rows]).astype(np.float64)
+            totals[factor] += onehot @ stacked
+
+    result = {}
+    for factor, (_, levels) in coded.items():
+        keep = [j for j, dep in enumerate(dependents) if dep != factor]
+        block = totals[factor]
+        result[factor] = GroupStats(
+            factor=factor,
+            levels=levels,
+            dependents=[dependents[j] for j in keep],
+            n=block[:, :m][:, keep],
+            s=block[:, m:2 * m][:, keep],
+            ss=block[:, 2 * m:][:, keep],
+        )
+    return result
+
+
+def group_stats(df, factor, dependents, block_rows=BLOCK_ROWS):
+    """Compute count / sum / sum-of-squares of each dependent per level of ``factor``."""
+    return multi_group_stats(df, [factor], dependents, block_rows)[factor]
+
+
+def cross_product_corr(df, columns, block_rows=BLOCK_ROWS):
+    """Pearson correlation matrix from accumulated pairwise cross-product sums.
+
+    Each pair uses the rows where both columns are present, as
+    ``DataFrame.corr`` does, but the rows are only touched to accumulate
+    counts, sums, sums of squares and cross products, block by block.
+    """
+    k = len(columns)
+    n = np.zeros((k, k))
+    s = np.zeros((k, k))    # s[i, j]: sum of column i over rows where j is present
+    ss = np.zeros((k, k))
+    xy = np.zeros((k, k))
+    values = df[columns].to_numpy()
+    for start in range(0, len(df), block_rows):
+        x = values[start:start + block_rows].astype(np.float64)
+        valid = ~np.isnan(x)
+        x[~valid] = 0.0
+        present = valid.astype(np.float64)
+        n += present.T @ present
+        s += x.T @ present
+        ss += (x * x).T @ present
+        xy += x.T @ x
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * xy - s * s.T
+        corr = cov / np.sqrt((n * ss - s * s) * (n * ss - s * s).T)
+    return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=columns, columns=columns)
+
+
+def oneway_from_stats(n, s, ss):
+    """Derive one-way ANOVA results from group sufficient statistics.
+
+    ``n``, ``s`` and ``ss`` share a shape (..., levels, dependents); the group
+    axis is reduced. Levels with no observations do not count as groups, which
+    mirrors passing only non-empty groups to ``scipy.stats.f_oneway``.
+
+    Returns a dict of arrays: F, p, eta_squared, df_between, df_within, N.
+    """
+    n = np.asarray(n, dtype=np.float64)
+    s = np.asarray(s, dtype=np.float64)
+    ss = np.asarray(ss, dtype=np.float64)
+
+    total_n = n.sum(axis=-2)
+    groups = (n > 0).sum(axis=-2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correction = s.sum(axis=-2) ** 2 / total_n
+        ss_total = ss.sum(axis=-2) - correction
+        ss_between = np.where(n > 0, s * s / np.where(n > 0, n, 1), 0.0).sum(axis=-2) - correction
+        # Both terms are exact for integer scores; clip the rounding residue
+        ss_between = np.clip(ss_between, 0.0, None)
+        ss_within = np.clip(ss_total - ss_between, 0.0, None)
+
+        df_between = groups - 1
+        df_within = total_n - groups
+        f_stat = (ss_between / df_between) / (ss_within / df_within)
+        p_value = stats.f.sf(f_stat, df_between, df_within)
+        eta_squared = ss_between / ss_total
+
+    # Too few groups or residual degrees of freedom: no test, like f_oneway
+    undefined = (df_between < 1) | (df_within < 1)
+    f_stat = np.where(undefined, np.nan, f_stat)
+    p_value = np.where(undefined | np.isnan(f_stat), np.nan, p_value)
+
+    return {
+        'F': f_stat,
+        'p': p_value,
+        'eta_squared': eta_squared,
+        'df_between': df_between,
+        'df_within': df_within,
+        'N': total_n,
+    }
+
+
+RESULT_COLUMNS = ['Independent_Variable', 'Dependent_Variable', 'F_statistic', 'P_value',
+                  'Significant', 'Effect_Size', 'df_between', 'df_within', 'N']
+
+
+def results_frame(stats_list, alpha=0.05):
+    """Turn GroupStats for one or more factors into an anova_results.csv style table."""
+    frames = []
+    for gs in stats_list:
+        if not gs.dependents:
+            continue
+        res = oneway_from_stats(gs.n, gs.s, gs.ss)
+        frames.append(pd.DataFrame({
+            'Independent_Variable': gs.factor,
+            'Dependent_Variable': gs.dependents,
+            'F_statistic': res['F'],
+            'P_value': res['p'],
+            'Significant': res['p'] < alpha,
+            'Effect_Size': res['eta_squared'],
+            'df_between': res['df_between'],
+            'df_within': res['df_within'].astype(np.int64),
+            'N': res['N'].astype(np.int64),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def batch_oneway(df, independent_vars, dependent_vars, alpha=0.05):
+    """Run one-way ANOVA for every independent × dependent pair.
+
+    Both arguments may be category dicts or column lists. Returns a DataFrame
+    in the anova_results.csv schema plus degrees of freedom and sample size.
+    """
+    return results_frame(multi_group_stats(df, independent_vars, dependent_vars).values(), alpha)
+
+
+def group_summary(gs):
+    """Per-level n, mean and sample std of each dependent as a long DataFrame."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = gs.s / gs.n
+        var = (gs.ss - gs.s * mean) / (gs.n - 1)
+    rows = []
+    for j, dep in enumerate(gs.dependents):
+        for i, level in enumerate(gs.levels):
+            if gs.n[i, j] > 0:
+                rows.append({
+                    'Dependent_Variable': dep,
+                    'Level': level,
+                    'n': int(gs.n[i, j]),
+                    'mean': mean[i, j],
+                    'std': np.sqrt(max(var[i, j], 0.0)) if gs.n[i, j] > 1 else np.nan,
+                })
+    return pd.DataFrame(rows)
+
+
+def adjust_pvalues(p_values, method='holm'):
+    """Vectorized multiple-testing correction over a whole result array.
+
+    ``method`` is 'holm' (family-wise error) or 'fdr_bh' (Benjamini-Hochberg
+    false discovery rate). NaN p-values are left as NaN and not counted.
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full_like(p_values, np.nan)
+    finite = np.flatnonzero(~np.isnan(p_values))
+    m = len(finite)
+    if m == 0:
+        return adjusted
+    order = np.argsort(p_values[finite], kind='stable')
+    ranked = p_values[finite][order]
+    if method == 'holm':
+        scaled = np.maximum.accumulate((m - np.arange(m)) * ranked)
+    elif method == 'fdr_bh':
+        scaled = np.minimum.accumulate((m / np.arange(1, m + 1) * ranked)[::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown correction method: {method}")
+    adjusted[finite[order]] = np.minimum(scaled, 1.0)
+    return adjusted
+
+
+def _category_lookup(variables):
+    if isinstance(variables, dict):
+        return {col: category for category, cols in variables.items() for col in cols}
+    return {}
+
+
+def annotate_sweep(results, independent_vars, dependent_vars, alpha=0.05):
+    """Add variable categories and Holm / Benjamini-Hochberg columns to a result table."""
+    results = results.copy()
+    independent_categories = _category_lookup(independent_vars)
+    dependent_categories = _category_lookup(dependent_vars)
+    categories = {**dependent_categories, **independent_categories}
+    results.insert(2, 'Independent_Category',
+                   results['Independent_Variable'].map(categories).fillna('Score'))
+    results.insert(3, 'Dependent_Category',
+                   results['Dependent_Variable'].map(categories).fillna('Score'))
+
+    p_values = results['P_value'].to_numpy()
+    results['P_holm'] = adjust_pvalues(p_values, 'holm')
+    results['P_fdr_bh'] = adjust_pvalues(p_values, 'fdr_bh')
+    results['Significant_Holm'] = results['P_holm'] < alpha
+    results['Significant_BH'] = results['P_fdr_bh'] < alpha
+    return results
+
+
+def sweep_variables(columns, independent_vars, dependent_vars, score_pairs=False):
+    """Factor and dependent column lists of a sweep, optionally adding every _Score column."""
+    factors = flatten_vars(independent_vars)
+    dependents = flatten_vars(dependent_vars)
+    if score_pairs:
+        score_cols = [col for col in columns if col.endswith('_Score')]
+        factors = list(dict.fromkeys(factors + score_cols))
+        dependents = list(dict.fromkeys(dependents + score_cols))
+    return factors, dependents
+
+
+def anova_sweep(df, independent_vars, dependent_vars, score_pairs=False, alpha=0.05):
+    """Evaluate every cross-category pair in one batched computation.
+
+    With ``score_pairs`` every ``_Score`` column is also tested against every
+    other ``_Score`` column. Holm and Benjamini-Hochberg adjusted p-values are
+    added over the full result set.
+    """
+    factors, dependents = sweep_variables(df.columns, independent_vars, dependent_vars, score_pairs)
+    results = batch_oneway(df, factors, dependents, alpha=alpha)
+    return annotate_sweep(results, independent_vars, dependent_vars, alpha)
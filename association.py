@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Association Matrix for the IIT Internet Connectivity Study
+Spearman's rho, Kendall's tau-b and Cramér's V for every pair of score
+columns, as suits ordinal 1-5 answers. Each column is ranked once and the
+full Spearman matrix is one blocked matrix product of the ranks; tau-b and
+Cramér's V come from each pair's contingency table (a few levels by a few
+levels), so a pair costs one pass over the rows to count and then only
+work on the table, never a comparison of every pair of responses.
+
+Results are cached per pair on the two columns' data, so the plots and the
+report reuse them until a column changes.
+"""
+
+import argparse
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from anova_engine import BLOCK_ROWS, cross_product_corr, factorize_levels
+from result_cache import CACHE_DIR, ResultCache, dataset_fingerprint, result_key, write_results
+
+ASSOCIATION_FILE = 'association_results.csv'
+ASSOCIATION_KEYS = ['Variable_1', 'Variable_2']
+# Columns with more distinct values get Spearman's rho only (no contingency table)
+MAX_LEVELS = 12
+STATISTICS = ['Spearman_rho', 'Spearman_P', 'Kendall_Tau_b', 'Kendall_P', 'Cramers_V', 'Chi2_P', 'N']
+
+
+def midranks(counts):
+    """Average rank of every level from the level counts along the last axis (ties share their mean rank)."""
+    counts = np.asarray(counts, dtype=np.float64)
+    return np.cumsum(counts, axis=-1) - (counts - 1) / 2
+
+
+def rank_column(codes, n_levels):
+    """Average ranks of one factorized column; missing values (code -1) stay NaN."""
+    present = codes >= 0
+    ranks = np.full(len(codes), np.nan)
+    ranks[present] = midranks(np.bincount(codes[present], minlength=n_levels))[codes[present]]
+    return ranks
+
+
+def spearman_pvalue(rho, n):
+    """Two-sided p-value of Spearman's rho from the t distribution with n - 2 df, as ``scipy.stats.spearmanr``."""
+    rho, n = np.asarray(rho, dtype=np.float64), np.asarray(n, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = rho * np.sqrt((n - 2) / ((1 - rho) * (1 + rho)))
+        return 2 * stats.t.sf(np.abs(t), n - 2)
+
+
+def _after(x, axis):
+    """Sum of the entries after each position along ``axis``."""
+    return x.sum(axis=axis, keepdims=True) - np.cumsum(x, axis=axis)
+
+
+def table_statistics(tables):
+    """Spearman, Kendall tau-b and Cramér's V of contingency tables of shape (..., levels, levels).
+
+    Empty rows and columns (padding) are ignored. p-values follow SciPy:
+    ``spearmanr``, the asymptotic tie-corrected ``kendalltau`` and an
+    uncorrected Pearson chi-square test.
+    """
+    tables = np.asarray(tables, dtype=np.float64)
+    n = tables.sum(axis=(-2, -1))
+    rows, cols = tables.sum(axis=-1), tables.sum(axis=-2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Spearman: Pearson correlation of the level midranks, weighted by the counts
+        a = midranks(rows) - (n[..., None] + 1) / 2
+        b = midranks(cols) - (n[..., None] + 1) / 2
+        cov = np.einsum('...i,...ij,...j->...', a, tables, b)
+        rho = cov / np.sqrt((rows * a * a).sum(-1) * (cols * b * b).sum(-1))
+
+        # Kendall: pairs in a later row and a later (concordant) or earlier (discordant) column
+        later_rows = _after(tables, -2)
+        concordant = (tables * _after(later_rows, -1)).sum(axis=(-2, -1))
+        discordant = (tables * (np.cumsum(later_rows, axis=-1) - later_rows)).sum(axis=(-2, -1))
+        total = n * (n - 1) / 2
+        x_tie, y_tie = (rows * (rows - 1) / 2).sum(-1), (cols * (cols - 1) / 2).sum(-1)
+        x0, y0 = (rows * (rows - 1) * (rows - 2)).sum(-1), (cols * (cols - 1) * (cols - 2)).sum(-1)
+        x1, y1 = (rows * (rows - 1) * (2 * rows + 5)).sum(-1), (cols * (cols - 1) * (2 * cols + 5)).sum(-1)
+        tau = (concordant - discordant) / np.sqrt((total - x_tie) * (total - y_tie))
+        m = n * (n - 1)
+        var = (m * (2 * n + 5) - x1 - y1) / 18 + 2 * x_tie * y_tie / m + x0 * y0 / (9 * m * (n - 2))
+        kendall_p = 2 * stats.norm.sf(np.abs(concordant - discordant) / np.sqrt(var))
+
+        # Cramér's V from Pearson's chi-square over the non-empty rows and columns
+        expected = rows[..., :, None] * cols[..., None, :] / n[..., None, None]
+        chi2 = np.where(expected > 0, (tables - expected) ** 2 / expected, 0.0).sum(axis=(-2, -1))
+        r, c = (rows > 0).sum(-1), (cols > 0).sum(-1)
+        k = np.minimum(r, c) - 1
+        cramers_v = np.where(k > 0, np.sqrt(chi2 / (n * k)), np.nan)
+        chi2_p = np.where(k > 0, stats.chi2.sf(chi2, (r - 1) * (c - 1)), np.nan)
+
+    return {
+        'Spearman_rho': rho,
+        'Spearman_P': spearman_pvalue(rho, n),
+        'Kendall_Tau_b': tau,
+        'Kendall_P': kendall_p,
+        'Cramers_V': cramers_v,
+        'Chi2_P': chi2_p,
+        'N': n,
+    }
+
+
+def pair_tables(codes, column, partners, size, block_rows=BLOCK_ROWS):
+    """Contingency tables of ``column`` against each of ``partners``, shape (partners, size, size).
+
+    ``codes`` maps columns to level codes (-1 for missing). Missing values
+    are counted in an extra leading level that is dropped at the end, so
+    all tables of a block are filled by a single unmasked ``bincount``.
+    """
+    width = size + 1
+    offsets = np.arange(len(partners), dtype=np.intp) * width * width
+    counts = np.zeros(len(partners) * width * width, dtype=np.int64)
+    for start in range(0, len(codes[column]), block_rows):
+        # Widen the one-byte codes before x * width, which overflows int8 from 11 levels on
+        x = codes[column][start:start + block_rows].astype(np.intp) + 1
+        y = np.stack([codes[p][start:start + block_rows] for p in partners], axis=1)
+        flat = (offsets + 1) + (x * width)[:, None] + y
+        counts += np.bincount(flat.ravel(), minlength=len(counts))
+    return counts.reshape(len(partners), width, width)[:, 1:, 1:]
+
+
+def compute_associations(df, pairs, block_rows=BLOCK_ROWS):
+    """{(column 1, column 2): statistics} of every pair in ``pairs``.
+
+    Spearman's rho comes from one product of the ranks of all columns
+    involved (pairwise-complete, as ``DataFrame.corr``); columns with at most
+    MAX_LEVELS values also get contingency-table statistics, and for such
+    pairs with missing values the table's exact pairwise ranks are used.
+    Columns with more values than that with missing data are ranked over
+    their own present rows.
+    """
+    columns = list(dict.fromkeys(col for pair in pairs for col in pair))
+    coded = {col: factorize_levels(df[col]) for col in columns}
+    codes = {col: c for col, (c, _) in coded.items()}
+    n_levels = {col: len(levels) for col, (_, levels) in coded.items()}
+    present = {col: int((c >= 0).sum()) for col, c in codes.items()}
+    ranks = pd.DataFrame({col: rank_column(codes[col], n_levels[col]) for col in columns})
+    rho = cross_product_corr(ranks, columns, block_rows)
+
+    results = {}
+    for a, b in pairs:
+        complete = present[a] == present[b] == len(df)
+        n = len(df) if complete else int(((codes[a] >= 0) & (codes[b] >= 0)).sum())
+        r = rho.loc[a, b]
+        results[a, b] = {'Spearman_rho': r, 'Spearman_P': float(spearman_pvalue(r, n)),
+                         'Kendall_Tau_b': np.nan, 'Kendall_P': np.nan, 'Cramers_V': np.nan,
+                         'Chi2_P': np.nan, 'N': n}
+
+    discrete = {col for col in columns if n_levels[col] <= MAX_LEVELS}
+    # One byte per response is enough to count the tables of these columns
+    small = {col: codes[col].astype(np.int8) for col in discrete}
+    partners = {}
+    for a, b in pairs:
+        if a in discrete and b in discrete:
+            partners.setdefault(a, []).append(b)
+    for column, others in partners.items():
+        size = max(n_levels[col] for col in [column] + others)
+        table = table_statistics(pair_tables(small, column, others, size, block_rows))
+        for i, other in enumerate(others):
+            values = {stat: table[stat][i] for stat in STATISTICS}
+            if values['N'] == present[column] == present[other]:
+                # Complete pairs keep the rank product's rho (the same value)
+                values['Spearman_rho'] = results[column, other]['Spearman_rho']
+                values['Spearman_P'] = results[column, other]['Spearman_P']
+            values['N'] = int(values['N'])
+            results[column, other] = {stat: (v.item() if isinstance(v, np.generic) else v)
+                                      for stat, v in values.items()}
+    return results
+
+
+def associations(df, columns=None, cache=None, block_rows=BLOCK_ROWS):
+    """Long table of Spearman, Kendall tau-b and Cramér's V for every pair of ``columns``.
+
+    ``columns`` defaults to every ``_Score`` column. Pairs found in ``cache``
+    (keyed on both columns' data) are reused; the rest are computed together.
+    """
+    if columns is None:
+        columns = [col for col in df.columns if col.endswith('_Score')]
+    columns = list(dict.fromkeys(columns))
+    cache = cache or ResultCache(None)
+    fingerprints = dataset_fingerprint(df, columns)
+    spec = {'max_levels': MAX_LEVELS}
+
+    rows, missing = {}, {}
+    for a, b in combinations(columns, 2):
+        key = result_key('association', [fingerprints[a], fingerprints[b]], spec)
+        value = cache.get(key)
+        if value is None:
+            missing[a, b] = key
+        else:
+            rows[a, b] = value
+    if missing:
+        for pair, value in compute_associations(df, list(missing), block_rows).items():
+            cache.put(missing[pair], value)
+            rows[pair] = value
+
+    ordered = [{'Variable_1': a, 'Variable_2': b, **rows[a, b]} for a, b in combinations(columns, 2)]
+    return pd.DataFrame(ordered, columns=ASSOCIATION_KEYS + STATISTICS)
+
+
+def association_matrix(results, statistic='Spearman_rho', columns=None):
+    """Symmetric matrix of one statistic from an ``associations`` table, ones on the diagonal."""
+    if columns is None:
+        columns = list(dict.fromkeys(results['Variable_1'].tolist() + results['Variable_2'].tolist()))
+    matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+    for a, b, value in results[ASSOCIATION_KEYS + [statistic]].itertuples(index=False):
+        if a in matrix.index and b in matrix.index:
+            matrix.loc[a, b] = matrix.loc[b, a] = value
+    return matrix
+
+
+def main(argv=None, prog=None):
+    from score_store import load_scores
+
+    parser = argparse.ArgumentParser(prog=prog, description="Spearman / Kendall tau-b / Cramér's V for every pair of score columns")
+    parser.add_argument('--data', default='comprehensive_anova_data.csv',
+                        help="mapped scores: CSV, Parquet or a score_store.py .scores bundle")
+    parser.add_argument('--columns', nargs='+', metavar='COL', help="columns to pair (default: every _Score column)")
+    parser.add_argument('-o', '--output', default=ASSOCIATION_FILE)
+    parser.add_argument('--top', type=int, default=5, metavar='N', help="print the N strongest pairs")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="directory of cached per-pair results")
+    parser.add_argument('--no-cache', action='store_true', help="recompute every pair")
+    args = parser.parse_args(argv)
+
+    df = load_scores(args.data, columns=args.columns)
+    cache = ResultCache(None if args.no_cache else args.cache_dir)
+    results = associations(df, args.columns, cache)
+    write_results(results, args.output, df, args.data, keys=ASSOCIATION_KEYS)
+    print(f"✅ Associations of {len(results)} pairs saved to {args.output} "
+          f"(♻️  {cache.hits} reused, {cache.misses} computed)")
+    strongest = results.reindex(results['Spearman_rho'].abs().sort_values(ascending=False).index)
+    for _, row in strongest.head(args.top).iterrows():
+        print(f"   {row['Variable_1']} ↔ {row['Variable_2']}: ρ = {row['Spearman_rho']:.3f}, "
+              f"τ_b = {row['Kendall_Tau_b']:.3f}, V = {row['Cramers_V']:.3f}, p = {row['Spearman_P']:.4g}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
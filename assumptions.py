@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Batched ANOVA Assumption Checks for Every Tested Pair
+For each factor, one grouped pass gives every dependent's group means and
+medians; the absolute deviations from them go through the same blocked
+group-sum engine as the ANOVA itself (Levene and Brown-Forsythe are one-way
+ANOVAs of those deviations), and residual normality is tested with
+D'Agostino's K^2 from residual power sums. Each pair is then flagged for the
+classic ANOVA, Welch's ANOVA or Kruskal-Wallis.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from anova_engine import factorize_levels, flatten_vars, group_stats, oneway_from_stats
+
+ASSUMPTION_COLUMNS = ['Independent_Variable', 'Dependent_Variable', 'Levene_W', 'Levene_p',
+                      'Brown_Forsythe_W', 'Brown_Forsythe_p', 'Residual_Skew', 'Residual_Kurtosis',
+                      'Normality_K2', 'Normality_p', 'Normal_Residuals', 'Equal_Variances',
+                      'Recommended_Test']
+
+
+def dagostino_k2(n, skew, kurtosis):
+    """Vectorized D'Agostino-Pearson omnibus test from biased skewness and (non-excess) kurtosis.
+
+    Same statistic as ``scipy.stats.normaltest``; NaN where n < 8.
+    """
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Skewness test
+        y = skew * np.sqrt((n + 1) * (n + 3) / (6.0 * (n - 2)))
+        beta2 = (3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3)
+                 / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9)))
+        w2 = -1 + np.sqrt(2 * (beta2 - 1))
+        delta = 1 / np.sqrt(0.5 * np.log(w2))
+        alpha = np.sqrt(2.0 / (w2 - 1))
+        y = np.where(y == 0, 1, y)
+        z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+        # Kurtosis test
+        mean = 3.0 * (n - 1) / (n + 1)
+        var = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+        x = (kurtosis - mean) / np.sqrt(var)
+        root_beta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9))
+                      * np.sqrt(6.0 * (n + 3) * (n + 5) / (n * (n - 2) * (n - 3))))
+        a = 6.0 + 8.0 / root_beta1 * (2.0 / root_beta1 + np.sqrt(1 + 4.0 / root_beta1 ** 2))
+        term1 = 1 - 2 / (9.0 * a)
+        denom = 1 + x * np.sqrt(2 / (a - 4.0))
+        term2 = np.sign(denom) * np.where(denom == 0.0, np.nan, ((1 - 2.0 / a) / np.abs(denom)) ** (1 / 3.0))
+        z_kurt = (term1 - term2) / np.sqrt(2 / (9.0 * a))
+
+    k2 = np.where(n >= 8, z_skew ** 2 + z_kurt ** 2, np.nan)
+    return k2, stats.chi2.sf(k2, 2)
+
+
+def assumption_checks(df, independent_vars, dependent_vars, alpha=0.05):
+    """Homogeneity and residual-normality checks for every independent × dependent pair.
+
+    Returns one row per pair (in ``batch_oneway`` order) in the
+    ``ASSUMPTION_COLUMNS`` schema. ``Recommended_Test`` is 'ANOVA' when both
+    assumptions hold, 'Welch' when only the variances differ and
+    'Kruskal-Wallis' when the residuals are not normal.
+    """
+    factors = list(dict.fromkeys(flatten_vars(independent_vars)))
+    dependents = list(dict.fromkeys(flatten_vars(dependent_vars)))
+    frames = []
+    for factor in factors:
+        deps = [dep for dep in dependents if dep != factor]
+        if not deps:
+            continue
+        codes, levels = factorize_levels(df[factor])
+        y = np.array(df[deps], dtype=np.float64)  # writable copy
+        y[codes < 0] = np.nan
+
+        # One grouped pass for the centres of every dependent
+        grouped = pd.DataFrame(y, columns=deps).groupby(codes)
+        level_ids = np.arange(len(levels))
+        means = grouped.mean().reindex(level_ids).to_numpy()
+        medians = grouped.median().reindex(level_ids).to_numpy()
+        rows = np.maximum(codes, 0)
+        residuals = y - means[rows]
+
+        # Levene (mean) and Brown-Forsythe (median) are ANOVAs of absolute deviations
+        m = len(deps)
+        deviations = pd.DataFrame(np.hstack([np.abs(residuals), np.abs(y - medians[rows])]))
+        deviations['_level'] = np.where(codes >= 0, codes, np.nan)
+        gs = group_stats(deviations, '_level', list(range(2 * m)))
+        spread = oneway_from_stats(gs.n, gs.s, gs.ss)
+
+        # Residual moments for the normality test
+        valid = ~np.isnan(residuals)
+        n = valid.sum(axis=0)
+        r = np.where(valid, residuals, 0.0)
+        r2 = r * r
+        with np.errstate(divide='ignore', invalid='ignore'):
+            m2 = r2.sum(axis=0) / n
+            skew = (r2 * r).sum(axis=0) / n / m2 ** 1.5
+            kurtosis = (r2 * r2).sum(axis=0) / n / m2 ** 2
+        k2, p_normal = dagostino_k2(n, skew, kurtosis)
+
+        normal = ~(p_normal < alpha)
+        equal = ~(spread['p'][m:] < alpha)
+        frames.append(pd.DataFrame({
+            'Independent_Variable': factor,
+            'Dependent_Variable': deps,
+            'Levene_W': spread['F'][:m],
+            'Levene_p': spread['p'][:m],
+            'Brown_Forsythe_W': spread['F'][m:],
+            'Brown_Forsythe_p': spread['p'][m:],
+            'Residual_Skew': skew,
+            'Residual_Kurtosis': kurtosis - 3,
+            'Normality_K2': k2,
+            'Normality_p': p_normal,
+            'Normal_Residuals': normal,
+            'Equal_Variances': equal,
+            'Recommended_Test': np.where(~normal, 'Kruskal-Wallis', np.where(~equal, 'Welch', 'ANOVA')),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=ASSUMPTION_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
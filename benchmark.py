@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Stage Benchmarks for the Analysis Pipeline
+Runs every stage (load, map, scale, index, ANOVA sweep, post-hoc, plots) on
+synthetic surveys of increasing size, records wall time and peak traced
+memory per stage, and appends the run to benchmark_history.json so later
+runs can be compared against it for regressions.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+HISTORY_FILE = 'benchmark_history.json'
+STAGES = ['load', 'map', 'scale', 'index', 'sweep', 'posthoc', 'plots']
+DEFAULT_SIZES = [100_000, 1_000_000]
+REGRESSION_RATIO = 1.25
+# Slowdowns smaller than this are scheduler noise for millisecond stages
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def _load(ctx):
+    from score_store import load_scores
+    ctx['df'] = load_scores(ctx['csv'])
+
+
+def _map(ctx):
+    from ingest import map_responses
+    ctx['mapped'] = map_responses(ctx['text'])
+
+
+def _scale(ctx):
+    from scaling_pipeline import fused_scale_and_index
+    ctx['scaled'] = fused_scale_and_index(ctx['df'], definitions=[], group_index=None)
+
+
+def _index(ctx):
+    from composite_index import compute_indices
+    from scaling_pipeline import INDEX_DEFINITIONS, terciles
+    indices = compute_indices(ctx['scaled'], INDEX_DEFINITIONS)
+    indices['Connectivity_Group'] = terciles(indices['Connectivity_Index'])
+    ctx['indices'] = indices
+
+
+def _sweep(ctx):
+    from anova_engine import anova_sweep
+    from survey_variables import dependent_vars, independent_vars
+    ctx['results'] = anova_sweep(ctx['df'], independent_vars, dependent_vars, score_pairs=True)
+
+
+def _posthoc(ctx):
+    from posthoc import posthoc_tukey
+    ctx['posthoc'] = posthoc_tukey(ctx['df'], ctx['results'])
+
+
+def _plots(ctx):
+    import matplotlib
+    matplotlib.use('Agg')
+    from anova_engine import batch_oneway
+    from result_cache import write_results
+    from survey_variables import dependent_vars, independent_vars
+    from visualize_anova_results import create_anova_visualizations
+
+    workdir = Path(ctx['csv']).parent
+    results = batch_oneway(ctx['df'], independent_vars, dependent_vars)
+    write_results(results, workdir / 'anova_results.csv', ctx['df'], ctx['csv'])
+    try:
+        create_anova_visualizations(ctx['csv'], workdir / 'anova_results.csv',
+                                    workdir / 'anova_results_visualization.png', show=False)
+    finally:
+        matplotlib.pyplot.close('all')
+
+
+STAGE_FUNCTIONS = {'load': _load, 'map': _map, 'scale': _scale, 'index': _index,
+                   'sweep': _sweep, 'posthoc': _posthoc, 'plots': _plots}
+# Stages whose outputs a selected stage needs
+REQUIRES = {'scale': ['load'], 'index': ['load', 'scale'], 'sweep': ['load'],
+            'posthoc': ['load', 'sweep'], 'plots': ['load']}
+
+
+def run_stage(stage, ctx, memory=True):
+    """Wall time of one stage, then its peak traced allocation in a second, traced run."""
+    gc.collect()
+    start = time.perf_counter()
+    STAGE_FUNCTIONS[stage](ctx)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            STAGE_FUNCTIONS[stage](ctx)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {'seconds': round(seconds, 4), 'peak_mb': None if peak is None else round(peak / 2 ** 20, 2)}
+
+
+def benchmark_size(rows, stages, seed=0, memory=True, quiet=True):
+    """Benchmark ``stages`` on ``rows`` synthetic responses; returns {stage: measurements}."""
+    from synthetic_survey import generate_responses
+
+    needed = [stage for stage in STAGES
+              if stage in stages or any(stage in REQUIRES.get(s, []) for s in stages)]
+    measurements = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = {'csv': Path(tmp) / f"synthetic_{rows}.csv"}
+        generate_responses(rows, seed=seed).to_csv(ctx['csv'], index=False)
+        if 'map' in needed:
+            # Raw answers under the form's question headers, as ingest.py reads a CSV export
+            from survey_variables import SCORE_SCALES
+            text = generate_responses(rows, seed=seed, as_text=True)
+            ctx['text'] = text.rename(columns={column: question for column, (question, _) in SCORE_SCALES.items()})
+        for stage in needed:
+            if stage not in stages:
+                STAGE_FUNCTIONS[stage](ctx)  # setup only
+                continue
+            stdout = sys.stdout
+            if quiet:
+                sys.stdout = open(os.devnull, 'w')
+            try:
+                measurements[stage] = run_stage(stage, ctx, memory)
+            finally:
+                if quiet:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+            print(f"   {stage:<8} {measurements[stage]['seconds']:>9.3f} s"
+                  + ('' if measurements[stage]['peak_mb'] is None
+                     else f"  {measurements[stage]['peak_mb']:>9.1f} MB peak"))
+    return measurements
+
+
+def environment():
+    """Machine and library details that make timings comparable."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'host': platform.node(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def load_history(path=HISTORY_FILE):
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else []
+
+
+def regressions(run, history, ratio=REGRESSION_RATIO, floor=MIN_REGRESSION_SECONDS):
+    """Stages at least ``ratio`` times slower than the latest earlier run on the same host.
+
+    The slowdown must also exceed ``floor`` seconds, so millisecond stages are not
+    flagged on timer noise.
+
+    Returns (rows, stage, previous seconds, current seconds) tuples.
+    """
+    slower = []
+    for rows, stages in run['results'].items():
+        for stage, current in stages.items():
+            for previous in reversed(history):
+                if previous['environment']['host'] != run['environment']['host']:
+                    continue
+                before = previous['results'].get(rows, {}).get(stage)
+                if before is None:
+                    continue
+                slowdown = current['seconds'] - before['seconds']
+                if slowdown > max(floor, (ratio - 1) * before['seconds']):
+                    slower.append((rows, stage, before['seconds'], current['seconds']))
+                break
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline stages on synthetic surveys")
+    parser.add_argument('--sizes', type=float, nargs='+', default=DEFAULT_SIZES,
+                        help="numbers of responses, e.g. 1e5 1e6 1e7")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--skip', nargs='+', choices=STAGES, default=[], help="stages to leave out")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced run used for peak memory")
+    parser.add_argument('--history', default=HISTORY_FILE, help=f"JSON history file (default: {HISTORY_FILE})")
+    parser.add_argument('--no-record', action='store_true', help="compare only; do not append to the history")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO,
+                        help="slowdown ratio reported as a regression")
+    parser.add_argument('--min-seconds', type=float, default=MIN_REGRESSION_SECONDS,
+                        help="smallest absolute slowdown reported as a regression")
+    parser.add_argument('--verbose', action='store_true', help="show the output of the stages")
+    args = parser.parse_args()
+
+    stages = [stage for stage in args.stages if stage not in args.skip]
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'seed': args.seed,
+        'results': {},
+    }
+    for rows in map(int, args.sizes):
+        print(f"⏱️  {rows:,} responses")
+        run['results'][str(rows)] = benchmark_size(rows, stages, args.seed, not args.no_memory,
+                                                   quiet=not args.verbose)
+
+    history = load_history(args.history)
+    slower = regressions(run, history, args.threshold, args.min_seconds)
+    for rows, stage, before, after in slower:
+        print(f"⚠️  Regression: {stage} at {int(rows):,} rows took {after:.3f} s (was {before:.3f} s, "
+              f"{after / before:.2f}×)")
+    if history and not slower:
+        print("✅ No stage slower than the previous run")
+    if not args.no_record:
+        history.append(run)
+        Path(args.history).write_text(json.dumps(history, indent=2) + '\n')
+        print(f"💾 Run recorded in {args.history}")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
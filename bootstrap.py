@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Vectorized Bootstrap Confidence Intervals for ANOVA Effect Sizes
+Resamples respondents as per-respondent resample counts, a chunk of resamples
+at a time, and computes eta-squared and group means for every pair from
+weighted group sums. Memory is bounded by a cell budget per chunk.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from anova_engine import factorize_levels, flatten_vars, mask_groups, oneway_from_stats
+
+# Resample weights held in memory at once (float64 cells of chunk x respondents)
+MAX_CELLS = 1 << 22
+
+
+def resample_counts(n_rows, n_boot, chunk=None, seed=0):
+    """Yield (chunk, n_rows) matrices of how often each respondent is drawn.
+
+    Each resample's indices are counted straight into its row of a float
+    buffer; the counts are weights that turn any sum over respondents into
+    a matrix product. ``chunk`` defaults to as many
+    resamples as fit in MAX_CELLS cells; the draws do not depend on it.
+    """
+    rng = np.random.default_rng(seed)
+    if chunk is None:
+        chunk = max(1, MAX_CELLS // max(n_rows, 1))
+    for start in range(0, n_boot, chunk):
+        counts = np.empty((min(chunk, n_boot - start), n_rows))
+        for row in counts:
+            row[:] = np.bincount(rng.integers(0, n_rows, n_rows), minlength=n_rows)
+        yield counts
+
+
+def weighted_group_stats(weights, bounds, y):
+    """Group n / sum / sum of squares under resample weights.
+
+    Rows must be sorted by level, with level ``i`` occupying rows
+    ``bounds[i]:bounds[i + 1]``. ``weights`` is (boot, rows) and ``y`` is
+    (rows, dependents); returns three arrays of shape (boot, levels, dependents).
+    """
+    n_levels = len(bounds) - 1
+    n = np.empty((weights.shape[0], n_levels, y.shape[1]))
+    s = np.empty_like(n)
+    ss = np.empty_like(n)
+    y_sq = y * y
+    for level in range(n_levels):
+        rows = slice(bounds[level], bounds[level + 1])
+        w = weights[:, rows]
+        n[:, level, :] = w.sum(axis=1, keepdims=True)
+        s[:, level, :] = w @ y[rows]
+        ss[:, level, :] = w @ y_sq[rows]
+    return n, s, ss
+
+
+def _jackknife(codes, y, n_levels):
+    """Leave-one-out eta-squared and group means for one dependent column.
+
+    Rows that share (level, value) have identical leave-one-out statistics, so
+    only the unique combinations are evaluated. Returns (eta, means, weights).
+    """
+    onehot = (np.arange(n_levels)[:, None] == codes).astype(np.float64)
+    n, s, ss = onehot.sum(axis=1), onehot @ y, onehot @ (y * y)
+    combos, weights = np.unique(np.column_stack([codes, y]), axis=0, return_counts=True)
+    level = combos[:, 0].astype(np.int64)
+    value = combos[:, 1]
+    drop = np.arange(n_levels) == level[:, None]
+    jn = n - drop
+    js = s - drop * value[:, None]
+    jss = ss - drop * (value * value)[:, None]
+    eta = oneway_from_stats(jn[..., None], js[..., None], jss[..., None])['eta_squared'][:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = js / jn
+    return eta, means, weights
+
+
+def bca_bounds(boot, estimate, jack, jack_weights, level):
+    """Bias-corrected and accelerated percentile bounds along axis 0 of ``boot``."""
+    valid = ~np.isnan(boot)
+    count = valid.sum(axis=0)
+    below = ((boot < estimate) & valid).sum(axis=0) + 0.5 * ((boot == estimate) & valid).sum(axis=0)
+    share = np.clip(below / np.maximum(count, 1), 1 / (count + 1), count / (count + 1))
+    z0 = stats.norm.ppf(share)
+
+    w = jack_weights.reshape((-1,) + (1,) * (jack.ndim - 1))
+    jack_mean = (w * jack).sum(axis=0) / w.sum()
+    diff = jack_mean - jack
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accel = (w * diff ** 3).sum(axis=0) / (6 * ((w * diff ** 2).sum(axis=0)) ** 1.5)
+    accel = np.nan_to_num(accel)
+
+    z = stats.norm.ppf([(1 - level) / 2, (1 + level) / 2])
+    bounds = []
+    for z_alpha in z:
+        adjusted = stats.norm.cdf(z0 + (z0 + z_alpha) / (1 - accel * (z0 + z_alpha)))
+        bounds.append(_nanquantile_per_column(boot, adjusted))
+    return bounds
+
+
+def _nanquantile_per_column(boot, q):
+    """Quantile of each trailing-position column of ``boot`` at its own level ``q``."""
+    flat = boot.reshape(boot.shape[0], -1)
+    q = np.broadcast_to(q, boot.shape[1:]).ravel()
+    ordered = np.sort(flat, axis=0)  # NaN sorts last
+    count = (~np.isnan(flat)).sum(axis=0)
+    position = np.clip(q * (count - 1), 0, np.maximum(count - 1, 0))
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(count - 1, 0))
+    cols = np.arange(flat.shape[1])
+    frac = position - lower
+    values = ordered[lower, cols] * (1 - frac) + ordered[upper, cols] * frac
+    values[count == 0] = np.nan
+    return values.reshape(boot.shape[1:])
+
+
+def bootstrap_oneway(df, independent_vars, dependent_vars, n_boot=2000, level=0.95,
+                     method='bca', chunk=None, seed=0, pair_seeds=None):
+    """Bootstrap intervals for eta-squared and group means of every pair.
+
+    ``method`` is 'bca' or 'percentile'. ``pair_seeds`` ({(factor,
+    dependent): seed}) limits the intervals to those pairs and resamples
+    each with its own stream, so they do not depend on which pairs run
+    together. Returns (effect_sizes, group_means):
+    the first has Effect_Size_CI_Low / Effect_Size_CI_High per pair, the second
+    one row per (pair, level) with Mean_CI_Low / Mean_CI_High.
+    """
+    factors = list(dict.fromkeys(flatten_vars(independent_vars)))
+    dependents = list(dict.fromkeys(flatten_vars(dependent_vars)))
+    y_all = df[dependents].to_numpy(dtype=np.float64)
+    effect_rows, mean_rows = [], []
+
+    for factor in factors:
+        deps = [j for j, dep in enumerate(dependents)
+                if dep != factor and (pair_seeds is None or (factor, dep) in pair_seeds)]
+        if not deps:
+            continue
+        codes_all, levels_all = factorize_levels(df[factor])
+        valid = ~np.isnan(y_all[:, deps]) & (codes_all >= 0)[:, None]
+        groups = [(rows, [deps[c] for c in cols]) for rows, cols in mask_groups(valid)]
+        if pair_seeds is not None:
+            groups = [(rows, [col]) for rows, cols in groups for col in cols]
+        for rows, cols in groups:
+            group_seed = seed if pair_seeds is None else pair_seeds[factor, dependents[cols[0]]]
+            kept, codes = np.unique(codes_all[rows], return_inverse=True)
+            levels = levels_all[kept]
+            k = len(kept)
+            # Resampling ignores row order, so sort by level once and slice per group
+            order = np.argsort(codes, kind='stable')
+            codes = codes[order]
+            y = y_all[rows][order][:, cols]
+            bounds = np.searchsorted(codes, np.arange(k + 1))
+
+            onehot = (np.arange(k)[:, None] == codes).astype(np.float64)
+            n, s, ss = onehot @ np.ones_like(y), onehot @ y, onehot @ (y * y)
+            eta_hat = oneway_from_stats(n, s, ss)['eta_squared']
+            mean_hat = s / n
+
+            eta_boot, mean_boot = [], []
+            for weights in resample_counts(len(codes), n_boot, chunk, group_seed):
+                bn, bs, bss = weighted_group_stats(weights, bounds, y)
+                eta_boot.append(oneway_from_stats(bn, bs, bss)['eta_squared'])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    mean_boot.append(bs / bn)
+            eta_boot = np.concatenate(eta_boot)
+            mean_boot = np.concatenate(mean_boot)
+
+            if method == 'bca':
+                eta_low, eta_high = np.empty(len(cols)), np.empty(len(cols))
+                mean_low, mean_high = np.empty((k, len(cols))), np.empty((k, len(cols)))
+                for j in range(len(cols)):
+                    jack_eta, jack_means, jack_w = _jackknife(codes, y[:, j], k)
+                    eta_low[j], eta_high[j] = bca_bounds(eta_boot[:, j], eta_hat[j],
+                                                          jack_eta, jack_w, level)
+                    mean_low[:, j], mean_high[:, j] = bca_bounds(mean_boot[:, :, j], mean_hat[:, j],
+                                                                  jack_means, jack_w, level)
+            elif method == 'percentile':
+                tails = [(1 - level) / 2, (1 + level) / 2]
+                eta_low, eta_high = np.nanquantile(eta_boot, tails, axis=0)
+                mean_low, mean_high = np.nanquantile(mean_boot, tails, axis=0)
+            else:
+                raise ValueError(f"Unknown bootstrap interval method: {method}")
+
+            for j, col in enumerate(cols):
+                effect_rows.append({
+                    'Independent_Variable': factor,
+                    'Dependent_Variable': dependents[col],
+                    'Effect_Size': eta_hat[j],
+                    'Effect_Size_CI_Low': eta_low[j],
+                    'Effect_Size_CI_High': eta_high[j],
+                })
+                for i, value in enumerate(levels):
+                    mean_rows.append({
+                        'Independent_Variable': factor,
+                        'Dependent_Variable': dependents[col],
+                        'Level': value,
+                        'n': int(n[i, j]),
+                        'Mean': mean_hat[i, j],
+                        'Mean_CI_Low': mean_low[i, j],
+                        'Mean_CI_High': mean_high[i, j],
+                    })
+
+    return pd.DataFrame(effect_rows), pd.DataFrame(mean_rows)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core Chunked Analysis for Response Files Larger than RAM
+Streams fixed-size chunks from CSV, Parquet or a score_store.py bundle and
+merges partial aggregates, so memory is bounded by the chunk size:
+
+    pass 1  ordinal mapping, ANOVA sufficient statistics, global column
+            min/max, and value counts of the tercile index's raw items
+    pass 2  rescale with the global min/max, build composite indices and
+            terciles, and append them to the composite CSV
+
+The outputs match perform_anova.py --sweep and the fused in-memory pipeline.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from anova_engine import annotate_sweep, sweep_variables
+from ingest import map_ordinal
+from online_anova import OnlineAnova
+from result_cache import forget_results
+from scaling_pipeline import (INDEX_DEFINITIONS, REVERSE_ITEMS, SCALED_COLUMNS,
+                              fused_scale_and_index, tercile_edges)
+from score_store import compact_column, read_schema
+
+CHUNK_ROWS = 100_000
+
+
+def iter_chunks(path, columns=None, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames of at most ``chunk_rows`` rows from a CSV, Parquet file or bundle."""
+    path = Path(path)
+    if path.is_dir():
+        schema = read_schema(path)
+        wanted = schema['columns'] if columns is None else list(columns)
+        arrays = {col: np.load(path / f"{col}.npy", mmap_mode='r') for col in wanted}
+        for start in range(0, schema['rows'], chunk_rows):
+            chunk = {}
+            for col, values in arrays.items():
+                block = np.asarray(values[start:start + chunk_rows])
+                missing = block == schema['scales'][col]['missing']
+                chunk[col] = np.where(missing, np.nan, block).astype(np.float32) if missing.any() else block
+            yield pd.DataFrame(chunk)
+    elif path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_rows):
+            yield chunk.apply(compact_column)
+
+
+def group_items(definitions, group_index):
+    """Source columns of the items behind the tercile index."""
+    definition = next(d for d in definitions if d.name == group_index)
+    return [item[:-2] if item.endswith('_R') else item for item in definition.items]
+
+
+def pattern_tercile_edges(pattern_counts, ranges, scaled_cols=SCALED_COLUMNS, reverse_cols=REVERSE_ITEMS,
+                          definitions=INDEX_DEFINITIONS, group_index="Connectivity_Index"):
+    """Tercile edges of ``group_index`` from counts of its raw item patterns under global ``ranges``.
+
+    Every distinct pattern is indexed once with the global scaling, so the
+    edges equal those of the full data without revisiting its rows.
+    """
+    sources = list(scaled_cols) + list(reverse_cols)
+    patterns = pattern_counts.index.to_frame(index=False)
+    pattern_index = fused_scale_and_index(
+        patterns.reindex(columns=list(dict.fromkeys(sources))), scaled_cols, reverse_cols,
+        [d for d in definitions if d.name == group_index], group_index=None,
+        ranges=ranges)[group_index].to_numpy()
+    known = ~np.isnan(pattern_index)
+    return tercile_edges(pattern_index[known], pattern_counts.to_numpy()[known])
+
+
+def run_chunked(path, independent_vars, dependent_vars, score_pairs=False,
+                scaled_cols=SCALED_COLUMNS, reverse_cols=REVERSE_ITEMS, definitions=INDEX_DEFINITIONS,
+                group_index="Connectivity_Index", ordinal_map=None, chunk_rows=CHUNK_ROWS,
+                composite_output=None, alpha=0.05):
+    """Two streaming passes over ``path``; returns (anova_results, ranges, tercile_edges).
+
+    When ``composite_output`` is given, the composite indices are appended to
+    that CSV chunk by chunk.
+    """
+    sources = list(scaled_cols) + list(reverse_cols)
+    group_sources = group_items(definitions, group_index) if group_index else []
+
+    # Pass 1: sufficient statistics, global extremes and item-pattern counts
+    acc = None
+    mins = np.full(len(sources), np.inf)
+    maxs = np.full(len(sources), -np.inf)
+    pattern_counts = None
+    for chunk in iter_chunks(path, chunk_rows=chunk_rows):
+        chunk = map_ordinal(chunk, ordinal_map)
+        if acc is None:
+            factors, dependents = sweep_variables(chunk.columns, independent_vars, dependent_vars, score_pairs)
+            acc = OnlineAnova(factors, dependents)
+        acc.update(chunk)
+        block = chunk[sources].to_numpy(dtype=np.float64)
+        mins = np.fmin(mins, np.nanmin(block, axis=0, initial=np.inf))
+        maxs = np.fmax(maxs, np.nanmax(block, axis=0, initial=-np.inf))
+        if group_sources:
+            counts = chunk.groupby(group_sources, dropna=False).size()
+            pattern_counts = counts if pattern_counts is None else pattern_counts.add(counts, fill_value=0)
+
+    if acc is None:
+        raise ValueError(f"No rows found in {path}")
+    results = annotate_sweep(acc.results(alpha), independent_vars, dependent_vars, alpha)
+    # Columns with no answers at all have no range, as in the in-memory pass
+    seen = mins <= maxs
+    mins, maxs = np.where(seen, mins, np.nan), np.where(seen, maxs, np.nan)
+
+    edges = None
+    if group_index:
+        edges = pattern_tercile_edges(pattern_counts, (mins, maxs), scaled_cols, reverse_cols,
+                                      definitions, group_index)
+
+    # Pass 2: scale, index and group each chunk with the global parameters
+    if composite_output is not None:
+        composite_output = Path(composite_output)
+        composite_output.unlink(missing_ok=True)
+        for chunk in iter_chunks(path, chunk_rows=chunk_rows):
+            chunk = map_ordinal(chunk, ordinal_map)
+            out = fused_scale_and_index(chunk, scaled_cols, reverse_cols, definitions, group_index,
+                                        ranges=(mins, maxs), group_edges=edges)
+            out.to_csv(composite_output, mode='a', header=not composite_output.exists(), index=False)
+
+    return results, (mins, maxs), edges
+
+
+def main():
+    from survey_variables import dependent_vars, independent_vars
+
+    parser = argparse.ArgumentParser(description="Chunked ANOVA and composite indices for very large response files")
+    parser.add_argument('source', help="mapped scores: CSV, Parquet or a .scores bundle")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="rows per streamed chunk")
+    parser.add_argument('--all-scores', action='store_true', help="also test every _Score column against every other")
+    parser.add_argument('--anova-output', default='anova_results.csv')
+    parser.add_argument('--composite-output', default='composite_indices.csv')
+    args = parser.parse_args()
+
+    results, _, edges = run_chunked(args.source, independent_vars, dependent_vars, args.all_scores,
+                                    chunk_rows=args.chunk_rows, composite_output=args.composite_output)
+    results.to_csv(args.anova_output, index=False)
+    forget_results(args.anova_output)
+    print(f"✅ {len(results)} ANOVA tests saved to {args.anova_output}")
+    print(f"✅ Composite indices saved to {args.composite_output} (tercile edges: {np.round(edges, 3)})")
+
+
+if __name__ == "__main__":
+    main()
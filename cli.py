@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Single Entry Point for the Analysis Scripts
+    python cli.py <command> [options]      (python cli.py <command> -h for help)
+
+Only the module behind the chosen command is imported, so pandas, SciPy and
+matplotlib load only for the commands that use them. ``significant`` reads
+anova_results.csv with the standard library alone and starts instantly.
+"""
+
+import argparse
+import csv
+import importlib
+import sys
+from pathlib import Path
+
+# command: (module, entry point, fixed leading arguments, summary)
+COMMANDS = {
+    'ingest': ('ingest', 'main', [], "map a raw form export (.xlsx / CSV) to score columns"),
+    'scale': ('scaling_pipeline', 'main', ['--no-index'], "rescale and reverse-code the items"),
+    'index': ('scaling_pipeline', 'main', [], "composite indices and connectivity terciles"),
+    'reliability': ('reliability', 'main', [], "Cronbach's alpha and item diagnostics of the composite indices"),
+    'anova': ('perform_anova', 'main', [], "full ANOVA analysis, or --sweep for every pair"),
+    'posthoc': ('posthoc', 'main', [], "Tukey HSD for the significant pairs in anova_results.csv"),
+    'associate': ('association', 'main', [], "Spearman, Kendall tau-b and Cramér's V for every score pair"),
+    'power': ('power_analysis', 'main', [], "Monte Carlo power curves and sample sizes for the next survey wave"),
+    'shard': ('sharded', 'main', [], "map/reduce ANOVA and reliability over per-campus or per-semester exports"),
+    'plot': ('visualize_anova_results', 'main', [], "multi-panel figure of the ANOVA results"),
+    'report': ('report', 'main', [], "Markdown / HTML report built from the results tables"),
+    'significant': (__name__, 'list_significant', [], "list significant pairs from anova_results.csv"),
+}
+
+# Flag column and p-value column of each correction in anova_results.csv
+CORRECTIONS = {
+    'none': ('Significant', 'P_value'),
+    'holm': ('Significant_Holm', 'P_holm'),
+    'bh': ('Significant_BH', 'P_fdr_bh'),
+}
+
+
+def list_significant(argv=None, prog=None):
+    """Print the significant pairs of a results CSV, strongest first, without the scientific stack."""
+    parser = argparse.ArgumentParser(prog=prog, description="List significant pairs from an ANOVA results CSV")
+    parser.add_argument('--results', default='anova_results.csv')
+    parser.add_argument('--correction', choices=sorted(CORRECTIONS), default='none',
+                        help="multiple-testing correction (holm / bh need perform_anova.py --sweep results)")
+    parser.add_argument('--top', type=int, default=0, metavar='N', help="show only the N smallest p-values")
+    args = parser.parse_args(argv)
+
+    flag, p_column = CORRECTIONS[args.correction]
+    with open(args.results, newline='') as handle:
+        rows = list(csv.DictReader(handle))
+    if rows and flag not in rows[0]:
+        raise SystemExit(f"❌ {args.results} has no {flag} column; run perform_anova.py --sweep")
+    significant = sorted((row for row in rows if row[flag] == 'True'), key=lambda row: float(row[p_column]))
+    if args.top:
+        significant = significant[:args.top]
+    print(f"📊 {sum(row[flag] == 'True' for row in rows)} of {len(rows)} pairs significant "
+          f"({'uncorrected' if args.correction == 'none' else args.correction}) in {args.results}")
+    for row in significant:
+        effect = f", η² = {float(row['Effect_Size']):.3f}" if row.get('Effect_Size') else ""
+        print(f"   {row['Independent_Variable']} → {row['Dependent_Variable']}: "
+              f"F = {float(row['F_statistic']):.3f}, p = {float(row[p_column]):.4g}{effect}")
+    return significant
+
+
+def usage():
+    lines = ["usage: cli.py <command> [options]", "", "commands:"]
+    lines += [f"  {name:<12} {summary}" for name, (_, _, _, summary) in COMMANDS.items()]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0
+    command = argv[0]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        return f"❌ Unknown command: {command}"
+    module, entry, fixed, _ = COMMANDS[command]
+    # The repository root holds the analysis modules, wherever cli.py is called from
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    target = getattr(importlib.import_module(module), entry)
+    target(fixed + argv[1:], prog=f"{Path(sys.argv[0]).name} {command}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
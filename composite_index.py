@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Composite Index Engine for the IIT Internet Connectivity Study
+Computes NaN-aware (optionally weighted) item means for several composite
+indices at once with masked NumPy reductions, replacing the row-wise
+``df.apply(safe_mean, axis=1)`` of new-type/build_indices.py.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class IndexDefinition(NamedTuple):
+    """Items averaged into one composite index.
+
+    ``reverse`` items are reverse-coded on ``scale`` (low + high - x) before
+    averaging; ``weights`` (one per item) turn the mean into a weighted mean.
+    """
+    name: str
+    items: list
+    reverse: tuple = ()
+    weights: Optional[tuple] = None
+    scale: tuple = (1, 5)
+
+
+def index_values(values, valid, weights=None, cols=None):
+    """Masked row mean over item columns ``cols`` of a (rows, items) block.
+
+    Items are accumulated left to right into one running total, so no
+    (rows, items) temporaries are made. Rows with no valid item give NaN.
+    """
+    cols = range(values.shape[1]) if cols is None else cols
+    total = np.zeros(values.shape[0])
+    count = np.zeros(values.shape[0])
+    for i, j in enumerate(cols):
+        weight = 1.0 if weights is None else float(weights[i])
+        item = values[:, j] if weight == 1.0 else values[:, j] * weight
+        np.add(total, item, out=total, where=valid[:, j])
+        np.add(count, weight, out=count, where=valid[:, j])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def compute_indices(df, definitions):
+    """Compute every composite index in ``definitions`` for all rows of ``df``.
+
+    Returns a DataFrame with one column per index, aligned to ``df.index``.
+    """
+    missing = sorted({item for d in definitions for item in d.items} - set(df.columns))
+    if missing:
+        raise KeyError(f"Index items not found in data: {missing}")
+
+    result = {}
+    for definition in definitions:
+        values = np.array(df[definition.items], dtype=np.float64)
+        valid = ~np.isnan(values)
+        if definition.reverse:
+            flip = np.isin(definition.items, definition.reverse)
+            low, high = definition.scale
+            values[:, flip] = (low + high) - values[:, flip]
+        result[definition.name] = index_values(values, valid, definition.weights)
+    return pd.DataFrame(result, index=df.index)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Batched Factorial (n-way) ANOVA with Type II Sums of Squares
+Reduces the rows to per-cell count / sum / sum of squares, dummy-codes the
+cells once per factor set, and gets every model's residual sum of squares for
+all dependents at once from an orthonormal basis of the weighted cell design.
+Empty cells only lower the rank of the design, so degrees of freedom come
+from matrix ranks instead of column counts.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from anova_engine import factorize_levels, flatten_vars, group_stats
+
+FACTORIAL_COLUMNS = ['Factors', 'Term', 'Dependent_Variable', 'Sum_Sq', 'df', 'F_statistic',
+                     'P_value', 'Significant', 'Partial_Eta_Squared', 'N']
+
+
+def model_terms(factors, max_order=None):
+    """Main effects and interactions up to ``max_order`` factors, lower orders first."""
+    max_order = len(factors) if max_order is None else max_order
+    return [term for order in range(1, max_order + 1) for term in combinations(factors, order)]
+
+
+def cell_design(cell_levels, terms):
+    """Treatment-coded design columns of every cell, grouped by term.
+
+    ``cell_levels`` is (cells, factors) of level codes. Returns the intercept
+    column and a dict mapping each term to its (cells, columns) block.
+    """
+    n_cells, n_factors = cell_levels.shape
+    dummies = []
+    for f in range(n_factors):
+        codes = cell_levels[:, f]
+        dummies.append((codes[:, None] == np.arange(1, codes.max() + 1)).astype(np.float64))
+    blocks = {}
+    for term in terms:
+        block = np.ones((n_cells, 1))
+        for f in term:
+            block = (block[:, :, None] * dummies[f][:, None, :]).reshape(n_cells, -1)
+        blocks[term] = block
+    return np.ones((n_cells, 1)), blocks
+
+
+def _projected_ss(design, root_n, centered):
+    """Rank of the weighted design and squared norm of each centered column's projection."""
+    weighted = design * root_n[:, None]
+    u, sv, _ = np.linalg.svd(weighted, full_matrices=False)
+    rank = int((sv > sv[0] * max(weighted.shape) * np.finfo(np.float64).eps).sum()) if sv.size else 0
+    projection = u[:, :rank].T @ (root_n[:, None] * centered)
+    return rank, (projection * projection).sum(axis=0)
+
+
+def factorial_anova(df, factors, dependents, alpha=0.05, max_order=None):
+    """Type II n-way ANOVA of every dependent on one set of factors.
+
+    Rows missing any factor are dropped; each dependent additionally uses only
+    its own complete cases. Returns one row per (term, dependent) plus a
+    ``Residual`` row per dependent, in the ``FACTORIAL_COLUMNS`` schema.
+    """
+    factors = list(factors)
+    dependents = [dep for dep in dict.fromkeys(flatten_vars(dependents)) if dep not in factors]
+    coded = [factorize_levels(df[factor])[0] for factor in factors]
+    sizes = [int(codes.max()) + 1 for codes in coded]
+    complete = np.all([codes >= 0 for codes in coded], axis=0)
+    cell = np.full(len(df), np.nan)
+    cell[complete] = np.ravel_multi_index([codes[complete] for codes in coded], sizes)
+
+    # One grouped pass gives every cell's n / sum / sum of squares for all dependents
+    frame = pd.DataFrame({'_cell': cell}, index=df.index).join(df[dependents])
+    gs = group_stats(frame, '_cell', dependents)
+    cell_levels = np.column_stack(np.unravel_index(gs.levels.astype(np.int64), sizes))
+    terms = model_terms(range(len(factors)), max_order)
+    intercept, blocks = cell_design(cell_levels, terms)
+
+    label = ' × '.join(factors)
+    rows = []
+    # Dependents with the same cell counts share a design and are solved together
+    patterns = {}
+    for j in range(len(dependents)):
+        patterns.setdefault(gs.n[:, j].tobytes(), []).append(j)
+    for cols in patterns.values():
+        n = gs.n[:, cols[0]]
+        occupied = n > 0
+        n = n[occupied]
+        s, ss = gs.s[occupied][:, cols], gs.ss[occupied][:, cols]
+        total_n = n.sum()
+        grand_mean = s.sum(axis=0) / total_n
+        ss_total = ss.sum(axis=0) - total_n * grand_mean ** 2
+        centered = s / n[:, None] - grand_mean
+        root_n = np.sqrt(n)
+
+        def fit(model):
+            design = np.column_stack([intercept[occupied]] + [blocks[t][occupied] for t in model])
+            rank, explained = _projected_ss(design, root_n, centered)
+            return rank, ss_total - explained
+
+        full_rank, rss = fit(terms)
+        rss = np.clip(rss, 0.0, None)
+        df_resid = total_n - full_rank
+        for term in terms:
+            # Type II: the term adjusted for every term that does not contain it
+            others = [t for t in terms if t != term and not set(term) <= set(t)]
+            rank_without, rss_without = fit(others)
+            rank_with, rss_with = fit(others + [term])
+            term_df = rank_with - rank_without
+            sum_sq = np.clip(rss_without - rss_with, 0.0, None)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                f_stat = (sum_sq / term_df) / (rss / df_resid)
+                partial_eta = sum_sq / (sum_sq + rss)
+            if term_df < 1 or df_resid < 1:
+                f_stat = np.full(len(cols), np.nan)
+            p_value = stats.f.sf(f_stat, term_df, df_resid) if df_resid >= 1 and term_df >= 1 \
+                else np.full(len(cols), np.nan)
+            for k, j in enumerate(cols):
+                rows.append({
+                    'Factors': label,
+                    'Term': ':'.join(factors[f] for f in term),
+                    'Dependent_Variable': dependents[j],
+                    'Sum_Sq': sum_sq[k],
+                    'df': term_df,
+                    'F_statistic': f_stat[k],
+                    'P_value': p_value[k],
+                    'Significant': p_value[k] < alpha,
+                    'Partial_Eta_Squared': partial_eta[k],
+                    'N': int(total_n),
+                })
+        for k, j in enumerate(cols):
+            rows.append({
+                'Factors': label, 'Term': 'Residual', 'Dependent_Variable': dependents[j],
+                'Sum_Sq': rss[k], 'df': int(df_resid), 'F_statistic': np.nan, 'P_value': np.nan,
+                'Significant': False, 'Partial_Eta_Squared': np.nan, 'N': int(total_n),
+            })
+
+    if not rows:
+        return pd.DataFrame(columns=FACTORIAL_COLUMNS)
+    order = {dep: i for i, dep in enumerate(dependents)}
+    result = pd.DataFrame(rows, columns=FACTORIAL_COLUMNS)
+    return result.sort_values('Dependent_Variable', key=lambda col: col.map(order), kind='stable') \
+                 .reset_index(drop=True)
+
+
+def anova_table(results, dependent):
+    """One dependent's rows as an ``anova_lm`` style table (sum_sq, df, F, PR(>F))."""
+    rows = results[results['Dependent_Variable'] == dependent].set_index('Term')
+    table = rows[['Sum_Sq', 'df', 'F_statistic', 'P_value']].astype(float)
+    table.columns = ['sum_sq', 'df', 'F', 'PR(>F)']
+    table.index.name = None
+    return table
+
+
+def factorial_sweep(df, factors, dependents, order=2, alpha=0.05, max_order=None):
+    """Factorial ANOVA for every combination of ``order`` factors against all dependents."""
+    factors = list(dict.fromkeys(flatten_vars(factors)))
+    frames = [factorial_anova(df, list(combo), dependents, alpha, max_order)
+              for combo in combinations(factors, order)]
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=FACTORIAL_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Raw Survey Export Ingestion
+Turns the Google Forms responses (the .xlsx workbook or a CSV export) into
+the 20 _Score columns of comprehensive_anova_data.csv. The answer → score
+mapping is declared once, in survey_variables.SCORE_SCALES; each column is
+factorized once per chunk, so only its distinct answers are looked up and the
+scores come from one integer lookup array indexed by the codes. Answers that
+match no scale are counted and reported instead of silently becoming NaN.
+Exports are streamed in chunks, so their size is not limited by memory.
+"""
+
+import argparse
+import shutil
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from score_store import BUNDLE_SUFFIX, MISSING_CODE, write_scores
+from survey_variables import SCORE_SCALES
+
+RESPONSES_FILE = 'The Impact of IIT Internet Connectivity on Student Productivity (Responses).xlsx'
+CHUNK_ROWS = 100_000
+IGNORED_HEADERS = {'timestamp'}
+
+
+def normalize(text):
+    """Case- and whitespace-insensitive form of a header or answer."""
+    return ' '.join(str(text).split()).casefold()
+
+
+# The whole mapping, keyed by normalized question and answer
+QUESTION_COLUMNS = {normalize(question): column for column, (question, _) in SCORE_SCALES.items()}
+ANSWER_SCORES = {column: {normalize(answer): score for score, answer in enumerate(answers, start=1)}
+                 for column, (_, answers) in SCORE_SCALES.items()}
+
+
+def match_headers(headers):
+    """Map export headers to score columns.
+
+    Returns ({header: column}, unknown headers). Raises KeyError when a
+    question of SCORE_SCALES has no column in the export.
+    """
+    matched, unknown = {}, []
+    for header in headers:
+        column = QUESTION_COLUMNS.get(normalize(header))
+        if column is not None:
+            matched[header] = column
+        elif normalize(header) not in IGNORED_HEADERS:
+            unknown.append(header)
+    missing = [column for column in SCORE_SCALES if column not in matched.values()]
+    if missing:
+        raise KeyError(f"Export has no question for: {missing}")
+    return matched, unknown
+
+
+def map_column(values, scores, unmapped=None, column=None):
+    """Scores of one column of answers as int8, ``MISSING_CODE`` where blank or unmapped.
+
+    ``scores`` maps normalized answers to scores. Categorical input reuses its
+    codes; anything else is hashed once by ``pd.factorize``. Only the distinct
+    answers go through ``scores``. Unmapped answers are counted into the
+    ``unmapped`` Counter under (``column``, answer).
+    """
+    if isinstance(values, pd.Categorical):
+        codes, uniques = np.asarray(values.codes), values.categories
+    else:
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=True)
+    lookup = np.empty(len(uniques) + 1, dtype=np.int8)
+    lookup[-1] = MISSING_CODE  # code -1 is a blank answer
+    for i, answer in enumerate(uniques):
+        lookup[i] = scores.get(normalize(answer), MISSING_CODE)
+    if unmapped is not None and (lookup[:-1] == MISSING_CODE).any():
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        for i in np.flatnonzero(lookup[:-1] == MISSING_CODE):
+            unmapped[(column, uniques[i])] += int(counts[i])
+    return lookup[codes]
+
+
+def map_responses(raw, headers=None, unmapped=None):
+    """Score every mapped question of one chunk of raw answers.
+
+    Returns a DataFrame of int8 scores in SCORE_SCALES order with
+    ``MISSING_CODE`` for blank or unmapped answers.
+    """
+    headers = match_headers(raw.columns)[0] if headers is None else headers
+    by_column = {column: header for header, column in headers.items()}
+    return pd.DataFrame({column: map_column(raw[by_column[column]].array, ANSWER_SCORES[column],
+                                            unmapped, column)
+                         for column in SCORE_SCALES}, index=raw.index)
+
+
+def map_ordinal(frame, ordinal_map):
+    """Apply {column: {answer: score}} text mappings to ``frame`` in place; unmapped answers become NaN.
+
+    Scores must be non-zero, as in a .scores bundle.
+    """
+    for col, mapping in (ordinal_map or {}).items():
+        if col in frame.columns:
+            scores = map_column(frame[col].array, {normalize(answer): score for answer, score in mapping.items()})
+            frame[col] = np.where(scores == MISSING_CODE, np.nan, scores)
+    return frame
+
+
+def iter_export(path, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames of at most ``chunk_rows`` raw responses from an .xlsx or CSV export."""
+    path = Path(path)
+    if path.suffix in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == chunk_rows:
+                    yield pd.DataFrame(batch, columns=header)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=header)
+        finally:
+            workbook.close()
+    else:
+        # The C parser builds the categories while tokenizing, so no per-cell strings are kept
+        yield from pd.read_csv(path, dtype='category', chunksize=chunk_rows)
+
+
+def _remove(path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def ingest(source, output, chunk_rows=CHUNK_ROWS, strict=False):
+    """Map a raw export to score columns and write them to ``output``.
+
+    A CSV output is appended chunk by chunk (blank cells for missing
+    answers); a .scores bundle or .parquet file is written once from the
+    compact int8 scores. Everything goes to a staging path next to
+    ``output`` that replaces it only at the end, so a failed run leaves
+    ``output`` untouched; with ``strict`` any unmapped answer counts as a
+    failure. Returns (rows, unmapped Counter, unknown headers).
+    """
+    output = Path(output)
+    staging = output.with_name(f"{output.stem}.tmp{output.suffix}")
+    _remove(staging)
+    try:
+        rows, unmapped, unknown = _ingest(source, staging, chunk_rows)
+    except BaseException:
+        _remove(staging)
+        raise
+    if strict and unmapped:
+        _remove(staging)
+    else:
+        if output.is_dir():
+            shutil.rmtree(output)
+        staging.replace(output)
+    return rows, unmapped, unknown
+
+
+def _ingest(source, output, chunk_rows):
+    unmapped = Counter()
+    headers, unknown = None, []
+    rows = 0
+    parts = []
+    for chunk in iter_export(source, chunk_rows):
+        if headers is None:
+            headers, unknown = match_headers(chunk.columns)
+        scores = map_responses(chunk, headers, unmapped)
+        if output.suffix == '.csv':
+            scores.astype('Int8').mask(scores == MISSING_CODE).to_csv(
+                output, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+        else:
+            parts.append(scores)
+        rows += len(scores)
+    if headers is None:
+        raise ValueError(f"{source} has no responses")
+    if output.suffix != '.csv':
+        scores = pd.concat(parts, ignore_index=True)
+        write_scores(scores.mask(scores == MISSING_CODE), output)
+    return rows, unmapped, unknown
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Map raw survey answers to ordinal scores")
+    parser.add_argument('source', nargs='?', default=RESPONSES_FILE, help=".xlsx or CSV export of the form")
+    parser.add_argument('-o', '--output', default='comprehensive_anova_data.csv',
+                        help=f"CSV, .parquet or {BUNDLE_SUFFIX} bundle (default: comprehensive_anova_data.csv)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--strict', action='store_true', help="fail when any answer is unmapped")
+    args = parser.parse_args(argv)
+
+    print(f"📥 Mapping {args.source} …")
+    rows, unmapped, unknown = ingest(args.source, args.output, args.chunk_rows, args.strict)
+    for header in unknown:
+        print(f"⚠️  Column not in SCORE_SCALES, skipped: {header!r}")
+    for (column, answer), count in unmapped.most_common():
+        print(f"⚠️  Unmapped answer in {column}: {answer!r} ({count} responses)")
+    if unmapped and args.strict:
+        raise SystemExit(f"❌ {sum(unmapped.values())} unmapped answers; {args.output} left unchanged")
+    print(f"✅ {rows} responses × {len(SCORE_SCALES)} scores written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,28 @@
 #!/usr/bin/env python3
 """
 build_indices.py  –  Create 1–5‑scaled items, reverse‑code negatives,
-                     and generate Connectivity & Productivity composite indices.
+                     and generate Connectivity & Productivity composite indices
+                     plus Low / Medium / High connectivity terciles.
 
 Python ≥3.8, pandas, openpyxl required.
 """
 
+import sys
 import pandas as pd
 from pathlib import Path
 
+# Shared analysis modules live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from composite_index import IndexDefinition
+from ingest import map_ordinal
+from scaling_pipeline import fused_scale_and_index
+from score_store import load_scores
+
 # ------------------------------------------------------------------
 # 1.  CONFIGURATION  ------------------------------------------------
 # ------------------------------------------------------------------
 
-# 1.a  Choose the input CSV  (or .xlsx – pandas can read both)
+# 1.a  Choose the input CSV  (or .xlsx, .parquet, or a score_store.py .scores bundle)
 INPUT_FILE = "./comprehensive_anova_data.csv"
 
 # 1.b  Columns that are already numeric / continuous
@@ -30,10 +39,10 @@ NUMERIC_COLS = [
     "Future_Performance_Score",
 ]
 
-# 1.c  Ordinal / text columns → numeric mapping (all columns are already numeric)
+# 1.c  Ordinal / text columns → numeric mapping (all columns are already numeric;
+#      raw form exports are mapped by ingest.py from survey_variables.SCORE_SCALES)
 ORDINAL_MAP = {
-    # Since all columns are already numeric with _Score suffix, 
-    # we don't need any text-to-numeric mapping
+    # e.g. "Extra_Question": {"Never": 1, "Sometimes": 2, "Always": 3},
 }
 
 # 1.d  Items where HIGH raw value means WORSE outcome
@@ -70,67 +79,60 @@ def rescale_1to5(series: pd.Series) -> pd.Series:
     return (series - s_min) / (s_max - s_min) * 4 + 1
 
 
-def reverse_code(series: pd.Series) -> pd.Series:
-    """Assumes incoming series already on a 1‑5 scale."""
-    return 6 - series
-
-
 # ------------------------------------------------------------------
 # 3.  LOAD DATA  ----------------------------------------------------
 # ------------------------------------------------------------------
 
 print(f"Reading {INPUT_FILE} …")
-df = pd.read_csv(INPUT_FILE) if INPUT_FILE.endswith(".csv") else pd.read_excel(INPUT_FILE)
+df = load_scores(INPUT_FILE)
 
 # ------------------------------------------------------------------
 # 4.  MAP ORDINAL TEXT → NUMERIC -----------------------------------
 # ------------------------------------------------------------------
 
-for col, mapping in ORDINAL_MAP.items():
-    if col in df.columns:
-        df[col] = df[col].map(mapping)
-    else:
+for col in ORDINAL_MAP:
+    if col not in df.columns:
         print(f"⚠️  Column '{col}' listed in ORDINAL_MAP but not found in file.")
+map_ordinal(df, ORDINAL_MAP)
 
 # ------------------------------------------------------------------
-# 5.  RESCALE EVERYTHING TO 1‑5  -----------------------------------
+# 5.  RESCALE ORDINAL‑MAPPED COLUMNS TO 1‑5  -----------------------
 # ------------------------------------------------------------------
 
-# A. numeric columns
-for col in NUMERIC_COLS:
-    if col in df.columns:
-        df[col] = rescale_1to5(df[col])
-    else:
-        print(f"⚠️  Column '{col}' listed in NUMERIC_COLS but not found in file.")
-
-# B. any ordinal‑mapped columns now numeric but maybe not 1‑5 (depends on map)
+# any ordinal‑mapped columns now numeric but maybe not 1‑5 (depends on map)
 for col in ORDINAL_MAP:
     if col in df.columns and (df[col].min() < 1 or df[col].max() > 5):
         df[col] = rescale_1to5(df[col])
 
 # ------------------------------------------------------------------
-# 6.  REVERSE‑CODE “higher = worse” ITEMS --------------------------
+# 6.  RESCALE, REVERSE‑CODE AND INDEX IN ONE FUSED PASS  -----------
 # ------------------------------------------------------------------
 
+for col in NUMERIC_COLS:
+    if col not in df.columns:
+        print(f"⚠️  Column '{col}' listed in NUMERIC_COLS but not found in file.")
 for col in Productivity_loss:
-    if col in df.columns:
-        df[f"{col}_R"] = reverse_code(df[col])
-    else:
+    if col not in df.columns:
         print(f"⚠️  Column '{col}' listed in REVERSE_ITEMS but not found in file.")
 
-# ------------------------------------------------------------------
-# 7.  BUILD COMPOSITE INDICES  -------------------------------------
-# ------------------------------------------------------------------
-
-def safe_mean(row, cols):
-    vals = row[cols].dropna()
-    return vals.mean() if len(vals) else pd.NA
+INDEX_DEFINITIONS = [
+    IndexDefinition("Connectivity_Index", Internet_connectivity),
+    IndexDefinition("Productivity_Index", Productivity),
+]
 
-df["Connectivity_Index"] = df.apply(lambda row: safe_mean(row, Internet_connectivity), axis=1)
-df["Productivity_Index"] = df.apply(lambda row: safe_mean(row, Productivity), axis=1)
+# One float copy of the numeric block: min/max reduction, in‑place affine
+# rescale + reverse coding, NaN‑aware index means and Low/Medium/High terciles
+scaled = fused_scale_and_index(
+    df,
+    scaled_cols=[col for col in NUMERIC_COLS if col in df.columns],
+    reverse_cols=[col for col in Productivity_loss if col in df.columns],
+    definitions=INDEX_DEFINITIONS,
+)
+for col in scaled.columns:
+    df[col] = scaled[col]
 
 # ------------------------------------------------------------------
-# 8.  SAVE  ---------------------------------------------------------
+# 7.  SAVE  ---------------------------------------------------------
 # ------------------------------------------------------------------
 
 df.to_excel(OUTPUT_FILE, index=False)
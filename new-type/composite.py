@@ -2,18 +2,25 @@
 """
 build_composite_from_scaled.py
 --------------------------------
-Create Connectivity_Index and Productivity_Index
-from the already scaled / reverse‑coded columns
-stored in composite_indices.xlsx.
+Create Connectivity_Index, Productivity_Index and the Low / Medium / High
+Connectivity_Group straight from the mapped scores. Rescaling, reverse
+coding, the index means and the terciles run as one fused pass, so the
+scaled_data.xlsx round‑trip is no longer needed.
 """
 
-import pandas as pd
+import sys
 from pathlib import Path
 
+# Shared analysis modules live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from composite_index import IndexDefinition
+from scaling_pipeline import REVERSE_ITEMS, SCALED_COLUMNS, fused_scale_and_index
+from score_store import load_scores
+
 # ------------------------------------------------------------------
 # 1. CONFIG – ADJUST TO YOUR FILE ----------------------------------
 # ------------------------------------------------------------------
-INPUT_FILE  = Path("scaled_data.xlsx")
+INPUT_FILE  = Path("comprehensive_anova_data.csv")
 OUTPUT_FILE = Path("composite_indices_with_scores.xlsx")
 
 # Columns that belong in each composite  (✏️  customise these)
@@ -28,39 +35,24 @@ STUDENT_PRODUCTIVITY_METRICS = [
 ]
 
 # ------------------------------------------------------------------
-# 2. LOAD THE WORKBOOK ---------------------------------------------
+# 2. LOAD THE MAPPED SCORES ----------------------------------------
 # ------------------------------------------------------------------
 print(f"📂  Reading {INPUT_FILE} …")
-df = pd.read_excel(INPUT_FILE)
-
-# Sanity check – warn if any expected column is missing
-missing_connect = [c for c in INTERNET_CONNECTIVITY_METRICS  if c not in df.columns]
-missing_prod    = [c for c in STUDENT_PRODUCTIVITY_METRICS if c not in df.columns]
-if missing_connect or missing_prod:
-    raise ValueError(
-        f"Missing columns:\n"
-        f"  Connectivity: {missing_connect}\n"
-        f"  Productivity: {missing_prod}"
-    )
+df = load_scores(INPUT_FILE, columns=list(dict.fromkeys(SCALED_COLUMNS + REVERSE_ITEMS)))
 
 # ------------------------------------------------------------------
-# 3. COMPUTE THE COMPOSITE INDICES ---------------------------------
+# 3. SCALE, REVERSE‑CODE AND COMPUTE THE COMPOSITE INDICES ---------
 # ------------------------------------------------------------------
-df["Connectivity_Index"] = df[INTERNET_CONNECTIVITY_METRICS].mean(axis=1, skipna=True)
-df["Productivity_Index"] = df[STUDENT_PRODUCTIVITY_METRICS].mean(axis=1, skipna=True)
-
-# Optional: categorise connectivity into Low / Medium / High terciles
-df["Connectivity_Group"] = pd.qcut(
-    df["Connectivity_Index"],
-    q=[0, 1/3, 2/3, 1],
-    labels=["Low", "Medium", "High"]
-)
+scaled = fused_scale_and_index(df, definitions=[
+    IndexDefinition("Connectivity_Index", INTERNET_CONNECTIVITY_METRICS),
+    IndexDefinition("Productivity_Index", STUDENT_PRODUCTIVITY_METRICS),
+])
 
 # ------------------------------------------------------------------
 # 4. SAVE THE RESULT -----------------------------------------------
 # ------------------------------------------------------------------
 # Create a new dataframe with only the composite indices
-composite_df = df[["Connectivity_Index", "Productivity_Index", "Connectivity_Group"]].copy()
+composite_df = scaled[["Connectivity_Index", "Productivity_Index", "Connectivity_Group"]]
 
 composite_df.to_excel(OUTPUT_FILE, index=False)
 print(f"✅  Done!  Composite indices written to {OUTPUT_FILE}")
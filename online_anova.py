@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Incremental ANOVA for Streaming Survey Responses
+Keeps per-(factor, level, dependent) count / sum / sum-of-squares state that
+can ingest new response rows, be merged with other accumulators, be saved to
+disk, and report F, p and eta-squared for every tracked pair on demand.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from anova_engine import GroupStats, flatten_vars, multi_group_stats, results_frame
+from result_cache import forget_results
+
+
+class OnlineAnova:
+    """Mergeable one-way ANOVA sufficient statistics for many factor/dependent pairs."""
+
+    def __init__(self, independent_vars, dependent_vars):
+        self.factors = list(dict.fromkeys(flatten_vars(independent_vars)))
+        self.dependents = list(dict.fromkeys(flatten_vars(dependent_vars)))
+        self.rows_seen = 0
+        # factor -> {'levels': [...], 'n': array, 's': array, 'ss': array}
+        self.state = {}
+
+    def _dependents_for(self, factor):
+        return [dep for dep in self.dependents if dep != factor]
+
+    def _absorb(self, gs):
+        """Add one factor's GroupStats into the running state, aligning levels."""
+        current = self.state.get(gs.factor)
+        if current is None:
+            self.state[gs.factor] = {
+                'levels': [level.item() if hasattr(level, 'item') else level for level in gs.levels],
+                'n': np.array(gs.n, dtype=np.float64),
+                's': np.array(gs.s, dtype=np.float64),
+                'ss': np.array(gs.ss, dtype=np.float64),
+            }
+            return
+
+        index = {level: i for i, level in enumerate(current['levels'])}
+        new_levels = [level.item() if hasattr(level, 'item') else level for level in gs.levels]
+        unseen = [level for level in new_levels if level not in index]
+        if unseen:
+            current['levels'] = sorted(current['levels'] + unseen)
+            order = [current['levels'].index(level) for level in index]
+            for key in ('n', 's', 'ss'):
+                grown = np.zeros((len(current['levels']), current[key].shape[1]))
+                grown[order] = current[key]
+                current[key] = grown
+            index = {level: i for i, level in enumerate(current['levels'])}
+        rows = [index[level] for level in new_levels]
+        for key in ('n', 's', 'ss'):
+            np.add.at(current[key], rows, getattr(gs, key))
+
+    def update(self, df):
+        """Ingest new response rows; cost is proportional to the new rows only."""
+        for gs in multi_group_stats(df, self.factors, self.dependents).values():
+            self._absorb(gs)
+        self.rows_seen += len(df)
+        return self
+
+    def merge(self, other):
+        """Fold another accumulator tracking the same variables into this one."""
+        if other.factors != self.factors or other.dependents != self.dependents:
+            raise ValueError("Cannot merge accumulators that track different variables")
+        for gs in other.group_stats():
+            self._absorb(gs)
+        self.rows_seen += other.rows_seen
+        return self
+
+    def group_stats(self):
+        """Current state as a list of GroupStats, one per factor seen so far."""
+        return [
+            GroupStats(
+                factor=factor,
+                levels=np.asarray(self.state[factor]['levels']),
+                dependents=self._dependents_for(factor),
+                n=self.state[factor]['n'],
+                s=self.state[factor]['s'],
+                ss=self.state[factor]['ss'],
+            )
+            for factor in self.factors if factor in self.state
+        ]
+
+    def results(self, alpha=0.05):
+        """F, p and eta-squared for all tracked pairs, in the anova_results.csv schema."""
+        return results_frame(self.group_stats(), alpha)
+
+    def to_dict(self):
+        return {
+            'factors': self.factors,
+            'dependents': self.dependents,
+            'rows_seen': self.rows_seen,
+            'state': {
+                factor: {
+                    'levels': entry['levels'],
+                    'n': entry['n'].tolist(),
+                    's': entry['s'].tolist(),
+                    'ss': entry['ss'].tolist(),
+                }
+                for factor, entry in self.state.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        acc = cls(data['factors'], data['dependents'])
+        acc.rows_seen = data['rows_seen']
+        for factor, entry in data['state'].items():
+            # Keep (levels, dependents) even for a factor with no levels yet, whose lists are empty
+            shape = (len(entry['levels']), len(acc._dependents_for(factor)))
+            acc.state[factor] = {
+                'levels': entry['levels'],
+                'n': np.array(entry['n'], dtype=np.float64).reshape(shape),
+                's': np.array(entry['s'], dtype=np.float64).reshape(shape),
+                'ss': np.array(entry['ss'], dtype=np.float64).reshape(shape),
+            }
+        return acc
+
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+def main():
+    from survey_variables import dependent_vars, independent_vars
+
+    parser = argparse.ArgumentParser(description="Fold new survey responses into a saved ANOVA state")
+    parser.add_argument('responses', nargs='*', help="CSV files with new mapped responses")
+    parser.add_argument('--state', default='anova_state.json', help="accumulator file to update")
+    parser.add_argument('--output', default='anova_results.csv', help="where to write the updated results")
+    args = parser.parse_args()
+
+    state_path = Path(args.state)
+    if state_path.exists():
+        acc = OnlineAnova.load(state_path)
+        print(f"📂 Loaded state with {acc.rows_seen} responses from {state_path}")
+    else:
+        acc = OnlineAnova(independent_vars, dependent_vars)
+        print(f"🆕 Starting new ANOVA state at {state_path}")
+
+    for path in args.responses:
+        new_rows = pd.read_csv(path)
+        acc.update(new_rows)
+        print(f"   + {len(new_rows)} responses from {path}")
+
+    acc.save(state_path)
+    results = acc.results()
+    results.to_csv(args.output, index=False)
+    forget_results(args.output)
+    print(f"✅ {len(results)} tests over {acc.rows_seen} responses saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,272 +1,494 @@
-import pandas as pd
-import numpy as np
-from scipy import stats
-from scipy.stats import f_oneway
-import matplotlib.pyplot as plt
-import seaborn as sns
-from statsmodels.stats.multicomp import pairwise_tukeyhsd
-from statsmodels.formula.api import ols
-from statsmodels.stats.anova import anova_lm
+#!/usr/bin/env python3
+"""
+Comprehensive ANOVA Analysis of the IIT Internet Connectivity Survey
+One-way, two-way and factorial ANOVAs, post-hoc tests and assumption checks
+on the mapped scores. Run as a script, through ``cli.py anova``, or call
+``main()`` with an argument list.
+"""
+
+import argparse
 import warnings
-warnings.filterwarnings('ignore')
-
-# Load the comprehensive mapped data
-df = pd.read_csv("comprehensive_anova_data.csv")
-
-print("=== COMPREHENSIVE ANOVA ANALYSIS ===")
-print(f"Dataset: {df.shape[0]} responses × {df.shape[1]} variables")
-print("All variables are numeric and ready for ANOVA testing!")
 
-# Define variable categories for different types of ANOVA
-independent_vars = {
-    'Demographics': ['Academic_Year_Score', 'Device_Capability_Score', 'Residence_Score'],
-    'Infrastructure': ['WiFi_Speed_Score', 'Reliability_Score', 'Peak_Performance_Score', 'Outage_Frequency_Score'],
-    'Usage_Patterns': ['Daily_Hours_Score', 'Alternative_Sources_Score', 'Schedule_Changes_Score', 'Download_Frequency_Score'],
-    'Spending': ['Monthly_Spending_Score']
-}
+import pandas as pd
 
-dependent_vars = {
-    'Academic_Performance': ['Programming_Impact_Score', 'Collaboration_Score', 'LMS_Access_Score', 'Productivity_Influence_Score'],
-    'Performance_Issues': ['Task_Abandonment_Score', 'Time_Lost_Score'],
-    'Adaptation': ['Offpeak_Effectiveness_Score'],
-    'Future_Expectations': ['Future_Performance_Score']
+from assumptions import assumption_checks
+from anova_engine import annotate_sweep, batch_oneway, group_stats, group_summary, multi_group_stats, sweep_variables
+from bootstrap import bootstrap_oneway
+from factorial_anova import anova_table, factorial_anova, factorial_sweep
+from permutation_anova import permutation_anova
+from posthoc import POSTHOC_COLUMNS, tukey_table
+from rank_engine import kruskal_wallis, welch_anova
+from result_cache import CACHE_DIR, PAIR_KEYS, ResultCache, cached_pairs, dataset_fingerprint, write_results
+from score_store import load_scores
+from stratified_anova import STRATA, stratified_oneway
+from survey_variables import dependent_vars, independent_vars
+
+# Same result schema for every test; F_statistic holds the test's statistic
+ONEWAY_TESTS = {
+    'anova': (batch_oneway, 'F'),
+    'kruskal': (kruskal_wallis, 'H'),
+    'welch': (welch_anova, 'Welch F'),
 }
 
-print("\n" + "="*80)
-print("1. ONE-WAY ANOVA: WiFi Speed vs Academic Performance Variables")
-print("="*80)
-
-# Perform one-way ANOVA for WiFi Speed vs each academic performance variable
-wifi_groups = {}
-for speed in sorted(df['WiFi_Speed_Score'].unique()):
-    wifi_groups[speed] = df[df['WiFi_Speed_Score'] == speed]
-
-speed_labels = {1: 'Very Poor', 2: 'Poor', 3: 'Average', 4: 'Good'}
-
-print("📊 Testing: Does WiFi Speed affect Academic Performance?")
-print("\nWiFi Speed Groups:")
-for speed, label in speed_labels.items():
-    count = len(wifi_groups.get(speed, []))
-    print(f"  {label} WiFi (Score {speed}): {count} students")
-
-# Test each academic performance variable
-academic_vars = ['Programming_Impact_Score', 'Collaboration_Score', 'LMS_Access_Score', 'Productivity_Influence_Score']
-
-anova_results = []
-for var in academic_vars:
-    print(f"\n🔍 ANOVA: WiFi Speed → {var}")
-    
-    # Prepare groups for ANOVA
-    groups = []
-    group_stats = []
-    for speed in sorted(df['WiFi_Speed_Score'].unique()):
-        group_data = df[df['WiFi_Speed_Score'] == speed][var].values
-        if len(group_data) > 0:
-            groups.append(group_data)
-            group_stats.append({
-                'speed': speed_labels[speed],
-                'n': len(group_data),
-                'mean': np.mean(group_data),
-                'std': np.std(group_data, ddof=1)
-            })
-    
-    # Perform ANOVA
-    if len(groups) >= 2:
-        f_stat, p_value = f_oneway(*groups)
-        
-        print(f"   F-statistic: {f_stat:.4f}")
-        print(f"   P-value: {p_value:.4f}")
-        print(f"   Significant: {'✅ Yes' if p_value < 0.05 else '❌ No'} (α = 0.05)")
-        
-        # Store results
-        anova_results.append({
-            'Independent': 'WiFi_Speed_Score',
-            'Dependent': var,
-            'F_statistic': f_stat,
-            'P_value': p_value,
-            'Significant': p_value < 0.05
-        })
-        
-        # Show group statistics
-        print("   Group Statistics:")
-        for stat in group_stats:
-            print(f"     {stat['speed']:10} (n={stat['n']:2d}): Mean={stat['mean']:.2f}, Std={stat['std']:.2f}")
+SPEED_LABELS = {1: 'Very Poor', 2: 'Poor', 3: 'Average', 4: 'Good'}
+RELIABILITY_LABELS = {1: 'Unreliable', 2: 'Moderate', 3: 'Reliable'}
+ACADEMIC_VARS = ['Programming_Impact_Score', 'Collaboration_Score', 'LMS_Access_Score', 'Productivity_Influence_Score']
+INFRASTRUCTURE_VARS = ['WiFi_Speed_Score', 'Reliability_Score', 'Peak_Performance_Score', 'Outage_Frequency_Score']
+PERFORMANCE_VARS = ['Task_Abandonment_Score', 'Time_Lost_Score']
+
+
+def build_parser(prog=None):
+    parser = argparse.ArgumentParser(prog=prog,
+                                     description="Comprehensive ANOVA analysis of the IIT connectivity survey")
+    parser.add_argument('--sweep', action='store_true',
+                        help="test every independent × dependent pair in one batch and exit")
+    parser.add_argument('--all-scores', action='store_true',
+                        help="with --sweep, also test every _Score column against every other")
+    parser.add_argument('--permutations', type=int, default=0, metavar='N',
+                        help="add permutation p-values (P_perm) from N label shuffles per tested pair")
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='N',
+                        help="add BCa confidence intervals for eta-squared and group means from N resamples")
+    parser.add_argument('--data', default="comprehensive_anova_data.csv",
+                        help="mapped scores: CSV, Parquet or a score_store.py .scores bundle")
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help="directory of cached per-pair results (keyed on column data and test settings)")
+    parser.add_argument('--no-cache', action='store_true', help="recompute every result")
+    parser.add_argument('--stratify', nargs='*', metavar='VAR',
+                        help="repeat the one-way F tests within every level of each VAR "
+                             f"(default: {', '.join(STRATA)}) and write stratified_results.csv; "
+                             "with --sweep, for every sweep pair")
+    parser.add_argument('--test', choices=sorted(ONEWAY_TESTS), default='anova',
+                        help="one-way test for sections 1 and 3 and the sweep: classic F, "
+                             "tie-corrected Kruskal-Wallis H or Welch's F")
+    return parser
+
+
+def oneway_pairs(cache, df, factors, dependents, test='anova'):
+    kind = 'oneway' if test == 'anova' else test
+    return cached_pairs(cache, df, kind, factors, dependents, ONEWAY_TESTS[test][0], spec={'alpha': 0.05})
+
+
+def assumption_pairs(cache, df, factors, dependents):
+    return cached_pairs(cache, df, 'assumptions', factors, dependents, assumption_checks, spec={'alpha': 0.05})
+
+
+def tukey_pairs(cache, df, results, alpha=0.05):
+    """Tukey HSD comparisons of every significant pair in ``results``, cached per pair."""
+    def compute(data, factors, deps):
+        table = tukey_table(multi_group_stats(data, factors, deps).values(), alpha)
+        comparisons = {pair: group.drop(columns=PAIR_KEYS).to_dict('records')
+                       for pair, group in table.groupby(PAIR_KEYS, sort=False)}
+        return pd.DataFrame([{'Independent_Variable': factor, 'Dependent_Variable': dep,
+                              'Comparisons': comparisons.get((factor, dep), [])}
+                             for factor in factors for dep in deps if dep != factor])
+
+    selected = results[results['Significant'].astype(bool)]
+    rows = []
+    for factor, deps in selected.groupby('Independent_Variable', sort=False)['Dependent_Variable']:
+        pairs = cached_pairs(cache, df, 'tukey_hsd', [factor], list(deps), compute, spec={'alpha': alpha})
+        rows += [{'Independent_Variable': factor, 'Dependent_Variable': row['Dependent_Variable'], **comparison}
+                 for _, row in pairs.iterrows() for comparison in row['Comparisons']]
+    return pd.DataFrame(rows, columns=POSTHOC_COLUMNS)
+
+
+def permutation_pairs(cache, df, factors, dependents, n_permutations):
+    def compute(data, factors, deps, pair_seeds):
+        return permutation_anova(data, factors, deps, n_permutations=n_permutations, pair_seeds=pair_seeds)[
+            ['Independent_Variable', 'Dependent_Variable', 'P_perm']]
+    return cached_pairs(cache, df, 'permutation', factors, dependents, compute,
+                        spec={'n_permutations': n_permutations, 'seed': 'pair'}, seeded=True)
+
+
+def bootstrap_pairs(cache, df, factors, dependents, n_boot):
+    """Effect-size intervals per pair and the matching group-mean intervals."""
+    def compute(data, factors, deps, pair_seeds):
+        effect_ci, means_ci = bootstrap_oneway(data, factors, deps, n_boot=n_boot, pair_seeds=pair_seeds)
+        effect_ci = effect_ci[['Independent_Variable', 'Dependent_Variable',
+                               'Effect_Size_CI_Low', 'Effect_Size_CI_High']].copy()
+        pair_means = means_ci.groupby(['Independent_Variable', 'Dependent_Variable'], sort=False)
+        effect_ci['Group_Means'] = [
+            pair_means.get_group(pair).drop(columns=['Independent_Variable', 'Dependent_Variable']).to_dict('records')
+            for pair in zip(effect_ci['Independent_Variable'], effect_ci['Dependent_Variable'])]
+        return effect_ci
+    pairs = cached_pairs(cache, df, 'bootstrap', factors, dependents, compute,
+                         spec={'n_boot': n_boot, 'method': 'bca', 'seed': 'pair'}, seeded=True)
+    means_ci = pd.DataFrame([{'Independent_Variable': row['Independent_Variable'],
+                              'Dependent_Variable': row['Dependent_Variable'], **level}
+                             for _, row in pairs.iterrows() for level in row['Group_Means']])
+    return pairs.drop(columns='Group_Means'), means_ci
+
+
+def heading(title):
+    print("\n" + "="*80)
+    print(title)
+    print("="*80)
+
+
+def run_sweep(df, args, cache):
+    """Every independent × dependent pair in one batch, written to anova_results.csv."""
+    stat_label = ONEWAY_TESTS[args.test][1]
+    heading("ALL-PAIRS ANOVA SWEEP")
+
+    sweep_factors, sweep_dependents = sweep_variables(df.columns, independent_vars, dependent_vars,
+                                                      score_pairs=args.all_scores)
+    sweep_results = annotate_sweep(oneway_pairs(cache, df, sweep_factors, sweep_dependents, args.test),
+                                   independent_vars, dependent_vars)
+    sweep_results = sweep_results.merge(assumption_pairs(cache, df, sweep_factors, sweep_dependents),
+                                        on=['Independent_Variable', 'Dependent_Variable'], how='left')
+    if args.permutations:
+        perm = permutation_pairs(cache, df, sweep_factors, sweep_dependents, args.permutations)
+        sweep_results = sweep_results.merge(perm, on=['Independent_Variable', 'Dependent_Variable'], how='left')
+    if args.bootstrap:
+        effect_ci, means_ci = bootstrap_pairs(cache, df, sweep_factors, sweep_dependents, args.bootstrap)
+        sweep_results = sweep_results.merge(effect_ci, on=['Independent_Variable', 'Dependent_Variable'], how='left')
+        means_ci.to_csv("group_means_ci.csv", index=False)
+
+    print(f"📊 Tests performed: {len(sweep_results)}")
+    print(f"   Significant (p < 0.05, uncorrected): {sweep_results['Significant'].sum()}")
+    print(f"   Significant after Holm correction: {sweep_results['Significant_Holm'].sum()}")
+    print(f"   Significant after Benjamini-Hochberg: {sweep_results['Significant_BH'].sum()}")
+    print(f"   Pairs needing Welch / Kruskal-Wallis: "
+          f"{(sweep_results['Recommended_Test'] == 'Welch').sum()} / "
+          f"{(sweep_results['Recommended_Test'] == 'Kruskal-Wallis').sum()}")
+
+    top = sweep_results.nsmallest(5, 'P_value')
+    print(f"\n🏆 Strongest Relationships:")
+    for _, row in top.iterrows():
+        print(f"   {row['Independent_Variable']} → {row['Dependent_Variable']}: "
+              f"{stat_label} = {row['F_statistic']:.3f}, p = {row['P_value']:.4f}, p(Holm) = {row['P_holm']:.4f}")
+
+    write_results(sweep_results, "anova_results.csv", df, args.data)
+    print(f"\n💾 Extended sweep results saved to: anova_results.csv")
+    posthoc_results = tukey_pairs(cache, df, sweep_results)
+    posthoc_results.to_csv("posthoc_results.csv", index=False)
+    print(f"💾 Tukey HSD for {sweep_results['Significant'].sum()} significant pairs "
+          f"({len(posthoc_results)} comparisons) saved to: posthoc_results.csv")
+    print(f"♻️  Cache: {cache.hits} results reused, {cache.misses} computed")
+    return sweep_results
+
+
+def run_stratified(df, args):
+    """The one-way tests within every stratum, written to stratified_results.csv."""
+    heading("STRATIFIED ONE-WAY ANOVA")
+    strata = args.stratify or STRATA
+    if args.sweep:
+        factors, dependents = sweep_variables(df.columns, independent_vars, dependent_vars,
+                                              score_pairs=args.all_scores)
+        pairs = None
     else:
-        print("   ⚠️  Not enough groups for ANOVA")
-
-print("\n" + "="*80)
-print("2. TWO-WAY ANOVA: WiFi Speed + Reliability vs Productivity")
-print("="*80)
-
-# Two-way ANOVA using statsmodels
-print("📊 Testing: Do WiFi Speed AND Reliability together affect Productivity?")
-
-# Create a combined dataset for two-way ANOVA
-df_twoway = df[['WiFi_Speed_Score', 'Reliability_Score', 'Productivity_Influence_Score']].copy()
-df_twoway = df_twoway.dropna()
-
-print(f"Sample size: {len(df_twoway)} complete cases")
-
-# Convert to categorical for better interpretation
-df_twoway['WiFi_Category'] = df_twoway['WiFi_Speed_Score'].map(speed_labels)
-reliability_labels = {1: 'Unreliable', 2: 'Moderate', 3: 'Reliable'}
-df_twoway['Reliability_Category'] = df_twoway['Reliability_Score'].map(reliability_labels)
-
-# Show group sizes
-print("\nGroup Combinations:")
-group_counts = df_twoway.groupby(['WiFi_Category', 'Reliability_Category']).size()
-for (wifi, rel), count in group_counts.items():
-    if count > 0:
-        mean_prod = df_twoway[(df_twoway['WiFi_Category'] == wifi) & 
-                             (df_twoway['Reliability_Category'] == rel)]['Productivity_Influence_Score'].mean()
-        print(f"  {wifi} WiFi + {rel} Reliability: {count} students (Mean Productivity: {mean_prod:.2f})")
-
-# Perform two-way ANOVA
-try:
-    model = ols('Productivity_Influence_Score ~ C(WiFi_Category) + C(Reliability_Category) + C(WiFi_Category):C(Reliability_Category)', 
-                data=df_twoway).fit()
-    anova_table = anova_lm(model, typ=2)
-    
-    print(f"\n🔍 Two-Way ANOVA Results:")
-    print(anova_table)
-    
+        factors = list(dict.fromkeys(['WiFi_Speed_Score'] + INFRASTRUCTURE_VARS))
+        dependents = ACADEMIC_VARS + PERFORMANCE_VARS
+        pairs = ([('WiFi_Speed_Score', dv) for dv in ACADEMIC_VARS]
+                 + [(iv, dv) for iv in INFRASTRUCTURE_VARS for dv in PERFORMANCE_VARS])
+    results = stratified_oneway(df, factors, dependents, strata=strata, pairs=pairs)
+
+    tested = results['P_value'].notna()
+    print(f"📊 {len(results)} stratum × pair tests over {', '.join(strata)} "
+          f"({(~tested).sum()} strata too small to test, see Untested_Reason)")
+    print(f"   Significant (p < 0.05, uncorrected): {results['Significant'].sum()}")
+    print(f"   Significant after Holm correction: {results['Significant_Holm'].sum()}")
+    print(f"   Significant after Benjamini-Hochberg: {results['Significant_BH'].sum()}")
+    print(f"\n🏆 Strongest Within-Stratum Relationships:")
+    for _, row in results[tested].nsmallest(5, 'P_value').iterrows():
+        print(f"   [{row['Stratum_Variable']} = {row['Stratum']:g}] "
+              f"{row['Independent_Variable']} → {row['Dependent_Variable']}: "
+              f"F = {row['F_statistic']:.3f}, p = {row['P_value']:.4f}, η² = {row['Effect_Size']:.3f}, n = {row['N']}")
+
+    results.to_csv("stratified_results.csv", index=False)
+    print(f"\n💾 Stratified results saved to: stratified_results.csv")
+    return results
+
+
+def wifi_academic_section(df, args, cache):
+    """Section 1: WiFi speed against every academic performance variable."""
+    stat_label = ONEWAY_TESTS[args.test][1]
+    heading("1. ONE-WAY ANOVA: WiFi Speed vs Academic Performance Variables")
+
+    # One grouped pass gives every group's count, sum and sum of squares
+    wifi_stats = group_stats(df, 'WiFi_Speed_Score', ACADEMIC_VARS)
+    wifi_summary = group_summary(wifi_stats)
+    wifi_results = oneway_pairs(cache, df, ['WiFi_Speed_Score'], ACADEMIC_VARS, args.test)
+
+    print("📊 Testing: Does WiFi Speed affect Academic Performance?")
+    print("\nWiFi Speed Groups:")
+    level_counts = dict(zip(wifi_stats.levels, wifi_stats.n[:, 0].astype(int)))
+    for speed, label in SPEED_LABELS.items():
+        count = level_counts.get(speed, 0)
+        print(f"  {label} WiFi (Score {speed}): {count} students")
+
+    anova_results = []
+    for _, result in wifi_results.iterrows():
+        var = result['Dependent_Variable']
+        print(f"\n🔍 ANOVA: WiFi Speed → {var}")
+
+        if result['df_between'] >= 1:
+            f_stat, p_value = result['F_statistic'], result['P_value']
+
+            print(f"   {stat_label}-statistic: {f_stat:.4f}")
+            print(f"   P-value: {p_value:.4f}")
+            print(f"   Significant: {'✅ Yes' if p_value < 0.05 else '❌ No'} (α = 0.05)")
+
+            # Store results
+            anova_results.append({
+                'Independent': 'WiFi_Speed_Score',
+                'Dependent': var,
+                'F_statistic': f_stat,
+                'P_value': p_value,
+                'Significant': p_value < 0.05
+            })
+
+            # Show group statistics
+            print("   Group Statistics:")
+            for _, stat in wifi_summary[wifi_summary['Dependent_Variable'] == var].iterrows():
+                print(f"     {SPEED_LABELS[stat['Level']]:10} (n={stat['n']:2d}): Mean={stat['mean']:.2f}, Std={stat['std']:.2f}")
+        else:
+            print("   ⚠️  Not enough groups for ANOVA")
+    return anova_results
+
+
+def twoway_section(df, cache):
+    """Section 2: WiFi speed × reliability on productivity, plus the infrastructure factorial sweep."""
+    heading("2. TWO-WAY ANOVA: WiFi Speed + Reliability vs Productivity")
+
+    print("📊 Testing: Do WiFi Speed AND Reliability together affect Productivity?")
+
+    # Create a combined dataset for two-way ANOVA
+    df_twoway = df[['WiFi_Speed_Score', 'Reliability_Score', 'Productivity_Influence_Score']].copy()
+    df_twoway = df_twoway.dropna()
+
+    print(f"Sample size: {len(df_twoway)} complete cases")
+
+    # Convert to categorical for better interpretation
+    df_twoway['WiFi_Category'] = df_twoway['WiFi_Speed_Score'].map(SPEED_LABELS)
+    df_twoway['Reliability_Category'] = df_twoway['Reliability_Score'].map(RELIABILITY_LABELS)
+
+    # Show group sizes
+    print("\nGroup Combinations:")
+    group_counts = df_twoway.groupby(['WiFi_Category', 'Reliability_Category']).size()
+    for (wifi, rel), count in group_counts.items():
+        if count > 0:
+            mean_prod = df_twoway[(df_twoway['WiFi_Category'] == wifi) &
+                                  (df_twoway['Reliability_Category'] == rel)]['Productivity_Influence_Score'].mean()
+            print(f"  {wifi} WiFi + {rel} Reliability: {count} students (Mean Productivity: {mean_prod:.2f})")
+
+    # Type II two-way ANOVA from cell sums; empty cells only reduce the interaction's df
+    twoway_factors = ['WiFi_Category', 'Reliability_Category']
+    n_cells = df_twoway['WiFi_Category'].nunique() * df_twoway['Reliability_Category'].nunique()
+    empty_cells = n_cells - len(group_counts)
+    if empty_cells:
+        print(f"\n⚠️  {empty_cells} of {n_cells} WiFi × Reliability cells are empty; "
+              f"degrees of freedom come from the design rank")
+
+    twoway_cached = cache.memoize(
+        'twoway_typ2', dataset_fingerprint(df_twoway, ['WiFi_Speed_Score', 'Reliability_Score',
+                                                       'Productivity_Influence_Score']).values(),
+        {'factors': twoway_factors},
+        lambda: anova_table(factorial_anova(df_twoway, twoway_factors, ['Productivity_Influence_Score']),
+                            'Productivity_Influence_Score').to_dict('split'))
+    twoway_table = pd.DataFrame(**twoway_cached)
+
+    print(f"\n🔍 Two-Way ANOVA Results (Type II):")
+    print(twoway_table)
+
     print(f"\nInterpretation:")
-    wifi_p = anova_table.loc['C(WiFi_Category)', 'PR(>F)']
-    rel_p = anova_table.loc['C(Reliability_Category)', 'PR(>F)']
-    int_p = anova_table.loc['C(WiFi_Category):C(Reliability_Category)', 'PR(>F)']
-    
+    wifi_p = twoway_table.loc['WiFi_Category', 'PR(>F)']
+    rel_p = twoway_table.loc['Reliability_Category', 'PR(>F)']
+    int_p = twoway_table.loc['WiFi_Category:Reliability_Category', 'PR(>F)']
+
     print(f"  WiFi Speed main effect: {'✅ Significant' if wifi_p < 0.05 else '❌ Not significant'} (p={wifi_p:.4f})")
     print(f"  Reliability main effect: {'✅ Significant' if rel_p < 0.05 else '❌ Not significant'} (p={rel_p:.4f})")
     print(f"  Interaction effect: {'✅ Significant' if int_p < 0.05 else '❌ Not significant'} (p={int_p:.4f})")
-    
-except Exception as e:
-    print(f"⚠️  Two-way ANOVA error: {e}")
 
-print("\n" + "="*80)
-print("3. MULTIPLE ONE-WAY ANOVAs: Infrastructure vs Performance Issues")
-print("="*80)
-
-print("📊 Testing: How do different infrastructure factors affect performance issues?")
+    # Every pair of infrastructure factors against every outcome, one design per pair
+    factorial_results = factorial_sweep(df, independent_vars['Infrastructure'], dependent_vars)
+    factorial_results.to_csv("factorial_results.csv", index=False)
+    effects = factorial_results[factorial_results['Term'] != 'Residual']
+    interactions = effects[effects['Term'].str.contains(':')]
+    print(f"\n📊 Factorial sweep: {effects['Factors'].nunique()} infrastructure pairs × "
+          f"{effects['Dependent_Variable'].nunique()} outcomes, {len(effects)} Type II terms")
+    print(f"   Significant main effects: {(effects['Significant'] & ~effects['Term'].str.contains(':')).sum()}, "
+          f"significant interactions: {interactions['Significant'].sum()}")
+    for _, row in interactions.nsmallest(3, 'P_value').iterrows():
+        print(f"   {row['Term']} → {row['Dependent_Variable']}: F = {row['F_statistic']:.3f} (df = {row['df']}), "
+              f"p = {row['P_value']:.4f}, partial η² = {row['Partial_Eta_Squared']:.3f}")
+    print(f"💾 Factorial results saved to: factorial_results.csv")
+    return twoway_table, factorial_results
+
+
+def infrastructure_section(df, args, cache):
+    """Sections 3 and 4: infrastructure factors against performance issues, and the summary table.
+
+    Returns the results table and, with ``--bootstrap``, the group-mean intervals.
+    """
+    stat_label = ONEWAY_TESTS[args.test][1]
+    heading("3. MULTIPLE ONE-WAY ANOVAs: Infrastructure vs Performance Issues")
+
+    print("📊 Testing: How do different infrastructure factors affect performance issues?")
+
+    # All 4 × 2 tests come from one grouped pass per infrastructure factor
+    batch_results = oneway_pairs(cache, df, INFRASTRUCTURE_VARS, PERFORMANCE_VARS, args.test)
+    means_ci = None
+    if args.permutations:
+        # Shapiro-Wilk fails for the key variables (section 6), so add distribution-free p-values
+        perm = permutation_pairs(cache, df, INFRASTRUCTURE_VARS, PERFORMANCE_VARS, args.permutations)
+        batch_results = batch_results.merge(perm, on=['Independent_Variable', 'Dependent_Variable'], how='left')
+    if args.bootstrap:
+        effect_ci, means_ci = bootstrap_pairs(cache, df, INFRASTRUCTURE_VARS, PERFORMANCE_VARS, args.bootstrap)
+        batch_results = batch_results.merge(effect_ci, on=['Independent_Variable', 'Dependent_Variable'], how='left')
+
+    # Create a summary table of all ANOVA results
+    all_anova_results = []
+
+    for _, result in batch_results.iterrows():
+        infra_var, perf_var = result['Independent_Variable'], result['Dependent_Variable']
+        print(f"\n🔍 ANOVA: {infra_var} → {perf_var}")
 
-infrastructure_vars = ['WiFi_Speed_Score', 'Reliability_Score', 'Peak_Performance_Score', 'Outage_Frequency_Score']
-performance_vars = ['Task_Abandonment_Score', 'Time_Lost_Score']
+        if result['df_between'] >= 1:
+            f_stat, p_value = result['F_statistic'], result['P_value']
 
-# Create a summary table of all ANOVA results
-all_anova_results = []
+            print(f"   {stat_label} = {f_stat:.4f}, p = {p_value:.4f} {'✅' if p_value < 0.05 else '❌'}")
+            if args.permutations:
+                print(f"   Permutation p = {result['P_perm']:.4f} ({args.permutations} shuffles)")
+            if args.bootstrap:
+                print(f"   η² = {result['Effect_Size']:.3f}, 95% BCa CI [{result['Effect_Size_CI_Low']:.3f}, "
+                      f"{result['Effect_Size_CI_High']:.3f}]")
 
-for infra_var in infrastructure_vars:
-    for perf_var in performance_vars:
-        print(f"\n🔍 ANOVA: {infra_var} → {perf_var}")
-        
-        # Group data by infrastructure variable
-        groups = []
-        for level in sorted(df[infra_var].unique()):
-            group_data = df[df[infra_var] == level][perf_var].values
-            if len(group_data) > 0:
-                groups.append(group_data)
-        
-        if len(groups) >= 2:
-            f_stat, p_value = f_oneway(*groups)
-            
-            print(f"   F = {f_stat:.4f}, p = {p_value:.4f} {'✅' if p_value < 0.05 else '❌'}")
-            
             all_anova_results.append({
                 'Independent_Variable': infra_var,
                 'Dependent_Variable': perf_var,
                 'F_statistic': f_stat,
                 'P_value': p_value,
                 'Significant': p_value < 0.05,
-                'Effect_Size': f_stat / (f_stat + len(df) - len(groups))  # Eta-squared approximation
+                'Effect_Size': result['Effect_Size']  # Eta-squared: SS_between / SS_total
             })
+            if args.permutations:
+                all_anova_results[-1]['P_perm'] = result['P_perm']
+            if args.bootstrap:
+                all_anova_results[-1]['Effect_Size_CI_Low'] = result['Effect_Size_CI_Low']
+                all_anova_results[-1]['Effect_Size_CI_High'] = result['Effect_Size_CI_High']
+
+    heading("4. COMPREHENSIVE ANOVA RESULTS SUMMARY")
+
+    # Convert results to DataFrame for easy viewing
+    results_df = pd.DataFrame(all_anova_results)
+    if len(results_df) > 0:
+        print("📊 All ANOVA Test Results:")
+        print(f"{'Independent Variable':<25} {'Dependent Variable':<25} {stat_label + '-stat':<8} {'P-value':<8} {'Significant':<12} {'Effect Size':<10}")
+        print("-" * 95)
+
+        for _, row in results_df.iterrows():
+            sig_symbol = "✅ Yes" if row['Significant'] else "❌ No"
+            print(f"{row['Independent_Variable']:<25} {row['Dependent_Variable']:<25} {row['F_statistic']:<8.3f} {row['P_value']:<8.4f} {sig_symbol:<12} {row['Effect_Size']:<10.3f}")
+
+        # Summary statistics
+        total_tests = len(results_df)
+        significant_tests = results_df['Significant'].sum()
+        print(f"\n📈 Summary:")
+        print(f"   Total ANOVA tests performed: {total_tests}")
+        print(f"   Significant results (p < 0.05): {significant_tests}")
+        print(f"   Percentage significant: {(significant_tests/total_tests)*100:.1f}%")
+
+        # Most significant results
+        significant_results = results_df[results_df['Significant']].sort_values('P_value')
+        if len(significant_results) > 0:
+            print(f"\n🏆 Most Significant Findings:")
+            for i, (_, row) in enumerate(significant_results.head(3).iterrows(), 1):
+                print(f"   {i}. {row['Independent_Variable']} → {row['Dependent_Variable']}")
+                print(f"      {stat_label} = {row['F_statistic']:.3f}, p = {row['P_value']:.4f}, Effect Size = {row['Effect_Size']:.3f}")
+    return results_df, means_ci
+
+
+def posthoc_section(df, results_df, cache):
+    """Section 5: Tukey's HSD for every significant result, straight from the group sums."""
+    heading("5. POST-HOC ANALYSIS: Tukey's HSD Test")
+
+    posthoc_results = tukey_pairs(cache, df, results_df) if len(results_df) > 0 else pd.DataFrame()
+    if len(posthoc_results) > 0:
+        for (indep_var, dep_var), table in posthoc_results.groupby(['Independent_Variable', 'Dependent_Variable'],
+                                                                  sort=False):
+            p_anova = results_df.loc[(results_df['Independent_Variable'] == indep_var)
+                                     & (results_df['Dependent_Variable'] == dep_var), 'P_value'].iloc[0]
+            print(f"\n🔍 Tukey's HSD: {indep_var} → {dep_var} (ANOVA p = {p_anova:.4f})")
+            print(f"   {'Group 1':>8} {'Group 2':>8} {'Mean Diff':>10} {'p-adj':>8} {'Lower':>8} {'Upper':>8}  Reject")
+            for _, row in table.iterrows():
+                print(f"   {row['Group_1']:>8} {row['Group_2']:>8} {row['Mean_Diff']:>10.4f} {row['P_adj']:>8.4f} "
+                      f"{row['CI_Low']:>8.4f} {row['CI_High']:>8.4f}  {'✅' if row['Reject'] else '❌'}")
+        posthoc_results.to_csv("posthoc_results.csv", index=False)
+        print(f"\n💾 {len(posthoc_results)} pairwise comparisons saved to: posthoc_results.csv")
+    else:
+        print("No significant ANOVA results to follow up")
+    return posthoc_results
+
+
+def assumptions_section(df, cache):
+    """Section 6: homogeneity and residual normality for every section 3 pair."""
+    heading("6. ASSUMPTIONS CHECK")
 
-print("\n" + "="*80)
-print("4. COMPREHENSIVE ANOVA RESULTS SUMMARY")
-print("="*80)
+    print("📊 Checking ANOVA Assumptions for every tested pair:")
 
-# Convert results to DataFrame for easy viewing
-results_df = pd.DataFrame(all_anova_results)
-if len(results_df) > 0:
-    print("📊 All ANOVA Test Results:")
-    print(f"{'Independent Variable':<25} {'Dependent Variable':<25} {'F-stat':<8} {'P-value':<8} {'Significant':<12} {'Effect Size':<10}")
+    # Levene / Brown-Forsythe and residual normality for all pairs in one grouped pass per factor
+    assumption_results = assumption_pairs(cache, df, INFRASTRUCTURE_VARS, PERFORMANCE_VARS)
+    print(f"\n{'Independent Variable':<25} {'Dependent Variable':<25} {'Levene p':<9} {'B-F p':<9} "
+          f"{'Normal p':<9} {'Use':<15}")
     print("-" * 95)
-    
-    for _, row in results_df.iterrows():
-        sig_symbol = "✅ Yes" if row['Significant'] else "❌ No"
-        print(f"{row['Independent_Variable']:<25} {row['Dependent_Variable']:<25} {row['F_statistic']:<8.3f} {row['P_value']:<8.4f} {sig_symbol:<12} {row['Effect_Size']:<10.3f}")
-
-    # Summary statistics
-    total_tests = len(results_df)
-    significant_tests = results_df['Significant'].sum()
-    print(f"\n📈 Summary:")
-    print(f"   Total ANOVA tests performed: {total_tests}")
-    print(f"   Significant results (p < 0.05): {significant_tests}")
-    print(f"   Percentage significant: {(significant_tests/total_tests)*100:.1f}%")
-
-    # Most significant results
-    significant_results = results_df[results_df['Significant']].sort_values('P_value')
-    if len(significant_results) > 0:
-        print(f"\n🏆 Most Significant Findings:")
-        for i, (_, row) in enumerate(significant_results.head(3).iterrows(), 1):
-            print(f"   {i}. {row['Independent_Variable']} → {row['Dependent_Variable']}")
-            print(f"      F = {row['F_statistic']:.3f}, p = {row['P_value']:.4f}, Effect Size = {row['Effect_Size']:.3f}")
-
-print("\n" + "="*80)
-print("5. POST-HOC ANALYSIS: Tukey's HSD Test")
-print("="*80)
-
-# Perform Tukey's HSD for the most significant result if any
-if len(results_df) > 0 and results_df['Significant'].any():
-    most_sig = results_df.loc[results_df['P_value'].idxmin()]
-    indep_var = most_sig['Independent_Variable']
-    dep_var = most_sig['Dependent_Variable']
-    
-    print(f"📊 Post-hoc analysis for: {indep_var} → {dep_var}")
-    print(f"   (Most significant result: p = {most_sig['P_value']:.4f})")
-    
-    try:
-        # Prepare data for Tukey's test
-        tukey_data = df[[indep_var, dep_var]].dropna()
-        tukey_result = pairwise_tukeyhsd(tukey_data[dep_var], tukey_data[indep_var], alpha=0.05)
-        
-        print(f"\n🔍 Tukey's HSD Results:")
-        print(tukey_result)
-        
-    except Exception as e:
-        print(f"⚠️  Tukey's HSD error: {e}")
-
-print("\n" + "="*80)
-print("6. ASSUMPTIONS CHECK")
-print("="*80)
-
-print("📊 Checking ANOVA Assumptions:")
-
-# Check normality for key variables
-key_vars = ['WiFi_Speed_Score', 'Productivity_Influence_Score', 'Task_Abandonment_Score']
-print(f"\n🔍 Normality Check (Shapiro-Wilk test):")
-for var in key_vars:
-    stat, p_value = stats.shapiro(df[var])
-    normal = "✅ Normal" if p_value > 0.05 else "❌ Not Normal"
-    print(f"   {var}: W = {stat:.4f}, p = {p_value:.4f} ({normal})")
-
-# Check homogeneity of variance
-print(f"\n🔍 Homogeneity of Variance (Levene's test):")
-try:
-    groups = [df[df['WiFi_Speed_Score'] == speed]['Productivity_Influence_Score'].values 
-              for speed in sorted(df['WiFi_Speed_Score'].unique())]
-    groups = [g for g in groups if len(g) > 0]
-    
-    if len(groups) >= 2:
-        stat, p_value = stats.levene(*groups)
-        homogeneous = "✅ Homogeneous" if p_value > 0.05 else "❌ Not Homogeneous"
-        print(f"   WiFi Speed groups: W = {stat:.4f}, p = {p_value:.4f} ({homogeneous})")
-except Exception as e:
-    print(f"   ⚠️  Levene's test error: {e}")
-
-print(f"\n✅ ANOVA ANALYSIS COMPLETE!")
-print(f"📁 Results saved to variables for further analysis")
-print(f"📊 Use the results to interpret the relationships in your data")
-
-# Save results to CSV
-if len(results_df) > 0:
-    results_df.to_csv("anova_results.csv", index=False)
-    print(f"💾 Detailed results saved to: anova_results.csv")
+    for _, row in assumption_results.iterrows():
+        print(f"{row['Independent_Variable']:<25} {row['Dependent_Variable']:<25} {row['Levene_p']:<9.4f} "
+              f"{row['Brown_Forsythe_p']:<9.4f} {row['Normality_p']:<9.4f} {row['Recommended_Test']:<15}")
+
+    fallbacks = assumption_results[assumption_results['Recommended_Test'] != 'ANOVA']
+    print(f"\n🔍 Residuals normal (D'Agostino K², p > 0.05): "
+          f"{assumption_results['Normal_Residuals'].sum()} of {len(assumption_results)} pairs")
+    print(f"🔍 Equal variances (Brown-Forsythe, p > 0.05): "
+          f"{assumption_results['Equal_Variances'].sum()} of {len(assumption_results)} pairs")
+    if len(fallbacks) > 0:
+        print(f"⚠️  {len(fallbacks)} pairs should be confirmed with Welch's ANOVA or Kruskal-Wallis")
+    return assumption_results
+
+
+def main(argv=None, prog=None):
+    """Run the full analysis (or the ``--sweep``) and return the results table."""
+    args = build_parser(prog).parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    # Results of unchanged column pairs are served from the cache
+    cache = ResultCache(None if args.no_cache else args.cache_dir)
+
+    # Load the comprehensive mapped data as compact int8 columns
+    df = load_scores(args.data)
+
+    print("=== COMPREHENSIVE ANOVA ANALYSIS ===")
+    print(f"Dataset: {df.shape[0]} responses × {df.shape[1]} variables")
+    print("All variables are numeric and ready for ANOVA testing!")
+
+    if args.stratify is not None:
+        if args.test != 'anova':
+            raise SystemExit("❌ --stratify computes the classic F test only; drop --test")
+        return run_stratified(df, args)
+    if args.sweep:
+        return run_sweep(df, args, cache)
+
+    wifi_academic_section(df, args, cache)
+    twoway_section(df, cache)
+    results_df, means_ci = infrastructure_section(df, args, cache)
+    posthoc_section(df, results_df, cache)
+    assumption_results = assumptions_section(df, cache)
+    if len(results_df) > 0:
+        results_df = results_df.merge(assumption_results, on=['Independent_Variable', 'Dependent_Variable'], how='left')
+
+    print(f"\n✅ ANOVA ANALYSIS COMPLETE!")
+    print(f"📁 Results saved to variables for further analysis")
+    print(f"📊 Use the results to interpret the relationships in your data")
+
+    # Save results to CSV
+    if len(results_df) > 0:
+        write_results(results_df, "anova_results.csv", df, args.data)
+        print(f"💾 Detailed results saved to: anova_results.csv")
+        print(f"♻️  Cache: {cache.hits} results reused, {cache.misses} computed")
+        if args.bootstrap:
+            means_ci.to_csv("group_means_ci.csv", index=False)
+            print(f"💾 Group means with bootstrap intervals saved to: group_means_ci.csv")
+    return results_df
+
+
+if __name__ == "__main__":
+    main()
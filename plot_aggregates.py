@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Aggregated Plot Inputs for the IIT Internet Connectivity Study
+Reduces the raw responses to what the plots actually draw: joint counts of
+two discrete columns (box-plot quantiles and bubble sizes come from these).
+The aggregation is a single pass over the rows; everything handed to matplotlib scales with the number
+of distinct levels, not with the number of responses.
+"""
+
+import numpy as np
+import pandas as pd
+
+from anova_engine import factorize_levels
+
+
+def joint_counts(df, x, y):
+    """Counts of every (``x`` level, ``y`` value) combination among rows where both are present.
+
+    Returns (x levels, y values, counts) with counts of shape (x levels, y values).
+    """
+    x_codes, x_levels = factorize_levels(df[x])
+    y_codes, y_values = factorize_levels(df[y])
+    valid = (x_codes >= 0) & (y_codes >= 0)
+    flat = x_codes[valid].astype(np.int64) * len(y_values) + y_codes[valid]
+    counts = np.bincount(flat, minlength=len(x_levels) * len(y_values))
+    return x_levels, y_values.astype(np.float64), counts.reshape(len(x_levels), len(y_values))
+
+
+def count_quantiles(values, counts, q):
+    """Quantiles ``q`` of sorted distinct ``values`` repeated ``counts`` times (NumPy's linear method)."""
+    position = (counts.sum() - 1) * np.asarray(q, dtype=np.float64)
+    cumulative = np.cumsum(counts)
+    low = values[np.searchsorted(cumulative, np.floor(position), side='right')]
+    high = values[np.searchsorted(cumulative, np.ceil(position), side='right')]
+    return low + (position - np.floor(position)) * (high - low)
+
+
+def box_stats(values, counts, label=None, whis=1.5):
+    """Box-plot statistics of one group from its value counts, as ``Axes.bxp`` takes them.
+
+    Whiskers and fliers follow matplotlib's ``boxplot_stats``; each distinct
+    outlying value is one flier.
+    """
+    present = values[counts > 0]
+    q1, med, q3 = count_quantiles(values, counts, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    upper = present[present <= q3 + whis * iqr]
+    lower = present[present >= q1 - whis * iqr]
+    whishi = q3 if len(upper) == 0 or upper.max() < q3 else upper.max()
+    whislo = q1 if len(lower) == 0 or lower.min() > q1 else lower.min()
+    return {
+        'label': label,
+        'med': med,
+        'q1': q1,
+        'q3': q3,
+        'whislo': whislo,
+        'whishi': whishi,
+        'fliers': present[(present < whislo) | (present > whishi)],
+    }
+
+
+def group_box_stats(df, factor, dependent, labels=None, whis=1.5):
+    """``box_stats`` of ``dependent`` for every level of ``factor``, in level order."""
+    levels, values, counts = joint_counts(df, factor, dependent)
+    labels = labels or {}
+    numeric = np.issubdtype(levels.dtype, np.number)
+    return [box_stats(values, row, labels.get(level, format(level, 'g') if numeric else level), whis)
+            for level, row in zip(levels, counts) if row.sum()]
+
+
+def bubble_counts(df, x, y):
+    """Long table of (x, y, Count) for every combination that occurs: one bubble per grid point."""
+    x_levels, y_values, counts = joint_counts(df, x, y)
+    i, j = np.nonzero(counts)
+    return pd.DataFrame({x: x_levels[i], y: y_values[j], 'Count': counts[i, j]})
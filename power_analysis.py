@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Power and Sample-Size Planning for the ANOVA Tests
+Simulates survey waves of every planned size from per-group means and
+standard deviations (estimated from comprehensive_anova_data.csv or given in
+a JSON design file) and reports how often each factor → outcome test
+reaches significance. Responses are drawn as (simulation × respondent ×
+dependent) arrays of ordinal scores, group sums come from one batched
+matrix product and oneway_from_stats evaluates F for all simulations at
+once. Blocks of simulations are spread over a process pool with
+reproducible per-block seeds.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from anova_engine import multi_group_stats, oneway_from_stats
+from survey_variables import SCORE_SCALES
+
+SAMPLE_SIZES = [24, 50, 75, 100, 150, 200, 300, 500]
+BLOCK_SIMS = 500
+# Simulated cells held in memory at once by one worker
+MAX_CELLS = 1 << 22
+TARGET_POWER = 0.8
+
+
+class GroupDesign(NamedTuple):
+    """Population model of one factor and the dependents tested against it.
+
+    ``shares`` (levels) are the chances of a respondent falling in each
+    level; ``means`` and ``sds`` (levels, dependents) describe each group's
+    latent answers, which are rounded to the nearest score on ``scales``
+    (one (low, high) per dependent).
+    """
+    factor: str
+    dependents: list
+    levels: np.ndarray
+    shares: np.ndarray
+    means: np.ndarray
+    sds: np.ndarray
+    scales: list
+
+
+def score_range(column, values=None):
+    """(lowest, highest) score of a column: its survey scale, else the observed range."""
+    if column in SCORE_SCALES:
+        return 1, len(SCORE_SCALES[column][1])
+    return float(np.nanmin(values)), float(np.nanmax(values))
+
+
+def designs_from_data(df, pairs):
+    """One GroupDesign per factor of ``pairs`` with group shares, means and SDs from ``df``.
+
+    Levels seen at most once have no SD of their own and get the pooled
+    within-group SD of their dependent, so they do not simulate as constants.
+    """
+    dependents = {}
+    for factor, dependent in pairs:
+        dependents.setdefault(factor, []).append(dependent)
+    all_stats = multi_group_stats(df, list(dependents), [d for deps in dependents.values() for d in deps])
+    designs = []
+    for factor, deps in dependents.items():
+        gs = all_stats[factor]
+        cols = [gs.dependents.index(dep) for dep in dict.fromkeys(deps)]
+        n, s, ss = gs.n[:, cols], gs.s[:, cols], gs.ss[:, cols]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = s / n
+            within = np.where(n > 0, ss - s * means, 0.0)
+            pooled = within.sum(axis=0) / (n.sum(axis=0) - (n > 0).sum(axis=0))
+            variances = np.nan_to_num(np.where(n > 1, within / (n - 1), pooled))
+        counts = df[factor].value_counts().reindex(gs.levels, fill_value=0).to_numpy(dtype=np.float64)
+        designs.append(GroupDesign(
+            factor=factor,
+            dependents=[gs.dependents[c] for c in cols],
+            levels=gs.levels,
+            shares=counts / counts.sum(),
+            means=np.nan_to_num(means),
+            sds=np.sqrt(np.clip(variances, 0.0, None)),
+            scales=[score_range(gs.dependents[c], df[gs.dependents[c]]) for c in cols],
+        ))
+    return designs
+
+
+def designs_from_json(path):
+    """GroupDesigns from a JSON list of {factor, dependent(s), means, sds, shares?, scale?}.
+
+    ``means`` and ``sds`` list one value per level (or per level and
+    dependent); ``sds`` may be a single pooled value and ``shares`` defaults
+    to equal groups.
+    """
+    designs = []
+    for spec in json.loads(Path(path).read_text()):
+        dependents = spec.get('dependents') or [spec['dependent']]
+        means = np.asarray(spec['means'], dtype=np.float64)
+        means = np.broadcast_to(means.reshape(len(means), -1), (len(means), len(dependents))).copy()
+        sds = np.asarray(spec['sds'], dtype=np.float64)
+        sds = np.broadcast_to(sds.reshape(-1, 1) if sds.ndim == 1 else sds, means.shape).copy()
+        shares = np.asarray(spec.get('shares', np.ones(len(means))), dtype=np.float64)
+        scale = spec.get('scale')
+        designs.append(GroupDesign(
+            factor=spec['factor'],
+            dependents=list(dependents),
+            levels=np.asarray(spec.get('levels', np.arange(1, len(means) + 1))),
+            shares=shares / shares.sum(),
+            means=means,
+            sds=sds,
+            scales=[tuple(scale) if scale else score_range(dep) for dep in dependents],
+        ))
+    return designs
+
+
+def simulate_rejections(design, n_rows, n_sims, seed, alpha=0.05):
+    """Count simulated samples of ``n_rows`` respondents in which each dependent's F test rejects.
+
+    Draws group labels (sims, rows) and latent answers (sims, rows,
+    dependents), rounds them onto the score scales and reduces them to group
+    counts, sums and sums of squares with one batched matrix product.
+    """
+    rng = np.random.default_rng(seed)
+    k, m = len(design.levels), len(design.dependents)
+    low, high = (np.array(bound, dtype=np.float64) for bound in zip(*design.scales))
+    cumulative = np.cumsum(design.shares)
+    batch = max(1, MAX_CELLS // (n_rows * max(m, k)))
+    rejections = np.zeros(m, dtype=np.int64)
+    for start in range(0, n_sims, batch):
+        size = min(batch, n_sims - start)
+        labels = np.minimum(np.searchsorted(cumulative, rng.random((size, n_rows)), side='right'), k - 1)
+        y = design.means[labels] + design.sds[labels] * rng.standard_normal((size, n_rows, m))
+        y = np.clip(np.rint(y), low, high)
+        onehot = (labels[:, None, :] == np.arange(k)[None, :, None]).astype(np.float64)  # (sims, levels, rows)
+        n = np.broadcast_to(onehot.sum(axis=2)[:, :, None], (size, k, m))
+        p = oneway_from_stats(n, onehot @ y, onehot @ (y * y))['p']
+        rejections += (p < alpha).sum(axis=0)
+    return rejections
+
+
+def power_curves(designs, sample_sizes=SAMPLE_SIZES, n_sims=2000, alpha=0.05, seed=0,
+                 block_sims=BLOCK_SIMS, workers=None):
+    """Simulated power of every design's tests at each sample size.
+
+    Results are reproducible for a given ``seed`` and ``block_sims`` whatever
+    the number of ``workers``; ``workers=1`` runs in the current process.
+    Returns one row per (factor, dependent, N) with Power and its standard error.
+    """
+    blocks = [min(block_sims, n_sims - start) for start in range(0, n_sims, block_sims)]
+    jobs = [(d, n_rows, size) for d in range(len(designs)) for n_rows in sample_sizes for size in blocks]
+    seeds = np.random.SeedSequence(seed).spawn(len(jobs))
+
+    rejections = {}
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) <= 1:
+        for (d, n_rows, size), job_seed in zip(jobs, seeds):
+            rejections[d, n_rows] = rejections.get((d, n_rows), 0) + simulate_rejections(
+                designs[d], n_rows, size, job_seed, alpha)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [((d, n_rows), pool.submit(simulate_rejections, designs[d], n_rows, size, job_seed, alpha))
+                       for (d, n_rows, size), job_seed in zip(jobs, seeds)]
+            for key, future in futures:
+                rejections[key] = rejections.get(key, 0) + future.result()
+
+    rows = []
+    for d, design in enumerate(designs):
+        for j, dependent in enumerate(design.dependents):
+            for n_rows in sample_sizes:
+                power = rejections[d, n_rows][j] / n_sims
+                rows.append({
+                    'Independent_Variable': design.factor,
+                    'Dependent_Variable': dependent,
+                    'N': n_rows,
+                    'Power': power,
+                    'Power_SE': np.sqrt(power * (1 - power) / n_sims),
+                    'Simulations': n_sims,
+                })
+    return pd.DataFrame(rows)
+
+
+def required_sizes(curves, target=TARGET_POWER):
+    """Smallest simulated N reaching ``target`` power for every pair (NaN if none does)."""
+    reached = curves[curves['Power'] >= target]
+    smallest = reached.groupby(['Independent_Variable', 'Dependent_Variable'], sort=False)['N'].min()
+    pairs = curves[['Independent_Variable', 'Dependent_Variable']].drop_duplicates()
+    return pairs.merge(smallest.rename('Required_N').reset_index(), how='left')
+
+
+def plot_curves(curves, output, target=TARGET_POWER):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for (factor, dependent), curve in curves.groupby(['Independent_Variable', 'Dependent_Variable'], sort=False):
+        ax.errorbar(curve['N'], curve['Power'], yerr=1.96 * curve['Power_SE'], marker='o', capsize=3,
+                    label=f"{factor.removesuffix('_Score')} → {dependent.removesuffix('_Score')}")
+    ax.axhline(target, color='red', linestyle='--', alpha=0.7, label=f'Target power ({target:g})')
+    ax.set_xlabel('Respondents')
+    ax.set_ylabel('Power')
+    ax.set_ylim(0, 1.02)
+    ax.set_title('Simulated Power of the One-Way ANOVA Tests')
+    ax.legend(fontsize=8, loc='lower right')
+    ax.grid(True, alpha=0.3)
+    fig.savefig(output, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+
+def _parse_pair(text):
+    factor, dependent = text.split(':')
+    return factor, dependent
+
+
+def main(argv=None, prog=None):
+    from score_store import load_scores
+
+    parser = argparse.ArgumentParser(prog=prog, description="Monte Carlo power curves of the one-way ANOVA tests")
+    parser.add_argument('--data', default='comprehensive_anova_data.csv',
+                        help="mapped scores to estimate group means and SDs from")
+    parser.add_argument('--results', default='anova_results.csv',
+                        help="plan for the significant pairs of these results (unless --pairs or --design)")
+    parser.add_argument('--pairs', nargs='+', type=_parse_pair, metavar='FACTOR:DEPENDENT')
+    parser.add_argument('--design', metavar='JSON', help="user-specified group means / SDs instead of the data")
+    parser.add_argument('--sizes', nargs='+', type=int, default=SAMPLE_SIZES, metavar='N')
+    parser.add_argument('--simulations', type=int, default=2000)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--target', type=float, default=TARGET_POWER)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help="processes (default: one per CPU)")
+    parser.add_argument('-o', '--output', default='power_results.csv')
+    parser.add_argument('--plot', metavar='PNG', help="also draw the power curves")
+    args = parser.parse_args(argv)
+
+    if args.design:
+        designs = designs_from_json(args.design)
+    else:
+        pairs = args.pairs
+        if pairs is None:
+            results = pd.read_csv(args.results)
+            significant = results[results['Significant'].astype(bool)]
+            pairs = list(zip(significant['Independent_Variable'], significant['Dependent_Variable']))
+        if not pairs:
+            parser.error(f"no significant pairs in {args.results}; name them with --pairs")
+        df = load_scores(args.data, columns=list(dict.fromkeys(col for pair in pairs for col in pair)))
+        designs = designs_from_data(df, pairs)
+
+    curves = power_curves(designs, sorted(set(args.sizes)), args.simulations, args.alpha, args.seed,
+                          workers=args.workers)
+    curves.to_csv(args.output, index=False)
+    print(f"🎲 {args.simulations} simulated surveys per size for {len(curves) // len(set(args.sizes))} pairs "
+          f"at N = {', '.join(map(str, sorted(set(args.sizes))))}")
+    for _, row in required_sizes(curves, args.target).iterrows():
+        needed = (f"N ≥ {int(row['Required_N'])}" if not np.isnan(row['Required_N'])
+                  else f"not reached by N = {max(args.sizes)}")
+        print(f"   {row['Independent_Variable']} → {row['Dependent_Variable']}: "
+              f"{args.target:.0%} power at {needed}")
+    print(f"💾 Power curves saved to: {args.output}")
+    if args.plot:
+        plot_curves(curves, args.plot, args.target)
+        print(f"📈 Power curves drawn in '{args.plot}'")
+    return curves
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Rank-Based and Heteroscedasticity-Robust One-Way Tests for All Pairs
+Kruskal-Wallis H and Welch's F for every factor at once, in the
+anova_results.csv schema. Each dependent is ranked once (midranks and the
+tie correction come from value counts, which is cheap for 1–5 scores) and
+the per-group rank sums come from the same blocked group-sum pass as the
+ANOVA; Welch's F only needs the group n / sum / sum of squares.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from anova_engine import RESULT_COLUMNS, factorize_levels, flatten_vars, multi_group_stats
+
+
+def midranks(values):
+    """Midranks of a 1-D array (NaN stays NaN) and the tie term sum(t^3 - t)."""
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    _, inverse, counts = np.unique(values[valid], return_inverse=True, return_counts=True)
+    ranks = np.full(len(values), np.nan)
+    ranks[valid] = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    counts = counts.astype(np.float64)
+    return ranks, (counts ** 3 - counts).sum()
+
+
+def _results(factor, dependents, statistic, p_value, effect, df_between, df_within, total_n, alpha):
+    return pd.DataFrame({
+        'Independent_Variable': factor,
+        'Dependent_Variable': dependents,
+        'F_statistic': statistic,
+        'P_value': p_value,
+        'Significant': p_value < alpha,
+        'Effect_Size': effect,
+        'df_between': df_between,
+        'df_within': df_within,
+        'N': total_n.astype(np.int64),
+    })
+
+
+def _concat(frames):
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def kruskal_wallis(df, independent_vars, dependent_vars, alpha=0.05):
+    """Tie-corrected Kruskal-Wallis H for every independent × dependent pair.
+
+    ``F_statistic`` holds H, ``df_between`` is k - 1 (``df_within`` is NaN)
+    and ``Effect_Size`` is epsilon-squared, H / (N - 1).
+    """
+    factors = list(dict.fromkeys(flatten_vars(independent_vars)))
+    dependents = list(dict.fromkeys(flatten_vars(dependent_vars)))
+    y = df[dependents].to_numpy(dtype=np.float64)
+
+    # Ranks depend on which rows are used, so rank once per factor missing pattern
+    patterns = {}
+    for factor in factors:
+        valid = factorize_levels(df[factor])[0] >= 0
+        patterns.setdefault(valid.tobytes(), (valid, []))[1].append(factor)
+
+    frames = {}
+    for valid, group in patterns.values():
+        ranked = np.where(valid[:, None], y, np.nan)
+        tie_terms = np.empty(len(dependents))
+        for j in range(len(dependents)):
+            ranked[:, j], tie_terms[j] = midranks(ranked[:, j])
+        rank_frame = pd.DataFrame(ranked, columns=dependents, index=df.index)
+        for factor in group:
+            # A factor that is also a dependent is grouped by its own ranks, which split it identically
+            if factor not in dependents:
+                rank_frame[factor] = df[factor]
+        for factor, gs in multi_group_stats(rank_frame, group, dependents).items():
+            if not gs.dependents:
+                continue
+            cols = [dependents.index(dep) for dep in gs.dependents]
+            n = gs.n
+            total_n = n.sum(axis=0)
+            groups = (n > 0).sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                between = np.where(n > 0, gs.s ** 2 / np.where(n > 0, n, 1), 0.0).sum(axis=0)
+                h = 12.0 / (total_n * (total_n + 1)) * between - 3 * (total_n + 1)
+                h = h / (1 - tie_terms[cols] / (total_n ** 3 - total_n))
+            h = np.where(groups >= 2, h, np.nan)
+            df_between = groups - 1
+            p_value = np.where(np.isnan(h), np.nan, stats.chi2.sf(h, np.maximum(df_between, 1)))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                effect = h / (total_n - 1)
+            frames[factor] = _results(factor, gs.dependents, h, p_value, effect, df_between,
+                                      np.full(len(cols), np.nan), total_n, alpha)
+    return _concat([frames[factor] for factor in factors if factor in frames])
+
+
+def welch_anova(df, independent_vars, dependent_vars, alpha=0.05):
+    """Welch's heteroscedastic one-way ANOVA for every independent × dependent pair.
+
+    Undefined (NaN) when a group has fewer than two observations or zero
+    variance. ``df_within`` is Welch's fractional denominator df and
+    ``Effect_Size`` the ordinary eta-squared.
+    """
+    frames = []
+    for gs in multi_group_stats(df, independent_vars, dependent_vars).values():
+        if not gs.dependents:
+            continue
+        n, s, ss = gs.n, gs.s, gs.ss
+        present = n > 0
+        k = present.sum(axis=0)
+        total_n = n.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = s / n
+            var = (ss - s * mean) / (n - 1)
+            weight = np.where(present, n / var, 0.0)
+            weight_sum = weight.sum(axis=0)
+            grand = np.where(present, weight * mean, 0.0).sum(axis=0) / weight_sum
+            between = np.where(present, weight * (mean - grand) ** 2, 0.0).sum(axis=0) / (k - 1)
+            spread = np.where(present, (1 - weight / weight_sum) ** 2 / (n - 1), 0.0).sum(axis=0)
+            f_stat = between / (1 + 2 * (k - 2) / (k ** 2 - 1) * spread)
+            df_within = (k ** 2 - 1) / (3 * spread)
+            correction = s.sum(axis=0) ** 2 / total_n
+            eta = (np.where(present, s * mean, 0.0).sum(axis=0) - correction) / (ss.sum(axis=0) - correction)
+
+        # Singleton or constant groups make the weights infinite
+        undefined = (k < 2) | np.any(present & ~(var > 0), axis=0)
+        f_stat = np.where(undefined, np.nan, f_stat)
+        df_within = np.where(undefined, np.nan, df_within)
+        p_value = np.where(undefined, np.nan, stats.f.sf(f_stat, k - 1, df_within))
+        frames.append(_results(gs.factor, gs.dependents, f_stat, p_value, eta, k - 1,
+                               df_within, total_n, alpha))
+    return _concat(frames)
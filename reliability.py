@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Scale Reliability of the Composite Indices
+Cronbach's alpha, corrected item-total correlations and alpha-if-item-deleted
+for every index definition of scaling_pipeline.py. All of them come from one
+accumulated covariance matrix of the source items: dropping an item only
+removes its row and column, so no variant goes back to the responses. The
+accumulator keeps counts, sums and cross products (plus each column's
+min/max for the 1-5 rescaling), so new responses can be folded in and
+saved state merged.
+
+Bootstrap intervals for alpha reuse the resample-count matrices of
+bootstrap.py: the moments of every resample are one matrix product.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from anova_engine import BLOCK_ROWS
+from bootstrap import bca_bounds, resample_counts
+from scaling_pipeline import INDEX_DEFINITIONS, REVERSE_ITEMS, SCALED_COLUMNS, affine_parameters
+
+
+def item_sources(definition, scaled_cols=SCALED_COLUMNS, reverse_cols=REVERSE_ITEMS):
+    """(source column, rescaled, reverse-coded) of every item of an index definition.
+
+    ``<col>_R`` items are the reverse-coded copies fused_scale_and_index makes of
+    ``reverse_cols``; other items are read as they are, reversed on the
+    definition's scale when listed in its ``reverse``.
+    """
+    sources = []
+    for item in definition.items:
+        base = item.removesuffix('_R')
+        if item.endswith('_R') and base in reverse_cols:
+            sources.append((base, True, True))
+        else:
+            sources.append((item, item in scaled_cols, item in definition.reverse))
+    return sources
+
+
+def scale_statistics(cov):
+    """Cronbach's alpha, corrected item-total correlations and alpha-if-deleted from item covariances.
+
+    ``cov`` has shape (..., items, items). Leaving item i out of the total
+    only subtracts its row and column, so every variant is a few sums of
+    ``cov``. Returns a dict of alpha (...) and the two item arrays (..., items).
+    """
+    k = cov.shape[-1]
+    item_var = np.diagonal(cov, axis1=-2, axis2=-1)
+    row = cov.sum(axis=-1)
+    total = row.sum(axis=-1)
+    rest_var = total[..., None] - 2 * row + item_var
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alpha = k / (k - 1) * (1 - item_var.sum(axis=-1) / total)
+        item_total = (row - item_var) / np.sqrt(item_var * rest_var)
+        rest_trace = item_var.sum(axis=-1)[..., None] - item_var
+        alpha_deleted = (k - 1) / (k - 2) * (1 - rest_trace / rest_var) if k > 2 else np.full_like(item_var, np.nan)
+    return {'alpha': alpha, 'item_total': item_total, 'alpha_if_deleted': alpha_deleted}
+
+
+def moment_covariance(n, s, xy):
+    """Pairwise-complete covariance from counts, sums and cross products, as ``DataFrame.cov``.
+
+    ``s[..., i, j]`` is the sum of column i over rows where column j is present.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (xy - s * np.swapaxes(s, -1, -2) / n) / (n - 1)
+
+
+class ReliabilityAccumulator:
+    """Mergeable covariance moments of the items behind several composite indices."""
+
+    def __init__(self, definitions=INDEX_DEFINITIONS, scaled_cols=SCALED_COLUMNS, reverse_cols=REVERSE_ITEMS):
+        self.definitions = list(definitions)
+        self.scaled_cols = list(scaled_cols)
+        self.reverse_cols = list(reverse_cols)
+        self.columns = list(dict.fromkeys(base for d in self.definitions
+                                          for base, _, _ in item_sources(d, self.scaled_cols, self.reverse_cols)))
+        k = len(self.columns)
+        self.rows_seen = 0
+        self.n = np.zeros((k, k))
+        self.s = np.zeros((k, k))
+        self.xy = np.zeros((k, k))
+        self.mins = np.full(k, np.inf)
+        self.maxs = np.full(k, -np.inf)
+
+    def update(self, df, block_rows=BLOCK_ROWS):
+        """Ingest new response rows; cost is proportional to the new rows only."""
+        values = df[self.columns].to_numpy(dtype=np.float64)
+        for start in range(0, len(values), block_rows):
+            x = values[start:start + block_rows].copy()
+            valid = ~np.isnan(x)
+            with np.errstate(all='ignore'):
+                self.mins = np.fmin(self.mins, np.nanmin(x, axis=0, initial=np.inf))
+                self.maxs = np.fmax(self.maxs, np.nanmax(x, axis=0, initial=-np.inf))
+            x[~valid] = 0.0
+            present = valid.astype(np.float64)
+            self.n += present.T @ present
+            self.s += x.T @ present
+            self.xy += x.T @ x
+        self.rows_seen += len(values)
+        return self
+
+    def merge(self, other):
+        """Fold another accumulator tracking the same items into this one."""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators that track different items")
+        self.n += other.n
+        self.s += other.s
+        self.xy += other.xy
+        self.mins = np.fmin(self.mins, other.mins)
+        self.maxs = np.fmax(self.maxs, other.maxs)
+        self.rows_seen += other.rows_seen
+        return self
+
+    def transform(self, definition):
+        """(column positions, scale, offset) mapping the source columns to an index's items."""
+        sources = item_sources(definition, self.scaled_cols, self.reverse_cols)
+        cols = [self.columns.index(base) for base, _, _ in sources]
+        rescaled = np.array([r for _, r, _ in sources])
+        reverse = np.array([rev for _, _, rev in sources])
+        scale, offset, _ = affine_parameters(self.mins[cols], self.maxs[cols], reverse)
+        low, high = definition.scale
+        # Items outside the rescaled columns keep their values, reverse-coded on the definition's scale
+        scale = np.where(rescaled, scale, np.where(reverse, -1.0, 1.0))
+        offset = np.where(rescaled, offset, np.where(reverse, low + high, 0.0))
+        return cols, scale, offset
+
+    def item_covariance(self, definition):
+        """Covariance matrix of an index's items on the scale the index averages them."""
+        cols, scale, _ = self.transform(definition)
+        cov = moment_covariance(self.n, self.s, self.xy)[np.ix_(cols, cols)]
+        return cov * scale[:, None] * scale[None, :]
+
+    def results(self, intervals=None):
+        """One row per (index, item): alpha, corrected item-total r and alpha if the item is deleted.
+
+        Missing answers are deleted pairwise: each covariance uses the rows
+        where both items are present, and ``N`` is the smallest such count.
+        ``intervals`` optionally maps index names to (low, high) bounds of alpha.
+        """
+        rows = []
+        for definition in self.definitions:
+            cols, scale, offset = self.transform(definition)
+            cov = self.item_covariance(definition)
+            stats = scale_statistics(cov)
+            n = self.n[np.ix_(cols, cols)]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                means = np.diagonal(self.s)[cols] / np.diagonal(n)
+            sds = np.sqrt(np.diagonal(cov))
+            low, high = (intervals or {}).get(definition.name, (np.nan, np.nan))
+            for i, item in enumerate(definition.items):
+                rows.append({
+                    'Index': definition.name,
+                    'Item': item,
+                    'Items': len(definition.items),
+                    'N': int(n.min()),
+                    'Cronbach_Alpha': stats['alpha'],
+                    'Alpha_CI_Low': low,
+                    'Alpha_CI_High': high,
+                    'Item_Mean': means[i] * scale[i] + offset[i],
+                    'Item_SD': sds[i],
+                    'Corrected_Item_Total': stats['item_total'][i],
+                    'Alpha_If_Deleted': stats['alpha_if_deleted'][i],
+                })
+        return pd.DataFrame(rows)
+
+    def to_dict(self):
+        return {
+            'definitions': [d._asdict() for d in self.definitions],
+            'scaled_cols': self.scaled_cols,
+            'reverse_cols': self.reverse_cols,
+            'rows_seen': self.rows_seen,
+            'n': self.n.tolist(),
+            's': self.s.tolist(),
+            'xy': self.xy.tolist(),
+            'mins': self.mins.tolist(),
+            'maxs': self.maxs.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        from composite_index import IndexDefinition
+
+        definitions = [IndexDefinition(**{**d, 'reverse': tuple(d['reverse']),
+                                          'weights': None if d['weights'] is None else tuple(d['weights']),
+                                          'scale': tuple(d['scale'])})
+                       for d in data['definitions']]
+        acc = cls(definitions, data['scaled_cols'], data['reverse_cols'])
+        acc.rows_seen = data['rows_seen']
+        for key in ('n', 's', 'xy', 'mins', 'maxs'):
+            setattr(acc, key, np.array(data[key], dtype=np.float64))
+        return acc
+
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+def _pattern_moments(items):
+    """Distinct response patterns of an item block, their counts and per-pattern moment features.
+
+    Features are the presence products, present-masked values and value
+    products of every item pair, so a weighted sum of them gives (n, s, xy).
+    Returns (inverse, counts, features of shape (patterns, 3 * items²)).
+    """
+    keyed = np.where(np.isnan(items), np.inf, items)
+    patterns, inverse, counts = np.unique(keyed, axis=0, return_inverse=True, return_counts=True)
+    valid = np.isfinite(patterns)
+    x = np.where(valid, patterns, 0.0)
+    present = valid.astype(np.float64)
+    k = items.shape[1]
+    features = np.concatenate([
+        (present[:, :, None] * present[:, None, :]).reshape(-1, k * k),
+        (x[:, :, None] * present[:, None, :]).reshape(-1, k * k),
+        (x[:, :, None] * x[:, None, :]).reshape(-1, k * k),
+    ], axis=1)
+    return inverse.ravel(), counts, features
+
+
+def _alpha_from_features(moments, k):
+    """Alpha of each row of summed pattern features (..., 3 * k²)."""
+    n, s, xy = (moments[..., i * k * k:(i + 1) * k * k].reshape(moments.shape[:-1] + (k, k)) for i in range(3))
+    return scale_statistics(moment_covariance(n, s, xy))['alpha']
+
+
+def bootstrap_alpha(df, accumulator, n_boot=2000, level=0.95, method='bca', chunk=None, seed=0):
+    """Bootstrap intervals of every index's alpha: {index name: (low, high)}.
+
+    Each resample is a row of respondent counts from ``resample_counts``;
+    folded onto the distinct response patterns, one product with the
+    patterns' moment features gives every resample's covariance matrix. The
+    rescaling of ``accumulator`` is kept fixed. ``method`` is 'bca' (with the
+    jackknife over patterns) or 'percentile'.
+    """
+    intervals = {}
+    for definition in accumulator.definitions:
+        cols, scale, offset = accumulator.transform(definition)
+        items = df[[accumulator.columns[c] for c in cols]].to_numpy(dtype=np.float64) * scale + offset
+        inverse, counts, features = _pattern_moments(items)
+        k = items.shape[1]
+        estimate = _alpha_from_features(counts @ features, k)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        boot = np.concatenate([
+            _alpha_from_features(np.add.reduceat(weights[:, order], bounds, axis=1) @ features, k)
+            for weights in resample_counts(len(items), n_boot, chunk, seed)])
+        if method == 'bca':
+            # Leaving out any one respondent of a pattern gives the same alpha
+            jack = _alpha_from_features(counts @ features - features, k)
+            intervals[definition.name] = tuple(float(b) for b in bca_bounds(boot, estimate, jack, counts, level))
+        elif method == 'percentile':
+            intervals[definition.name] = tuple(float(b) for b in np.nanquantile(boot, [(1 - level) / 2, (1 + level) / 2]))
+        else:
+            raise ValueError(f"Unknown bootstrap interval method: {method}")
+    return intervals
+
+
+def main(argv=None, prog=None):
+    from score_store import load_scores
+
+    parser = argparse.ArgumentParser(prog=prog, description="Cronbach's alpha and item diagnostics of the composite indices")
+    parser.add_argument('--data', default='comprehensive_anova_data.csv',
+                        help="mapped scores: CSV, Parquet or a score_store.py .scores bundle")
+    parser.add_argument('--state', help="fold --data into this saved accumulator (created if missing) instead of starting fresh")
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='N', help="BCa interval of alpha from N resamples")
+    parser.add_argument('-o', '--output', default='reliability_results.csv')
+    args = parser.parse_args(argv)
+    if args.bootstrap and args.state:
+        parser.error("--bootstrap resamples the responses themselves and cannot be combined with --state")
+
+    accumulator = ReliabilityAccumulator()
+    if args.state and Path(args.state).exists():
+        accumulator = ReliabilityAccumulator.load(args.state)
+    df = load_scores(args.data, columns=accumulator.columns)
+    accumulator.update(df)
+    if args.state:
+        accumulator.save(args.state)
+        print(f"💾 {len(df)} responses folded into {args.state} ({accumulator.rows_seen} in total)")
+
+    intervals = bootstrap_alpha(df, accumulator, args.bootstrap) if args.bootstrap else None
+    results = accumulator.results(intervals)
+    results.to_csv(args.output, index=False)
+    for name, rows in results.groupby('Index', sort=False):
+        first = rows.iloc[0]
+        interval = (f" [{first['Alpha_CI_Low']:.3f}, {first['Alpha_CI_High']:.3f}]"
+                    if not np.isnan(first['Alpha_CI_Low']) else "")
+        print(f"📏 {name}: α = {first['Cronbach_Alpha']:.3f}{interval} ({first['Items']} items, pairwise n ≥ {first['N']})")
+        for _, row in rows.iterrows():
+            flag = " ⚠️  alpha rises without it" if row['Alpha_If_Deleted'] > first['Cronbach_Alpha'] else ""
+            print(f"   {row['Item']}: item-total r = {row['Corrected_Item_Total']:.3f}, "
+                  f"α if deleted = {row['Alpha_If_Deleted']:.3f}{flag}")
+    print(f"💾 Reliability results saved to: {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
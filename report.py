@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Data-Driven ANOVA Report for the IIT Internet Connectivity Study
+Builds the summary text, plot titles and a Markdown / HTML report from
+anova_results.csv (plus posthoc_results.csv, factorial_results.csv and
+association_results.csv when present) instead of hand-copied numbers. The strongest pairs are picked with
+a partial sort, and each report section is regenerated only when the
+results it is built from change; the rendered sections are kept in a
+``<report>.sections.json`` sidecar.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import re
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RESULTS_FILE = 'anova_results.csv'
+POSTHOC_FILE = 'posthoc_results.csv'
+FACTORIAL_FILE = 'factorial_results.csv'
+ASSOCIATION_FILE = 'association_results.csv'
+REPORT_FILE = 'anova_report.md'
+TOP_K = 10
+PAIR_COLUMNS = ['Independent_Variable', 'Dependent_Variable']
+# Part of every section hash: bump when a section builder changes
+REPORT_VERSION = 1
+
+EFFECT_THRESHOLDS = [(0.14, 'Large'), (0.06, 'Medium'), (0.01, 'Small')]
+
+
+def variable_label(column):
+    """'WiFi_Speed_Score' -> 'WiFi Speed'."""
+    return column.removesuffix('_Score').replace('_', ' ')
+
+
+def effect_magnitude(eta_squared):
+    """Conventional size label of an η² value."""
+    for threshold, label in EFFECT_THRESHOLDS:
+        if eta_squared >= threshold:
+            return label
+    return 'Negligible'
+
+
+def format_p(p, compact=False):
+    """'p < 0.001' or 'p = 0.017'; ``compact`` drops the spaces, as in plot titles."""
+    text = "p < 0.001" if p < 0.001 else f"p = {p:.3f}"
+    return text.replace(' ', '') if compact else text
+
+
+def p_cell(p):
+    """p-value as a table cell: '< 0.001' or '0.017'."""
+    return "< 0.001" if p < 0.001 else f"{p:.3f}"
+
+
+def top_k(values, k, largest=False):
+    """Indices of the ``k`` smallest (or largest) ``values``, in order, via a partial sort.
+
+    ``np.argpartition`` selects the k candidates in linear time; only those
+    k are sorted, so picking the top pairs of a large sweep never sorts it.
+    NaN values are never selected.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    keys = -values if largest else values.copy()
+    keys[np.isnan(keys)] = np.inf
+    k = min(k, int(np.isfinite(keys).sum()))
+    if k == 0:
+        return np.array([], dtype=np.intp)
+    candidates = np.argpartition(keys, k - 1)[:k]
+    return candidates[np.argsort(keys[candidates], kind='stable')]
+
+
+def strongest_pairs(results, k, significant_only=False):
+    """The ``k`` rows of ``results`` with the smallest p-values."""
+    results = results.reset_index(drop=True)
+    if significant_only:
+        results = results[results['Significant'].astype(bool)].reset_index(drop=True)
+    return results.iloc[top_k(results['P_value'], k)]
+
+
+def pair_title(row):
+    """Plot title of one result row: 'WiFi Speed → Time Lost\\n(F=8.03, p=0.001)'."""
+    return (f"{variable_label(row['Independent_Variable'])} → {variable_label(row['Dependent_Variable'])}\n"
+            f"(F={row['F_statistic']:.2f}, {format_p(row['P_value'], compact=True)})")
+
+
+def key_findings(results, limit=3):
+    """(factor, affected dependents) of the factors with significant results, strongest first,
+    and the factors without any."""
+    significant = results[results['Significant'].astype(bool)]
+    findings = []
+    for _, row in strongest_pairs(significant, len(significant)).iterrows():
+        factor = row['Independent_Variable']
+        if factor not in dict(findings):
+            findings.append((factor, significant.loc[significant['Independent_Variable'] == factor,
+                                                     'Dependent_Variable'].tolist()))
+    found = dict(findings)
+    without = [f for f in dict.fromkeys(results['Independent_Variable']) if f not in found]
+    return findings[:limit], without[:limit]
+
+
+def summary_text(results, k=3, width=36):
+    """Text of the summary panel of visualize_anova_results.py."""
+    total = len(results)
+    significant = int(results['Significant'].sum())
+    lines = ["ANOVA ANALYSIS SUMMARY", "",
+             f"Total Tests Performed: {total}",
+             f"Significant Results: {significant} ({significant / total * 100 if total else 0:.1f}%)", "",
+             "Strongest Effects:"]
+    for _, row in strongest_pairs(results, k, significant_only=True).iterrows():
+        lines += [f"• {variable_label(row['Independent_Variable'])} → {variable_label(row['Dependent_Variable'])}",
+                  f"  F = {row['F_statistic']:.2f}, {format_p(row['P_value'])}, η² = {row['Effect_Size']:.2f}", ""]
+    if not significant:
+        lines += ["  none at p < 0.05", ""]
+    lines.append("Key Findings:")
+    findings, without = key_findings(results)
+    for factor, dependents in findings:
+        text = f"{variable_label(factor)} significantly affects " + " and ".join(
+            variable_label(d).lower() for d in dependents)
+        lines += textwrap.wrap(text, width, initial_indent="✓ ", subsequent_indent="  ") + [""]
+    if without:
+        text = " / ".join(variable_label(f) for f in without) + (
+            " shows" if len(without) == 1 else " show") + " no significant association"
+        lines += textwrap.wrap(text, width, initial_indent="✗ ", subsequent_indent="  ") + [""]
+    lines += ["Effect Size Interpretation:", "Small: η² ≥ 0.01, Medium: η² ≥ 0.06", "Large: η² ≥ 0.14", ""]
+    return "\n".join(lines)
+
+
+def _pair(row):
+    return f"{variable_label(row['Independent_Variable'])} → {variable_label(row['Dependent_Variable'])}"
+
+
+def _table(header, rows):
+    lines = ["| " + " | ".join(header) + " |", "|" + "|".join("---" for _ in header) + "|"]
+    lines += ["| " + " | ".join(map(str, row)) + " |" for row in rows]
+    return lines
+
+
+def overview_section(results):
+    significant = results['Significant'].astype(bool)
+    magnitudes = results['Effect_Size'].map(effect_magnitude).value_counts()
+    lines = ["## Overview", "",
+             f"- **Total ANOVA Tests**: {len(results)}",
+             f"- **Significant Results**: {int(significant.sum())} "
+             f"({significant.mean() * 100 if len(results) else 0:.0f}%)"]
+    for _, label in EFFECT_THRESHOLDS:
+        lines.append(f"- **{label} Effects**: {int(magnitudes.get(label, 0))}")
+    strongest = strongest_pairs(results, 1)
+    if len(strongest):
+        row = strongest.iloc[0]
+        lines.append(f"- **Strongest Effect**: {_pair(row)} (F = {row['F_statistic']:.2f}, "
+                     f"{format_p(row['P_value'])}, η² = {row['Effect_Size']:.3f})")
+    return lines
+
+
+def top_pairs_section(results, k=TOP_K):
+    rows = [(i, _pair(row), f"{row['F_statistic']:.2f}", p_cell(row['P_value']),
+             f"{row['Effect_Size']:.3f}", effect_magnitude(row['Effect_Size']),
+             '✅' if row['Significant'] else '❌')
+            for i, (_, row) in enumerate(strongest_pairs(results, k).iterrows(), start=1)]
+    return ([f"## Strongest {len(rows)} Pairs", ""]
+            + _table(['#', 'Pair', 'F', 'p', 'η²', 'Effect', 'Significant'], rows))
+
+
+def findings_heading():
+    return ["## Results by Factor"]
+
+
+def factor_findings(factor, results):
+    lines = [f"### {variable_label(factor)}", ""]
+    for _, row in strongest_pairs(results, len(results)).iterrows():
+        mark = '⭐ ' if row['Significant'] else ''
+        lines.append(f"- {mark}**{variable_label(row['Dependent_Variable'])}**: "
+                     f"F = {row['F_statistic']:.2f}, {format_p(row['P_value'])}, "
+                     f"η² = {row['Effect_Size']:.3f} ({effect_magnitude(row['Effect_Size'])} effect)")
+    return lines
+
+
+def corrections_section(results):
+    lines = ["## Multiple-Testing Corrections", ""]
+    for column, name in [('Significant_Holm', 'Holm'), ('Significant_BH', 'Benjamini-Hochberg')]:
+        lines.append(f"- **{name}**: {int(results[column].astype(bool).sum())} of {len(results)} pairs significant")
+    return lines
+
+
+def assumptions_section(results):
+    counts = results['Recommended_Test'].value_counts()
+    lines = ["## Assumption Checks", "",
+             f"- **Normal residuals**: {int(results['Normal_Residuals'].astype(bool).sum())} of {len(results)} pairs",
+             f"- **Equal variances**: {int(results['Equal_Variances'].astype(bool).sum())} of {len(results)} pairs"]
+    lines += [f"- **Recommended {test}**: {int(n)} pairs" for test, n in counts.items()]
+    return lines
+
+
+def posthoc_section(posthoc):
+    rejected = posthoc[posthoc['Reject'].astype(bool)]
+    lines = ["## Post-Hoc Comparisons (Tukey HSD)", "",
+             f"{len(rejected)} of {len(posthoc)} group differences are significant.", ""]
+    rows = [(_pair(row), f"{row['Group_1']} vs {row['Group_2']}", f"{row['Mean_Diff']:.2f}",
+             p_cell(row['P_adj']))
+            for _, row in rejected.iloc[top_k(rejected['P_adj'], TOP_K)].iterrows()]
+    return lines + _table(['Pair', 'Groups', 'Mean difference', 'p (adjusted)'], rows) if rows else lines[:-1]
+
+
+def factorial_section(factorial, k=TOP_K):
+    terms = factorial.dropna(subset=['P_value'])
+    significant = terms[terms['Significant'].astype(bool)]
+    lines = ["## Factorial ANOVA", "",
+             f"{len(significant)} of {len(terms)} main-effect and interaction terms are significant.", ""]
+    rows = [(" × ".join(map(variable_label, row['Term'].split(':'))), variable_label(row['Dependent_Variable']),
+             " × ".join(map(variable_label, row['Factors'].split(' × '))), f"{row['F_statistic']:.2f}",
+             p_cell(row['P_value']), f"{row['Partial_Eta_Squared']:.3f}")
+            for _, row in significant.iloc[top_k(significant['P_value'], k)].iterrows()]
+    return lines + _table(['Term', 'Dependent', 'Design', 'F', 'p', 'Partial η²'], rows) if rows else lines[:-1]
+
+
+def association_section(associations, k=TOP_K):
+    strongest = associations.iloc[top_k(associations['Spearman_rho'].abs(), k, largest=True)]
+    lines = ["## Associations Between Scores", "",
+             f"Rank correlations of {len(associations)} score pairs; the {len(strongest)} strongest:", ""]
+    rows = [(f"{variable_label(row['Variable_1'])} ↔ {variable_label(row['Variable_2'])}",
+             f"{row['Spearman_rho']:.3f}", f"{row['Kendall_Tau_b']:.3f}", f"{row['Cramers_V']:.3f}",
+             p_cell(row['Spearman_P']), int(row['N']))
+            for _, row in strongest.iterrows()]
+    return lines + _table(['Pair', 'Spearman ρ', 'Kendall τ_b', "Cramér's V", 'p', 'N'], rows)
+
+
+def report_sections(results, posthoc=None, factorial=None, k=TOP_K, associations=None):
+    """(name, builder, inputs) of every section that the available tables support.
+
+    Each section gets only the rows and columns it reports, so its hash
+    changes only when its content would. Names with a '/' are subsections.
+    """
+    results = results.reset_index(drop=True)
+    core = results[PAIR_COLUMNS + ['F_statistic', 'P_value', 'Significant', 'Effect_Size']]
+    sections = [
+        ('overview', overview_section, {'results': core}),
+        ('top_pairs', top_pairs_section, {'results': core, 'k': k}),
+        ('findings', findings_heading, {}),
+    ]
+    # One subsection per factor: a changed test rebuilds only its factor's block
+    for factor, group in core.groupby('Independent_Variable', sort=False):
+        sections.append((f"findings/{factor}", factor_findings, {'factor': factor, 'results': group}))
+    if {'Significant_Holm', 'Significant_BH'}.issubset(results.columns):
+        sections.append(('corrections', corrections_section,
+                         {'results': results[['Significant_Holm', 'Significant_BH']]}))
+    if {'Recommended_Test', 'Normal_Residuals', 'Equal_Variances'}.issubset(results.columns):
+        sections.append(('assumptions', assumptions_section,
+                         {'results': results[['Recommended_Test', 'Normal_Residuals', 'Equal_Variances']]}))
+    if posthoc is not None:
+        sections.append(('posthoc', posthoc_section, {'posthoc': posthoc}))
+    if factorial is not None:
+        sections.append(('factorial', factorial_section, {'factorial': factorial, 'k': k}))
+    if associations is not None:
+        sections.append(('associations', association_section, {'associations': associations, 'k': k}))
+    return sections
+
+
+def inputs_hash(inputs, *parts):
+    """SHA-256 of keyword inputs (DataFrames by content) plus any extra ``parts``."""
+    digest = hashlib.sha256(":".join(map(str, parts)).encode())
+    for key in sorted(inputs):
+        value = inputs[key]
+        digest.update(key.encode())
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            frame = value.to_frame() if isinstance(value, pd.Series) else value
+            digest.update(json.dumps([list(map(str, frame.columns)), list(map(str, frame.dtypes))]).encode())
+            digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def markdown_to_html(text):
+    """HTML for the Markdown subset the section builders emit (headings, lists, tables, emphasis, code)."""
+    def inline(line):
+        line = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(line))
+        line = re.sub(r'\*(.+?)\*', r'<em>\1</em>', line)
+        return re.sub(r'`(.+?)`', r'<code>\1</code>', line)
+
+    out, in_list, table = [], False, []
+    for line in text.splitlines() + ['']:
+        if line.startswith('|'):
+            if not set(line) <= set('|-'):
+                table.append([inline(cell.strip()) for cell in line.strip('|').split('|')])
+            continue
+        if table:
+            head, *body = table
+            out.append('<table><tr>' + ''.join(f'<th>{c}</th>' for c in head) + '</tr>'
+                       + ''.join('<tr>' + ''.join(f'<td>{c}</td>' for c in row) + '</tr>' for row in body)
+                       + '</table>')
+            table = []
+        if in_list and not line.startswith('- '):
+            out.append('</ul>')
+            in_list = False
+        if line == '---':
+            out.append('<hr>')
+        elif line.startswith('#'):
+            level = len(line) - len(line.lstrip('#'))
+            out.append(f'<h{level}>{inline(line[level:].strip())}</h{level}>')
+        elif line.startswith('- '):
+            if not in_list:
+                out.append('<ul>')
+                in_list = True
+            out.append(f'<li>{inline(line[2:])}</li>')
+        elif line.strip():
+            out.append(f'<p>{inline(line)}</p>')
+    return '\n'.join(out)
+
+
+def build_report(results, output=REPORT_FILE, posthoc=None, factorial=None, k=TOP_K, html_output=None,
+                 force=False, source=RESULTS_FILE, associations=None):
+    """Write the Markdown (and optionally HTML) report, rebuilding only changed sections.
+
+    Returns the names of the sections that were rebuilt.
+    """
+    output = Path(output)
+    cache_path = output.with_name(output.name + '.sections.json')
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() and not force else {}
+
+    rendered, rebuilt = {}, []
+    for name, builder, inputs in report_sections(results, posthoc, factorial, k, associations):
+        key = inputs_hash(inputs, REPORT_VERSION, builder.__name__)
+        if cache.get(name, {}).get('hash') != key:
+            cache[name] = {'hash': key, 'markdown': "\n".join(builder(**inputs))}
+            rebuilt.append(name)
+        rendered[name] = cache[name]['markdown']
+
+    title = ["# ANOVA ANALYSIS REPORT", "## IIT Internet Connectivity Impact on Student Productivity", "",
+             f"*Generated by report.py from `{source}`.*"]
+    parts = ["\n".join(title)]
+    number = 0
+    for name, text in rendered.items():
+        if '/' not in name:
+            # Sections are numbered as assembled, since optional ones may be missing
+            number += 1
+            text = "---\n\n" + text.replace("## ", f"## {number}. ", 1)
+        parts.append(text)
+    markdown = "\n\n".join(parts) + "\n"
+    output.write_text(markdown)
+    if html_output:
+        Path(html_output).write_text(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>ANOVA Analysis Report</title></head>\n"
+            f"<body>\n{markdown_to_html(markdown)}\n</body></html>\n")
+    cache_path.write_text(json.dumps({name: cache[name] for name in rendered}, indent=2) + '\n')
+    return rebuilt
+
+
+def _optional_csv(path):
+    return pd.read_csv(path) if path and Path(path).exists() else None
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Write a Markdown / HTML report from the ANOVA results")
+    parser.add_argument('--results', default=RESULTS_FILE)
+    parser.add_argument('--posthoc', default=POSTHOC_FILE, help="Tukey HSD results (skipped if missing)")
+    parser.add_argument('--factorial', default=FACTORIAL_FILE, help="factorial ANOVA results (skipped if missing)")
+    parser.add_argument('--associations', default=ASSOCIATION_FILE,
+                        help="association.py rank correlations (skipped if missing)")
+    parser.add_argument('-o', '--output', default=REPORT_FILE)
+    parser.add_argument('--html', metavar='FILE', help="also write an HTML version")
+    parser.add_argument('--top', type=int, default=TOP_K, help="pairs in the strongest-pairs table")
+    parser.add_argument('--force', action='store_true', help="rebuild every section")
+    args = parser.parse_args(argv)
+
+    results = pd.read_csv(args.results)
+    rebuilt = build_report(results, args.output, _optional_csv(args.posthoc), _optional_csv(args.factorial),
+                           args.top, args.html, args.force, args.results, _optional_csv(args.associations))
+    print(f"📝 Report written to {args.output}" + (f" and {args.html}" if args.html else "")
+          + f" ({len(rebuilt)} section{'s' if len(rebuilt) != 1 else ''} rebuilt"
+          + (f": {', '.join(rebuilt)})" if rebuilt else ")"))
+    return rebuilt
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Result Cache for the ANOVA Scripts
+Every per-pair result is stored on disk under a key built from the hashes of
+the columns it reads plus the test specification, so unchanged pairs are
+served from disk and only pairs touching changed columns are recomputed.
+The cache directory is kept under a size budget by evicting the least
+recently used entries.
+
+A small sidecar written next to anova_results.csv records which column data
+produced it, so visualize_anova_results.py can detect stale results.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from anova_engine import flatten_vars
+
+CACHE_DIR = '.anova_cache'
+MAX_BYTES = 64 * 1024 * 1024
+PAIR_KEYS = ['Independent_Variable', 'Dependent_Variable']
+
+
+def column_fingerprint(values):
+    """SHA-256 of a column's values; int8, float32 and float64 copies of the same scores match."""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    digest = hashlib.sha256()
+    digest.update(np.where(missing, 0.0, values).tobytes())
+    digest.update(np.packbits(missing).tobytes())
+    digest.update(str(len(values)).encode())
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(df, columns=None):
+    """{column: fingerprint} for ``columns`` (default: all) of ``df``."""
+    columns = df.columns if columns is None else columns
+    return {col: column_fingerprint(df[col]) for col in columns}
+
+
+def result_key(kind, fingerprints, spec=None):
+    """Cache key of one result: test kind, input column hashes and test parameters."""
+    payload = json.dumps([kind, list(fingerprints), spec or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _plain(value):
+    """JSON-safe copy of NumPy scalars and arrays."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+class ResultCache:
+    """On-disk JSON cache with least-recently-used eviction under ``max_bytes``.
+
+    ``directory=None`` disables the cache: every lookup misses and nothing is written.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = None if directory is None else Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Cached value for ``key`` or None; a hit marks the entry as recently used."""
+        if self.directory is None:
+            self.misses += 1
+            return None
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text())
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serialisable ``value`` and evict old entries if over budget."""
+        if self.directory is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = json.dumps(value, default=_plain)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(text)
+        tmp.replace(path)
+        if self._size is None:
+            self._size = sum(entry.stat().st_size for entry in self._entries())
+        else:
+            self._size += len(text.encode())
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def memoize(self, kind, fingerprints, spec, compute):
+        """Return the cached result of ``compute()`` for these inputs, computing it on a miss."""
+        key = result_key(kind, fingerprints, spec)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _entries(self):
+        return self.directory.glob('*/*.json') if self.directory.exists() else []
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        for path in self._entries():
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+    def clear(self):
+        for path in list(self._entries()):
+            path.unlink()
+        self._size = 0
+
+
+def cached_pairs(cache, df, kind, independent_vars, dependent_vars, compute, spec=None, seeded=False):
+    """Per-pair results of ``compute(df, factors, dependents)`` served from ``cache``.
+
+    Pairs are keyed on the two columns' fingerprints, so a changed column only
+    invalidates the pairs that read it. Missing pairs are recomputed in one
+    call per factor. With ``seeded`` (resampling tests) every missing pair is
+    computed in one call ``compute(df, factors, dependents, pair_seeds)``,
+    where ``pair_seeds`` maps each pair to a seed taken from its cache key, so
+    its draws do not depend on which pairs run together.
+    Rows come back in ``batch_oneway`` order.
+    """
+    factors = list(dict.fromkeys(flatten_vars(independent_vars)))
+    dependents = list(dict.fromkeys(flatten_vars(dependent_vars)))
+    fingerprints = dataset_fingerprint(df, list(dict.fromkeys(factors + dependents)))
+
+    rows, missing = {}, {}
+    for factor in factors:
+        for dep in dependents:
+            if dep == factor:
+                continue
+            key = result_key(kind, [fingerprints[factor], fingerprints[dep]], spec)
+            value = cache.get(key)
+            if value is None:
+                missing[factor, dep] = key
+            else:
+                rows[factor, dep] = value
+
+    missing_factors = list(dict.fromkeys(factor for factor, _ in missing))
+    if seeded and missing:
+        # One call for every missing pair, so a resampling test spreads them over one process pool
+        pair_seeds = {pair: int(key, 16) for pair, key in missing.items()}
+        batches = [(missing_factors, list(dict.fromkeys(dep for _, dep in missing)), pair_seeds)]
+    else:
+        batches = [([factor], [dep for f, dep in missing if f == factor]) for factor in missing_factors]
+    for args in batches:
+        for record in compute(df, *args).to_dict('records'):
+            pair = record['Independent_Variable'], record['Dependent_Variable']
+            value = {col: val for col, val in record.items() if col not in PAIR_KEYS}
+            cache.put(missing[pair], value)
+            rows[pair] = json.loads(json.dumps(value, default=_plain))
+
+    ordered = [{'Independent_Variable': factor, 'Dependent_Variable': dep, **rows[factor, dep]}
+               for factor in factors for dep in dependents if (factor, dep) in rows]
+    return pd.DataFrame(ordered)
+
+
+def _sidecar(path):
+    path = Path(path)
+    return path.with_name(path.name + '.meta.json')
+
+
+def write_results(results, path, df, data_file=None, keys=PAIR_KEYS):
+    """Write ``results`` to CSV plus a sidecar with the fingerprints of the ``keys`` columns it used."""
+    results.to_csv(path, index=False)
+    columns = list(dict.fromkeys(col for key in keys for col in results[key].tolist()))
+    meta = {
+        'data_file': None if data_file is None else str(data_file),
+        'results_sha256': hashlib.sha256(Path(path).read_bytes()).hexdigest(),
+        'columns': dataset_fingerprint(df, columns),
+    }
+    _sidecar(path).write_text(json.dumps(meta, indent=2) + '\n')
+
+
+def forget_results(path):
+    """Drop the sidecar of results written without column fingerprints."""
+    _sidecar(path).unlink(missing_ok=True)
+
+
+def stale_reasons(path, load_columns):
+    """Reasons why the results at ``path`` no longer match the data (empty when current).
+
+    ``load_columns(columns)`` returns a DataFrame with the requested data columns.
+    Returns None when there is no sidecar to check against.
+    """
+    sidecar = _sidecar(path)
+    if not sidecar.exists():
+        return None
+    meta = json.loads(sidecar.read_text())
+    reasons = []
+    if hashlib.sha256(Path(path).read_bytes()).hexdigest() != meta['results_sha256']:
+        reasons.append(f"{path} was rewritten after its fingerprints were recorded")
+    recorded = meta['columns']
+    try:
+        data = load_columns(list(recorded))
+    except (KeyError, ValueError) as exc:
+        return reasons + [f"data no longer has the analysed columns ({exc})"]
+    changed = [col for col, digest in recorded.items() if column_fingerprint(data[col]) != digest]
+    if changed:
+        reasons.append(f"data changed in {len(changed)} column(s): {', '.join(changed)}")
+    return reasons
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Fused Scaling Pipeline for the Composite Indices
+Rescales items to 1–5, reverse-codes the "higher = worse" items, builds the
+composite indices and the Low / Medium / High connectivity terciles in one
+stage over a single float64 copy of the numeric block: column min/max come
+from one reduction, and rescaling plus reverse coding are broadcast in place
+over that copy, in the same operation order as new-type/build_indices.py.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from composite_index import IndexDefinition, index_values
+from score_store import load_scores
+
+# Defaults mirror the configuration of new-type/build_indices.py
+SCALED_COLUMNS = [
+    "WiFi_Speed_Score", "Reliability_Score", "Peak_Performance_Score", "Outage_Frequency_Score",
+    "Programming_Impact_Score", "Collaboration_Score", "Task_Abandonment_Score", "Time_Lost_Score",
+    "Productivity_Influence_Score", "Future_Performance_Score",
+]
+
+REVERSE_ITEMS = ["Outage_Frequency_Score", "Task_Abandonment_Score", "Time_Lost_Score"]
+
+INDEX_DEFINITIONS = [
+    IndexDefinition("Connectivity_Index", [
+        "WiFi_Speed_Score", "Reliability_Score", "Peak_Performance_Score", "Outage_Frequency_Score_R",
+    ]),
+    IndexDefinition("Productivity_Index", [
+        "Programming_Impact_Score", "Collaboration_Score",
+        "Task_Abandonment_Score_R", "Time_Lost_Score_R",
+        "Productivity_Influence_Score", "Future_Performance_Score",
+    ]),
+]
+
+TERCILE_LABELS = ["Low", "Medium", "High"]
+
+
+def affine_parameters(mins, maxs, reverse, low=1, high=5):
+    """Per-column (scale, offset) so that x * scale + offset rescales to [low, high].
+
+    Reverse-coded columns map to low + high - rescaled value. Constant columns get
+    scale 0 and the centre of the range, as ``rescale_1to5`` does.
+    """
+    spread = maxs - mins
+    constant = ~(spread > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where(constant, 0.0, (high - low) / spread)
+        offset = np.where(constant, (low + high) / 2, low - mins * scale)
+    scale = np.where(reverse, -scale, scale)
+    offset = np.where(reverse, (low + high) - offset, offset)
+    return scale, offset, constant
+
+
+def terciles(index):
+    """Low / Medium / High groups at the 1/3 and 2/3 quantiles of an index."""
+    return pd.qcut(index, q=[0, 1/3, 2/3, 1], labels=TERCILE_LABELS)
+
+
+def tercile_edges(values, counts):
+    """Exact ``pd.qcut`` tercile edges of a variable given its distinct values and their counts.
+
+    Uses the same linear interpolation between order statistics as
+    ``Series.quantile``, so a value-count summary gives the same edges as the raw rows.
+    """
+    order = np.argsort(values)
+    values = np.asarray(values, dtype=np.float64)[order]
+    cumulative = np.cumsum(np.asarray(counts)[order])
+    total = cumulative[-1]
+    edges = []
+    for q in (0, 1/3, 2/3, 1):
+        position = q * (total - 1)
+        below = int(np.floor(position))
+        lower = values[np.searchsorted(cumulative, below, side='right')]
+        upper = values[np.searchsorted(cumulative, min(below + 1, total - 1), side='right')]
+        edges.append(lower + (upper - lower) * (position - below))
+    return np.array(edges)
+
+
+def fused_scale_and_index(df, scaled_cols=SCALED_COLUMNS, reverse_cols=REVERSE_ITEMS,
+                          definitions=INDEX_DEFINITIONS, group_index="Connectivity_Index",
+                          low=1, high=5, ranges=None, group_edges=None):
+    """Rescale, reverse-code and index ``df`` in one pass.
+
+    Returns a DataFrame with the rescaled ``scaled_cols``, one ``<col>_R``
+    column per reverse-coded item, every index in ``definitions`` and, when
+    ``group_index`` is set, its ``Connectivity_Group`` style tercile column.
+
+    ``ranges`` supplies precomputed (mins, maxs) per source column and
+    ``group_edges`` precomputed tercile edges, e.g. global values when ``df`` is
+    only one chunk of a larger file.
+    """
+    scaled_cols, reverse_cols = list(scaled_cols), list(reverse_cols)
+    sources = scaled_cols + reverse_cols
+    names = scaled_cols + [f"{col}_R" for col in reverse_cols]
+
+    block = np.array(df[sources], dtype=np.float64)  # the only copy of the numeric block
+    if ranges is None:
+        with np.errstate(all='ignore'):
+            mins, maxs = np.nanmin(block, axis=0), np.nanmax(block, axis=0)
+    else:
+        mins, maxs = (np.asarray(r, dtype=np.float64) for r in ranges)
+    constant = ~(maxs - mins > 0)
+    valid = ~np.isnan(block)
+    # Same operation order as rescale_1to5 and reverse_code, so the output is bit-identical
+    with np.errstate(divide='ignore', invalid='ignore'):
+        block -= mins
+        block /= maxs - mins
+    block *= high - low
+    block += low
+    flipped = block[:, len(scaled_cols):]
+    np.subtract(low + high, flipped, out=flipped)
+    # A constant column becomes the centre value everywhere, missing cells included
+    block[:, constant] = (low + high) / 2
+    valid[:, constant] = True
+
+    out = pd.DataFrame(block, columns=names, index=df.index, copy=False)
+    position = {name: i for i, name in enumerate(names)}
+    for definition in definitions:
+        missing = [item for item in definition.items if item not in position]
+        if missing:
+            raise KeyError(f"{definition.name} items are not scaled columns: {missing}")
+        cols = [position[item] for item in definition.items]
+        out[definition.name] = index_values(block, valid, definition.weights, cols)
+    if group_index:
+        group = group_index.replace("_Index", "_Group")
+        if group_edges is None:
+            out[group] = terciles(out[group_index])
+        else:
+            out[group] = pd.cut(out[group_index], group_edges, labels=TERCILE_LABELS, include_lowest=True)
+    return out
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Rescale, reverse-code and build the composite indices")
+    parser.add_argument('--data', default='comprehensive_anova_data.csv',
+                        help="mapped scores: CSV, Parquet or a score_store.py .scores bundle")
+    parser.add_argument('-o', '--output', help="output CSV (default: composite_indices.csv, "
+                                               "or scaled_scores.csv with --no-index)")
+    parser.add_argument('--no-index', action='store_true', help="only rescale and reverse-code the items")
+    args = parser.parse_args(argv)
+
+    df = load_scores(args.data, columns=list(dict.fromkeys(SCALED_COLUMNS + REVERSE_ITEMS)))
+    if args.no_index:
+        out = fused_scale_and_index(df, definitions=[], group_index=None)
+        output = args.output or 'scaled_scores.csv'
+    else:
+        out = fused_scale_and_index(df)
+        output = args.output or 'composite_indices.csv'
+    out.to_csv(output, index=False)
+    print(f"✅ {len(out)} responses × {out.shape[1]} columns saved to {output}")
+    if not args.no_index:
+        counts = out['Connectivity_Group'].value_counts().sort_index()
+        print("📊 Connectivity terciles: " + ", ".join(f"{label} {count}" for label, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Columnar Storage for the Mapped Survey Scores
+Writes the 1–5 style ordinal scores either as a directory bundle of
+memory-mapped int8 .npy columns plus a schema.json, or as Parquet, and loads
+only the columns a script asks for.
+
+Bundle layout (e.g. comprehensive_anova_data.scores/):
+    schema.json          row count, column order and each column's ordinal scale
+    <column>.npy         one int8 array per column, 0 = missing answer
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from survey_variables import SCORE_SCALES
+
+BUNDLE_SUFFIX = '.scores'
+MISSING_CODE = 0
+
+
+def compact_column(series):
+    """Downcast one score column: int8 when complete, float32 with NaN otherwise.
+
+    Text columns (answers not mapped yet) are returned unchanged.
+    """
+    if not pd.api.types.is_numeric_dtype(series):
+        return series
+    if series.isna().any():
+        return series.astype(np.float32)
+    values = series.to_numpy()
+    if np.all(values == np.round(values)) and values.min() >= -128 and values.max() <= 127:
+        return series.astype(np.int8)
+    return series.astype(np.float32)
+
+
+def _column_schema(column):
+    question, answers = SCORE_SCALES.get(column, (None, None))
+    entry = {'dtype': 'int8', 'missing': MISSING_CODE}
+    if answers is not None:
+        entry['question'] = question
+        entry['scale'] = {str(score): answer for score, answer in enumerate(answers, start=1)}
+    return entry
+
+
+def write_scores(df, path):
+    """Store the score columns of ``df`` as a .npy bundle directory or a .parquet file."""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        df.apply(compact_column).to_parquet(path, index=False)
+        return path
+
+    path.mkdir(parents=True, exist_ok=True)
+    for column in df.columns:
+        values = df[column]
+        if (values.dropna() == MISSING_CODE).any():
+            raise ValueError(f"Column '{column}' uses {MISSING_CODE}, which marks missing answers")
+        stored = values.fillna(MISSING_CODE).to_numpy()
+        if np.any(stored != np.round(stored)) or stored.min() < -128 or stored.max() > 127:
+            raise ValueError(f"Column '{column}' does not fit an int8 ordinal score")
+        np.save(path / f"{column}.npy", stored.astype(np.int8))
+    schema = {
+        'rows': len(df),
+        'columns': list(df.columns),
+        'scales': {column: _column_schema(column) for column in df.columns},
+    }
+    (path / 'schema.json').write_text(json.dumps(schema, indent=2))
+    return path
+
+
+def read_schema(path):
+    """Return the schema.json of a bundle directory."""
+    return json.loads((Path(path) / 'schema.json').read_text())
+
+
+def load_scores(path, columns=None):
+    """Load score columns from a bundle directory, a .parquet file or a CSV/Excel file.
+
+    Only ``columns`` are read when given. Complete columns come back as int8;
+    columns with missing answers come back as float32 with NaN.
+    """
+    path = Path(path)
+    if path.is_dir():
+        schema = read_schema(path)
+        wanted = schema['columns'] if columns is None else list(columns)
+        unknown = [column for column in wanted if column not in schema['columns']]
+        if unknown:
+            raise KeyError(f"Columns not in {path}: {unknown}")
+        data = {}
+        for column in wanted:
+            values = np.load(path / f"{column}.npy", mmap_mode='r')
+            missing = values == schema['scales'][column]['missing']
+            if missing.any():
+                values = np.where(missing, np.nan, values).astype(np.float32)
+            data[column] = values
+        return pd.DataFrame(data)
+
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path, columns=columns)
+    if path.suffix in ('.xlsx', '.xls'):
+        df = pd.read_excel(path, usecols=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns)
+    return df.apply(compact_column)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert mapped survey scores to a compact columnar store")
+    parser.add_argument('source', nargs='?', default='comprehensive_anova_data.csv', help="CSV or Excel scores")
+    parser.add_argument('-o', '--output', help="bundle directory or .parquet file (default: <source>.scores)")
+    args = parser.parse_args()
+
+    source = Path(args.source)
+    output = Path(args.output) if args.output else source.with_suffix(BUNDLE_SUFFIX)
+    df = pd.read_csv(source) if source.suffix == '.csv' else pd.read_excel(source)
+    write_scores(df, output)
+    print(f"✅ {len(df)} responses × {df.shape[1]} columns written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Sharded Map/Reduce Analysis over Per-Campus or Per-Semester Exports
+Each worker process streams one shard and writes a small partial-state
+file; a reducer merges the partials into the final results, so no raw rows
+move between processes (or between machines sharing a filesystem):
+
+    map     per shard: ANOVA group sufficient statistics, column min/max for
+            rescaling, the reliability covariance accumulator and value
+            counts of the tercile index's item patterns
+    reduce  merge the partials → anova_results.csv, reliability_results.csv
+            and the global scaling and tercile edges
+    apply   (--composite) per shard: composite indices with the global
+            parameters, concatenated in shard order
+
+Counts and sums of integer scores merge exactly, so the results equal a
+single-process run over the concatenated shards.
+"""
+
+import argparse
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from anova_engine import annotate_sweep, sweep_variables
+from chunked_pipeline import CHUNK_ROWS, group_items, iter_chunks, pattern_tercile_edges
+from ingest import map_ordinal
+from online_anova import OnlineAnova
+from reliability import ReliabilityAccumulator
+from result_cache import forget_results
+from scaling_pipeline import INDEX_DEFINITIONS, REVERSE_ITEMS, SCALED_COLUMNS, fused_scale_and_index
+from survey_variables import dependent_vars, independent_vars
+
+PARTIAL_DIR = '.partials'
+PARTIAL_VERSION = 1
+GROUP_INDEX = "Connectivity_Index"
+
+
+class ShardState:
+    """Mergeable partial state of one or more shards."""
+
+    def __init__(self, sources=None, score_pairs=False):
+        self.sources = [] if sources is None else list(sources)
+        self.score_pairs = score_pairs
+        self.rows_seen = 0
+        self.anova = None
+        self.mins = np.full(len(SCALED_COLUMNS + REVERSE_ITEMS), np.inf)
+        self.maxs = np.full(len(SCALED_COLUMNS + REVERSE_ITEMS), -np.inf)
+        self.reliability = ReliabilityAccumulator(INDEX_DEFINITIONS, SCALED_COLUMNS, REVERSE_ITEMS)
+        self.patterns = None
+
+    def update(self, chunk):
+        """Fold one chunk of mapped responses into every accumulator."""
+        if self.anova is None:
+            factors, dependents = sweep_variables(chunk.columns, independent_vars, dependent_vars, self.score_pairs)
+            self.anova = OnlineAnova(factors, dependents)
+        self.anova.update(chunk)
+        block = chunk[SCALED_COLUMNS + REVERSE_ITEMS].to_numpy(dtype=np.float64)
+        self.mins = np.fmin(self.mins, np.nanmin(block, axis=0, initial=np.inf))
+        self.maxs = np.fmax(self.maxs, np.nanmax(block, axis=0, initial=-np.inf))
+        self.reliability.update(chunk)
+        counts = chunk.groupby(group_items(INDEX_DEFINITIONS, GROUP_INDEX), dropna=False).size()
+        self.patterns = counts if self.patterns is None else self.patterns.add(counts, fill_value=0)
+        self.rows_seen += len(chunk)
+        return self
+
+    def merge(self, other):
+        """Fold another shard's state into this one."""
+        if other.score_pairs != self.score_pairs:
+            raise ValueError("Cannot merge partials computed with different --all-scores settings")
+        if self.anova is None:
+            self.anova = other.anova
+        elif other.anova is not None:
+            self.anova.merge(other.anova)
+        self.mins = np.fmin(self.mins, other.mins)
+        self.maxs = np.fmax(self.maxs, other.maxs)
+        self.reliability.merge(other.reliability)
+        if other.patterns is not None:
+            self.patterns = other.patterns if self.patterns is None else self.patterns.add(other.patterns, fill_value=0)
+        self.sources += other.sources
+        self.rows_seen += other.rows_seen
+        return self
+
+    def results(self, alpha=0.05):
+        """(ANOVA results, reliability results, (mins, maxs), tercile edges) of everything merged."""
+        if self.anova is None:
+            raise ValueError("No rows found in any shard")
+        anova = annotate_sweep(self.anova.results(alpha), independent_vars, dependent_vars, alpha)
+        # Columns never answered in any shard have no range, as in a single pass
+        seen = self.mins <= self.maxs
+        ranges = np.where(seen, self.mins, np.nan), np.where(seen, self.maxs, np.nan)
+        edges = pattern_tercile_edges(self.patterns, ranges, SCALED_COLUMNS, REVERSE_ITEMS,
+                                      INDEX_DEFINITIONS, GROUP_INDEX)
+        return anova, self.reliability.results(), ranges, edges
+
+    def to_dict(self):
+        return {
+            'version': PARTIAL_VERSION,
+            'sources': self.sources,
+            'score_pairs': self.score_pairs,
+            'rows_seen': self.rows_seen,
+            'anova': None if self.anova is None else self.anova.to_dict(),
+            'mins': self.mins.tolist(),
+            'maxs': self.maxs.tolist(),
+            'reliability': self.reliability.to_dict(),
+            'patterns': None if self.patterns is None else {
+                'values': [list(key) if isinstance(key, tuple) else [key] for key in self.patterns.index],
+                'counts': self.patterns.tolist(),
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != PARTIAL_VERSION:
+            raise ValueError(f"Partial state version {data.get('version')} is not {PARTIAL_VERSION}")
+        state = cls(data['sources'], data['score_pairs'])
+        state.rows_seen = data['rows_seen']
+        state.anova = None if data['anova'] is None else OnlineAnova.from_dict(data['anova'])
+        state.mins = np.array(data['mins'], dtype=np.float64)
+        state.maxs = np.array(data['maxs'], dtype=np.float64)
+        state.reliability = ReliabilityAccumulator.from_dict(data['reliability'])
+        if data['patterns'] is not None:
+            index = pd.MultiIndex.from_tuples([tuple(v) for v in data['patterns']['values']],
+                                              names=group_items(INDEX_DEFINITIONS, GROUP_INDEX))
+            state.patterns = pd.Series(data['patterns']['counts'], index=index, dtype=np.float64)
+        return state
+
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+def map_shard(shard, output, score_pairs=False, chunk_rows=CHUNK_ROWS):
+    """Stream one shard into a ShardState and save it to ``output`` (runs in a worker)."""
+    state = ShardState([str(shard)], score_pairs)
+    for chunk in iter_chunks(shard, chunk_rows=chunk_rows):
+        state.update(map_ordinal(chunk, None))
+    state.save(output)
+    return str(output)
+
+
+def apply_shard(shard, output, ranges, edges, chunk_rows=CHUNK_ROWS):
+    """Write one shard's composite indices with the global scaling and tercile edges (runs in a worker)."""
+    output = Path(output)
+    output.unlink(missing_ok=True)
+    for chunk in iter_chunks(shard, chunk_rows=chunk_rows):
+        out = fused_scale_and_index(map_ordinal(chunk, None), ranges=ranges, group_edges=edges)
+        out.to_csv(output, mode='a', header=not output.exists(), index=False)
+    return str(output)
+
+
+def _run_jobs(function, jobs, workers):
+    """Results of ``function(*job)`` for every job, over ``workers`` processes (1: in-process)."""
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) <= 1:
+        return [function(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, *zip(*jobs)))
+
+
+def partial_path(directory, position, shard):
+    return Path(directory) / f"{position:03d}_{Path(shard).stem}.partial.json"
+
+
+def map_shards(shards, directory=PARTIAL_DIR, score_pairs=False, chunk_rows=CHUNK_ROWS, workers=None):
+    """Map every shard to a partial-state file in ``directory``; returns the partial paths in shard order."""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    jobs = [(shard, partial_path(directory, i, shard), score_pairs, chunk_rows) for i, shard in enumerate(shards)]
+    return _run_jobs(map_shard, jobs, workers)
+
+
+def reduce_partials(paths):
+    """Merge partial-state files, in order, into one ShardState."""
+    states = [ShardState.load(path) for path in paths]
+    merged = states[0]
+    for state in states[1:]:
+        merged.merge(state)
+    return merged
+
+
+def write_composite(state, ranges, edges, output, directory=PARTIAL_DIR, chunk_rows=CHUNK_ROWS, workers=None):
+    """Composite indices of every shard of ``state``, built in parallel and concatenated into ``output``."""
+    jobs = [(shard, Path(directory) / f"{i:03d}_{Path(shard).stem}.composite.csv", ranges, edges, chunk_rows)
+            for i, shard in enumerate(state.sources)]
+    parts = _run_jobs(apply_shard, jobs, workers)
+    with open(output, 'w', newline='') as target:
+        for i, part in enumerate(parts):
+            with open(part, newline='') as source:
+                if i:
+                    source.readline()  # every part repeats the header
+                shutil.copyfileobj(source, target)
+            Path(part).unlink()
+    return output
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Sharded map/reduce ANOVA, reliability and composite indices")
+    parser.add_argument('inputs', nargs='+', help="shards (CSV, Parquet or .scores bundles), or partial files with --reduce")
+    parser.add_argument('--map-only', action='store_true', help="only write the partial-state files")
+    parser.add_argument('--reduce', action='store_true', help="inputs are partial-state files to merge")
+    parser.add_argument('--partials-dir', default=PARTIAL_DIR, help="where partial states are written")
+    parser.add_argument('--workers', type=int, help="processes (default: one per CPU, at most one per shard)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="rows per streamed chunk of a shard")
+    parser.add_argument('--all-scores', action='store_true', help="also test every _Score column against every other")
+    parser.add_argument('--anova-output', default='anova_results.csv')
+    parser.add_argument('--reliability-output', default='reliability_results.csv')
+    parser.add_argument('--composite', metavar='CSV', nargs='?', const='composite_indices.csv',
+                        help="also build the composite indices of every shard (default: composite_indices.csv)")
+    args = parser.parse_args(argv)
+    if args.map_only and args.reduce:
+        parser.error("--map-only and --reduce are the two halves of a run; pass at most one")
+
+    if args.reduce:
+        partials = args.inputs
+    else:
+        partials = map_shards(args.inputs, args.partials_dir, args.all_scores, args.chunk_rows, args.workers)
+        print(f"🗂️  {len(partials)} shards mapped to partial states in {args.partials_dir}/")
+        if args.map_only:
+            return partials
+
+    state = reduce_partials(partials)
+    anova, reliability, ranges, edges = state.results()
+    anova.to_csv(args.anova_output, index=False)
+    forget_results(args.anova_output)
+    reliability.to_csv(args.reliability_output, index=False)
+    print(f"✅ {len(anova)} ANOVA tests over {state.rows_seen} responses from {len(state.sources)} shards "
+          f"saved to {args.anova_output}")
+    print(f"✅ Reliability of {reliability['Index'].nunique()} indices saved to {args.reliability_output}")
+    if args.composite:
+        write_composite(state, ranges, edges, args.composite, args.partials_dir, args.chunk_rows, args.workers)
+        print(f"✅ Composite indices saved to {args.composite} (tercile edges: {np.round(edges, 3)})")
+    return anova, reliability
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Stratified One-Way ANOVA for the IIT Internet Connectivity Study
+Repeats the one-way tests within every level of a stratifying variable
+(residence, academic year, device). Group sufficient statistics are
+accumulated keyed by (stratum, factor level) for all stratifying variables,
+factors and dependents in one blocked pass, and F, p and eta-squared of
+every stratum come from those arrays at once. Row ranges are spread over
+worker processes when the data is large enough to pay for them.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from anova_engine import BLOCK_ROWS, adjust_pvalues, factorize_levels, flatten_vars, oneway_from_stats
+
+STRATA = ['Residence_Score', 'Academic_Year_Score', 'Device_Capability_Score']
+# Below this many rows a worker process costs more than the rows it takes over
+PARALLEL_MIN_ROWS = 250_000
+PAIR_KEYS = ['Independent_Variable', 'Dependent_Variable']
+# Fewer residual degrees of freedom than this leave a stratum untested: a few
+# rows split over the factor levels give F = inf and eta-squared = 1
+MIN_DF_WITHIN = 5
+
+
+class StratifiedStats(NamedTuple):
+    """Sufficient statistics of several dependents per (stratum, factor level).
+
+    ``n``, ``s`` and ``ss`` have shape (strata, levels, dependents).
+    """
+    stratum: str
+    strata: np.ndarray
+    factor: str
+    levels: np.ndarray
+    dependents: list
+    n: np.ndarray
+    s: np.ndarray
+    ss: np.ndarray
+
+
+def accumulate_strata(codes, y, strata, factors, n_levels, block_rows=BLOCK_ROWS):
+    """Counts, sums and sums of squares of ``y`` per (stratum, factor level), in one blocked pass.
+
+    ``codes`` maps each column to its level codes (-1 for missing) and
+    ``n_levels`` to its number of levels. Each block builds one indicator
+    of all factors' levels, and every stratum multiplies it with its own
+    rows only, so the work does not grow with the number of strata.
+    Returns {stratum variable: array (stratum levels, all factor levels,
+    3 * dependents)} with factors in order; row ranges' results add up.
+    """
+    offsets = np.cumsum([0] + [n_levels[f] for f in factors])
+    totals = {stratum: np.zeros((n_levels[stratum], offsets[-1], 3 * y.shape[1])) for stratum in strata}
+    for start in range(0, len(y), block_rows):
+        block = y[start:start + block_rows].astype(np.float64)
+        valid = ~np.isnan(block)
+        block[~valid] = 0.0
+        stacked = np.concatenate([valid, block, block * block], axis=1)
+        rows = np.arange(len(block))
+        indicator = np.zeros((offsets[-1], len(block)))
+        for factor, offset in zip(factors, offsets):
+            factor_codes = codes[factor][start:start + block_rows]
+            present = factor_codes >= 0
+            indicator[offset + factor_codes[present], rows[present]] = 1.0
+        for stratum in strata:
+            stratum_codes = codes[stratum][start:start + block_rows]
+            for level in range(n_levels[stratum]):
+                selected = stratum_codes == level
+                totals[stratum][level] += indicator[:, selected] @ stacked[selected]
+    return totals
+
+
+def stratified_group_stats(df, strata, factors, dependents, block_rows=BLOCK_ROWS, workers=1):
+    """Stats of all ``dependents`` for every factor within every level of each of ``strata``.
+
+    One grouped aggregation covers every stratifying variable and factor,
+    keyed by (stratum, factor level). Rows with a missing stratum or factor
+    value are left out, and a stratifying variable is never a factor or
+    dependent of its own strata. With ``workers`` > 1 row ranges are
+    accumulated in separate processes and added. Returns a list of
+    StratifiedStats.
+    """
+    strata = list(dict.fromkeys(strata))
+    factors = list(dict.fromkeys(flatten_vars(factors)))
+    dependents = list(dict.fromkeys(flatten_vars(dependents)))
+    m = len(dependents)
+    coded = {col: factorize_levels(df[col]) for col in dict.fromkeys(strata + factors)}
+    codes = {col: c for col, (c, _) in coded.items()}
+    levels = {col: lv for col, (_, lv) in coded.items()}
+    n_levels = {col: len(lv) for col, lv in levels.items()}
+    y = df[dependents].to_numpy()
+
+    if workers <= 1:
+        totals = accumulate_strata(codes, y, strata, factors, n_levels, block_rows)
+    else:
+        bounds = np.linspace(0, len(df), workers + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(accumulate_strata, {col: c[lo:hi] for col, c in codes.items()}, y[lo:hi],
+                                   strata, factors, n_levels, block_rows)
+                       for lo, hi in zip(bounds[:-1], bounds[1:])]
+            parts = [future.result() for future in futures]
+        totals = {stratum: sum(part[stratum] for part in parts) for stratum in strata}
+
+    result = []
+    offsets = np.cumsum([0] + [n_levels[f] for f in factors])
+    for stratum in strata:
+        for factor, offset in zip(factors, offsets):
+            if factor == stratum:
+                continue
+            keep = [j for j, dep in enumerate(dependents) if dep not in (factor, stratum)]
+            block = totals[stratum][:, offset:offset + n_levels[factor]]
+            result.append(StratifiedStats(
+                stratum=stratum,
+                strata=levels[stratum],
+                factor=factor,
+                levels=levels[factor],
+                dependents=[dependents[j] for j in keep],
+                n=block[:, :, :m][:, :, keep],
+                s=block[:, :, m:2 * m][:, :, keep],
+                ss=block[:, :, 2 * m:][:, :, keep],
+            ))
+    return result
+
+
+def untested_reasons(res, min_df_within=MIN_DF_WITHIN):
+    """Why each test of ``oneway_from_stats`` output is not reported ('' where it is)."""
+    return np.select(
+        [res['df_between'] < 1, res['df_within'] < min_df_within, ~np.isfinite(res['F'])],
+        ['fewer than 2 groups', f'df_within < {min_df_within}', 'no within-group variance'],
+        default='')
+
+
+def stratified_frame(stats_list, alpha=0.05, min_df_within=MIN_DF_WITHIN):
+    """Long results table of StratifiedStats: one row per stratum × factor × dependent.
+
+    Cells with fewer than ``min_df_within`` residual degrees of freedom or
+    no within-group variance get NaN F, p and eta-squared, and the cause in
+    ``Untested_Reason``.
+    """
+    frames = []
+    for st in stats_list:
+        if not st.dependents:
+            continue
+        res = oneway_from_stats(st.n, st.s, st.ss)  # arrays of shape (strata, dependents)
+        reasons = untested_reasons(res, min_df_within)
+        for key in ('F', 'p', 'eta_squared'):
+            res[key] = np.where(reasons == '', res[key], np.nan)
+        strata, dependents = len(st.strata), len(st.dependents)
+        frames.append(pd.DataFrame({
+            'Stratum_Variable': st.stratum,
+            'Stratum': np.repeat(st.strata, dependents),
+            'Independent_Variable': st.factor,
+            'Dependent_Variable': np.tile(st.dependents, strata),
+            'F_statistic': res['F'].ravel(),
+            'P_value': res['p'].ravel(),
+            'Significant': res['p'].ravel() < alpha,
+            'Effect_Size': res['eta_squared'].ravel(),
+            'df_between': res['df_between'].ravel(),
+            'df_within': res['df_within'].ravel().astype(np.int64),
+            'N': res['N'].ravel().astype(np.int64),
+            'Untested_Reason': reasons.ravel(),
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def stratified_oneway(df, independent_vars, dependent_vars, strata=STRATA, pairs=None, alpha=0.05,
+                      workers=None, min_df_within=MIN_DF_WITHIN):
+    """One-way ANOVA of every factor × dependent pair within every stratum of each of ``strata``.
+
+    ``pairs`` optionally restricts the output to these (factor, dependent)
+    tuples. Strata too small to test (see ``stratified_frame``) are left out
+    of the Holm and Benjamini-Hochberg p-values added over the whole
+    table. The aggregation is split into row ranges over ``workers``
+    processes (default: one per CPU from PARALLEL_MIN_ROWS rows on, else
+    in-process).
+    """
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(df) >= PARALLEL_MIN_ROWS else 1
+    results = stratified_frame(stratified_group_stats(df, strata, independent_vars, dependent_vars,
+                                                      workers=workers), alpha, min_df_within)
+    if pairs is not None:
+        wanted = pd.MultiIndex.from_tuples(list(pairs))
+        results = results[pd.MultiIndex.from_frame(results[PAIR_KEYS]).isin(wanted)].reset_index(drop=True)
+    p_values = results['P_value'].to_numpy()
+    results['P_holm'] = adjust_pvalues(p_values, 'holm')
+    results['P_fdr_bh'] = adjust_pvalues(p_values, 'fdr_bh')
+    results['Significant_Holm'] = results['P_holm'] < alpha
+    results['Significant_BH'] = results['P_fdr_bh'] < alpha
+    return results
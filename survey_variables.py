@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Variable Categories for the IIT Internet Connectivity Study
+Shared by the analysis scripts so every tool tests the same pairs.
+"""
+
+# Define variable categories for different types of ANOVA
+independent_vars = {
+    'Demographics': ['Academic_Year_Score', 'Device_Capability_Score', 'Residence_Score'],
+    'Infrastructure': ['WiFi_Speed_Score', 'Reliability_Score', 'Peak_Performance_Score', 'Outage_Frequency_Score'],
+    'Usage_Patterns': ['Daily_Hours_Score', 'Alternative_Sources_Score', 'Schedule_Changes_Score', 'Download_Frequency_Score'],
+    'Spending': ['Monthly_Spending_Score']
+}
+
+dependent_vars = {
+    'Academic_Performance': ['Programming_Impact_Score', 'Collaboration_Score', 'LMS_Access_Score', 'Productivity_Influence_Score'],
+    'Performance_Issues': ['Task_Abandonment_Score', 'Time_Lost_Score'],
+    'Adaptation': ['Offpeak_Effectiveness_Score'],
+    'Future_Expectations': ['Future_Performance_Score']
+}
+
+# Ordinal scale of every mapped column (see explanation.txt, section 1.2):
+# survey question, then the answers in score order, so answers[i] maps to score i + 1
+SCORE_SCALES = {
+    'Academic_Year_Score': ('What is your current academic year?',
+                            ['First Year', 'Second Year', 'Third Year', 'Fourth Year']),
+    'Device_Capability_Score': ('What is your primary computing device capability?',
+                                ['Mobile device primarily', 'Laptop', 'Desktop (Lab only)']),
+    'Residence_Score': ('What is your primary residence during academic terms?',
+                        ['Shared apartment near campus', 'Family home', 'On-campus dormitory']),
+    'WiFi_Speed_Score': ('Rate typical IIT WiFi connection speed:',
+                         ['Very Poor (<5 Mbps)', 'Poor (5-10 Mbps)', 'Average (10-25 Mbps)', 'Good (25-50 Mbps)']),
+    'Reliability_Score': ('Rate IIT internet reliability throughout the day:',
+                          ['Unreliable (below 60%)', 'Moderately Reliable (60-85% uptime)',
+                           'Reliable (85-100% uptime)']),
+    'Peak_Performance_Score': ('Rate internet performance during peak hours (2-5 PM):',
+                               ['Significantly slower', 'Moderately slower', 'Slightly slower but usable',
+                                'No noticeable difference']),
+    'Outage_Frequency_Score': ('Frequency of complete internet outages during academic work:',
+                               ['Very Frequently (daily)', 'Frequently (3-5 times/week)',
+                                'Occasionally (1-2 times/week)', 'Rarely (1-2 times/month)', 'Never']),
+    'Programming_Impact_Score': ('Impact on programming assignment completion:',
+                                 ['Hinders', 'Neutral', 'Enhances']),
+    'Collaboration_Score': ('Impact on group project collaboration:',
+                            ['Hinders collaboration', 'Allows basic collaboration', 'Enables seamless collaboration']),
+    'Daily_Hours_Score': ('Hours per day of productive academic activities using IIT internet:',
+                          ['Less than 1 hour', '1-2 hours', '2-4 hours', '4-6 hours', 'More than 6 hours']),
+    'Task_Abandonment_Score': ('Times internet issues caused task abandonment (past month):',
+                               ['Very Frequently (>10 times)', 'Frequently (6-10 times)', 'Occasionally (3-5 times)',
+                                'Rarely (1-2 times)', 'Never']),
+    'Time_Lost_Score': ('Daily time lost due to connectivity issues:',
+                        ['More than 60 minutes', '31-60 minutes', '16-30 minutes', '1-15 minutes', '0 minutes']),
+    'Alternative_Sources_Score': ('Frequency of using alternative internet sources:',
+                                  ['Never', 'Rarely', 'Occasionally', 'Frequently']),
+    'LMS_Access_Score': ('Impact on LMS(google classroom) access:',
+                         ['Often slow or inaccessible', 'Sometimes slow but manageable', 'Usually accessible',
+                          'Always accessible, fast']),
+    'Monthly_Spending_Score': ('Monthly spending on backup internet (BDT):',
+                               ['0 BDT', '1-500 BDT', '501-1000 BDT']),
+    'Schedule_Changes_Score': ('Frequency of changing study schedule due to connectivity:',
+                               ['Never', 'Rarely', 'Occasionally', 'Frequently']),
+    'Offpeak_Effectiveness_Score': ('Effectiveness of working during off-peak hours:',
+                                    ['Not Very Effective', 'Somewhat Effective', 'Very Effective']),
+    'Download_Frequency_Score': ('Frequency of downloading materials in advance for offline work:',
+                                 ['Rarely', 'Occasionally', 'Frequently', 'Always']),
+    'Productivity_Influence_Score': ('Percentage of academic productivity influenced by internet connectivity:',
+                                     ['Not Influenced (0-10%)', 'Slightly Influenced (11-25%)',
+                                      'Moderately Influenced (26-50%)', 'Highly Influenced (51-75%)',
+                                      'Extremely Influenced (76-100%)']),
+    'Future_Performance_Score': ('If IIT doubled WiFi speed in the future, predict how your academic performance '
+                                 'would change:',
+                                 ['No improvement (0-10% better)', 'Slightly improved (11-25%)',
+                                  'Moderate improvement (26-50% better)', 'Significant improvement (51-75% better)',
+                                  'Extremely Influenced (76-100%)']),
+}
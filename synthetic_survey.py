@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Synthetic Survey Responses for Scaling Tests
+Generates any number of responses with the same 20 _Score columns and
+ordinal ranges as comprehensive_anova_data.csv. Each column follows the
+answer frequencies of the real survey; outcomes are driven by a latent
+normal variable, so the strength of every factor → outcome relationship can
+be set as a standardized effect.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from survey_variables import SCORE_SCALES
+
+SAMPLE_FILE = Path(__file__).with_name('comprehensive_anova_data.csv')
+
+# Standardized latent effects mirroring the strongest findings of the real survey
+DEFAULT_EFFECTS = {
+    ('WiFi_Speed_Score', 'Task_Abandonment_Score'): 0.6,
+    ('WiFi_Speed_Score', 'Time_Lost_Score'): 0.45,
+    ('Peak_Performance_Score', 'Time_Lost_Score'): 0.35,
+    ('Peak_Performance_Score', 'Task_Abandonment_Score'): 0.3,
+}
+
+
+def answer_frequencies(sample=SAMPLE_FILE):
+    """{column: probabilities of scores 1..k} from the real responses, add-one smoothed.
+
+    Falls back to uniform answers when the sample file is not available.
+    """
+    data = pd.read_csv(sample) if Path(sample).exists() else None
+    frequencies = {}
+    for column, (_, answers) in SCORE_SCALES.items():
+        counts = np.ones(len(answers))
+        if data is not None and column in data:
+            values = data[column].dropna().astype(int)
+            counts += np.bincount(values - 1, minlength=len(answers))[:len(answers)]
+        frequencies[column] = counts / counts.sum()
+    return frequencies
+
+
+def _draw(rng, probabilities, size):
+    """Scores 1..k with the given probabilities, as int8."""
+    # Rounding can leave the cumulative sum just below 1; keep draws above it on the top score
+    codes = np.minimum(np.searchsorted(np.cumsum(probabilities), rng.random(size), side='right'),
+                       len(probabilities) - 1)
+    return (codes + 1).astype(np.int8)
+
+
+def _standardize(scores, probabilities):
+    levels = np.arange(1, len(probabilities) + 1)
+    mean = probabilities @ levels
+    sd = np.sqrt(probabilities @ (levels - mean) ** 2)
+    return (scores - mean) / sd
+
+
+def generate_responses(n_rows, effects=None, seed=0, missing_rate=0.0, as_text=False, frequencies=None):
+    """Generate ``n_rows`` synthetic responses as a DataFrame of int8 scores.
+
+    ``effects`` maps (factor, outcome) to a standardized latent weight; the
+    weights into one outcome must have squares summing below 1. Outcomes keep
+    their real answer frequencies. ``missing_rate`` blanks that share of
+    cells (the columns become float32 with NaN). With ``as_text`` the columns
+    are categoricals of the original answer strings instead of scores.
+    """
+    effects = DEFAULT_EFFECTS if effects is None else effects
+    frequencies = answer_frequencies() if frequencies is None else frequencies
+    rng = np.random.default_rng(seed)
+
+    drivers = {}
+    for (factor, outcome), weight in effects.items():
+        drivers.setdefault(outcome, []).append((factor, weight))
+    for outcome, weights in drivers.items():
+        if sum(weight ** 2 for _, weight in weights) >= 1:
+            raise ValueError(f"Effects into {outcome} explain all of its variance; lower them")
+        if any(factor in drivers for factor, _ in weights):
+            raise ValueError(f"Effects into {outcome} come from another outcome; only one level is supported")
+
+    data = {}
+    for column in SCORE_SCALES:
+        if column not in drivers:
+            data[column] = _draw(rng, frequencies[column], n_rows)
+    for outcome, weights in drivers.items():
+        latent = rng.standard_normal(n_rows)
+        latent *= np.sqrt(1 - sum(weight ** 2 for _, weight in weights))
+        for factor, weight in weights:
+            latent += weight * _standardize(data[factor], frequencies[factor])
+        # Cut the latent normal at the answer-frequency quantiles
+        cuts = stats.norm.ppf(np.cumsum(frequencies[outcome])[:-1])
+        data[outcome] = (np.searchsorted(cuts, latent) + 1).astype(np.int8)
+
+    df = pd.DataFrame({column: data[column] for column in SCORE_SCALES})
+    if missing_rate > 0:
+        df = df.astype(np.float32).mask(rng.random(df.shape) < missing_rate)
+    if as_text:
+        for column, (_, answers) in SCORE_SCALES.items():
+            codes = df[column].fillna(0).to_numpy().astype(np.int8) - 1
+            df[column] = pd.Categorical.from_codes(codes, categories=answers)
+    return df
+
+
+def parse_effect(text):
+    """'FACTOR:OUTCOME=WEIGHT' → ((factor, outcome), weight)."""
+    pair, weight = text.split('=')
+    factor, outcome = pair.split(':')
+    return (factor, outcome), float(weight)
+
+
+def main():
+    from score_store import BUNDLE_SUFFIX, write_scores
+
+    parser = argparse.ArgumentParser(description="Generate synthetic survey responses")
+    parser.add_argument('rows', type=int, help="number of responses")
+    parser.add_argument('-o', '--output', help=f"CSV, .parquet or {BUNDLE_SUFFIX} bundle (default: synthetic_<rows>.csv)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--missing', type=float, default=0.0, help="share of cells left unanswered")
+    parser.add_argument('--effect', action='append', type=parse_effect, metavar='FACTOR:OUTCOME=WEIGHT',
+                        help="standardized effect (repeatable); replaces the default effects")
+    parser.add_argument('--text', action='store_true', help="write the original answer strings instead of scores")
+    args = parser.parse_args()
+
+    effects = dict(args.effect) if args.effect else None
+    df = generate_responses(args.rows, effects, args.seed, args.missing, args.text)
+    output = Path(args.output or f"synthetic_{args.rows}.csv")
+    if output.suffix == '.csv':
+        df.to_csv(output, index=False)
+    else:
+        write_scores(df, output)
+    print(f"✅ {len(df)} synthetic responses × {df.shape[1]} columns written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The analysis scripts live at the repository root
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope='session')
+def survey():
+    return pd.read_csv(ROOT / 'comprehensive_anova_data.csv')
+
+
+@pytest.fixture
+def likert():
+    """800 random 1-5 answers with missing values: four factors and three dependents."""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        'Factor_A': rng.integers(1, 4, 800),
+        'Factor_B': rng.integers(1, 6, 800),
+        'Factor_C': rng.choice([1, 2], 800, p=[0.97, 0.03]),
+        'Factor_D': rng.integers(1, 13, 800),
+        'Outcome_X': rng.integers(1, 6, 800),
+        'Outcome_Y': rng.integers(1, 4, 800),
+        'Outcome_Z': rng.integers(1, 6, 800),
+    }).astype(np.float64)
+    df['Outcome_X'] += (df['Factor_A'] == 3)  # one real effect
+    for col in df.columns:
+        df.loc[rng.random(len(df)) < 0.05, col] = np.nan
+    return df
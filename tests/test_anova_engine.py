@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from anova_engine import adjust_pvalues, batch_oneway, cross_product_corr, flatten_vars
+from survey_variables import dependent_vars, independent_vars
+
+
+def scipy_oneway(df, factor, dependent):
+    data = df[[factor, dependent]].dropna()
+    groups = [group[dependent].to_numpy() for _, group in data.groupby(factor)]
+    return stats.f_oneway(*groups)
+
+
+def check_against_scipy(df, factors, dependents):
+    results = batch_oneway(df, factors, dependents)
+    assert len(results) == len(flatten_vars(factors)) * len(flatten_vars(dependents))
+    for row in results.itertuples():
+        reference = scipy_oneway(df, row.Independent_Variable, row.Dependent_Variable)
+        assert row.F_statistic == pytest.approx(reference.statistic, rel=1e-10)
+        assert row.P_value == pytest.approx(reference.pvalue, rel=1e-9, abs=1e-300)
+
+
+def test_survey_matches_f_oneway(survey):
+    check_against_scipy(survey, independent_vars, dependent_vars)
+
+
+def test_missing_values_match_f_oneway(likert):
+    check_against_scipy(likert, ['Factor_A', 'Factor_B', 'Factor_C', 'Factor_D'],
+                        ['Outcome_X', 'Outcome_Y', 'Outcome_Z'])
+
+
+def test_eta_squared(likert):
+    results = batch_oneway(likert, ['Factor_A'], ['Outcome_X'])
+    data = likert[['Factor_A', 'Outcome_X']].dropna()
+    means = data.groupby('Factor_A')['Outcome_X'].transform('mean')
+    y = data['Outcome_X']
+    expected = ((means - y.mean()) ** 2).sum() / ((y - y.mean()) ** 2).sum()
+    assert results['Effect_Size'].iloc[0] == pytest.approx(expected, rel=1e-12)
+
+
+def holm_reference(p):
+    order = np.argsort(p)
+    adjusted = np.empty_like(p)
+    running = 0.0
+    for rank, i in enumerate(order):
+        running = max(running, (len(p) - rank) * p[i])
+        adjusted[i] = min(running, 1.0)
+    return adjusted
+
+
+def test_adjust_pvalues():
+    p = np.random.default_rng(3).random(200) ** 3
+    p[[5, 17]] = p[4]  # ties
+    np.testing.assert_allclose(adjust_pvalues(p, 'holm'), holm_reference(p), rtol=1e-14)
+    np.testing.assert_allclose(adjust_pvalues(p, 'fdr_bh'), stats.false_discovery_control(p), rtol=1e-14)
+
+
+def test_adjust_pvalues_skips_nan():
+    p = np.array([0.01, np.nan, 0.04, 0.03])
+    finite = ~np.isnan(p)
+    for method, reference in (('holm', holm_reference), ('fdr_bh', stats.false_discovery_control)):
+        adjusted = adjust_pvalues(p, method)
+        assert np.isnan(adjusted[1])
+        np.testing.assert_allclose(adjusted[finite], reference(p[finite]), rtol=1e-14)
+    with pytest.raises(ValueError):
+        adjust_pvalues(p, 'bonferroni')
+
+
+def test_cross_product_corr_matches_pairwise_pandas(likert):
+    columns = list(likert.columns)
+    expected = likert.corr()
+    np.testing.assert_allclose(cross_product_corr(likert, columns, block_rows=97), expected, rtol=1e-10, atol=1e-12)
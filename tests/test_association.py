@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from association import MAX_LEVELS, associations
+
+
+def reference(df, a, b):
+    data = df[[a, b]].dropna()
+    table = pd.crosstab(data[a], data[b]).to_numpy()
+    chi2 = stats.chi2_contingency(table, correction=False)
+    return {
+        'Spearman_rho': stats.spearmanr(data[a], data[b]).statistic,
+        'Kendall_Tau_b': stats.kendalltau(data[a], data[b]).statistic,
+        'Kendall_P': stats.kendalltau(data[a], data[b]).pvalue,
+        'Cramers_V': stats.contingency.association(table, method='cramer'),
+        'Chi2_P': chi2.pvalue,
+        'N': len(data),
+    }
+
+
+def check(df, results):
+    for row in results.to_dict('records'):
+        expected = reference(df, row['Variable_1'], row['Variable_2'])
+        for stat, value in expected.items():
+            assert row[stat] == pytest.approx(value, rel=1e-9, abs=1e-12), (row['Variable_1'], row['Variable_2'], stat)
+
+
+def test_survey_matches_scipy(survey):
+    columns = ['WiFi_Speed_Score', 'Time_Lost_Score', 'Reliability_Score', 'Outage_Frequency_Score']
+    check(survey, associations(survey, columns))
+
+
+def test_columns_with_max_levels(likert):
+    # Regression: one-byte level codes overflowed x * width for 11 and 12 levels
+    rng = np.random.default_rng(11)
+    likert['Twelve_Score'] = rng.integers(1, MAX_LEVELS + 1, len(likert)).astype(np.float64)
+    likert['Eleven_Score'] = rng.integers(1, MAX_LEVELS, len(likert)).astype(np.float64)
+    likert.loc[rng.random(len(likert)) < 0.05, 'Twelve_Score'] = np.nan
+    assert likert['Factor_D'].nunique() == MAX_LEVELS
+    columns = ['Twelve_Score', 'Eleven_Score', 'Factor_D', 'Outcome_X']
+    results = associations(likert, columns)
+    assert len(results) == 6
+    assert results['Cramers_V'].notna().all()
+    check(likert, results)
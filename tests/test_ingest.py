@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from ingest import ingest, main
+from survey_variables import SCORE_SCALES
+
+
+@pytest.fixture
+def export(survey, tmp_path):
+    """The shipped scores written back as the form's raw answers, with one unknown answer."""
+    raw = pd.DataFrame({
+        question: [answers[int(score) - 1] if score == score else None for score in survey[column]]
+        for column, (question, answers) in SCORE_SCALES.items()
+    })
+    path = tmp_path / 'export.csv'
+    raw.to_csv(path, index=False)
+    return path, raw
+
+
+def test_round_trip(survey, export, tmp_path):
+    path, _ = export
+    rows, unmapped, unknown = ingest(path, tmp_path / 'scores.csv')
+    assert (rows, unmapped, unknown) == (len(survey), {}, [])
+    scores = pd.read_csv(tmp_path / 'scores.csv')
+    pd.testing.assert_frame_equal(scores, survey[list(SCORE_SCALES)], check_dtype=False)
+
+
+def test_strict_leaves_output_unchanged(export, tmp_path):
+    path, raw = export
+    raw.iloc[0, 0] = 'Not an answer'
+    raw.to_csv(path, index=False)
+    output = tmp_path / 'scores.csv'
+    output.write_text('previous\n')
+    with pytest.raises(SystemExit):
+        main([str(path), '-o', str(output), '--strict'])
+    assert output.read_text() == 'previous\n'
+    assert set(tmp_path.iterdir()) == {path, output}
+
+    main([str(path), '-o', str(output)])
+    assert pd.read_csv(output).iloc[0].isna().iloc[0]
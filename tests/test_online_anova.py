@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from anova_engine import batch_oneway
+from online_anova import OnlineAnova
+
+FACTORS = ['Factor_A', 'Factor_B', 'Factor_C', 'Factor_D']
+DEPENDENTS = ['Outcome_X', 'Outcome_Y', 'Outcome_Z']
+PAIR = ['Independent_Variable', 'Dependent_Variable']
+
+
+def assert_same_results(results, expected):
+    results = results.sort_values(PAIR).reset_index(drop=True)
+    expected = expected.sort_values(PAIR).reset_index(drop=True)
+    pd.testing.assert_frame_equal(results[PAIR], expected[PAIR])
+    for column in ('F_statistic', 'P_value', 'Effect_Size'):
+        np.testing.assert_allclose(results[column], expected[column], rtol=1e-10, atol=1e-300)
+
+
+def test_chunked_update_matches_batch(likert):
+    acc = OnlineAnova(FACTORS, DEPENDENTS)
+    for chunk in np.array_split(np.arange(len(likert)), 7):
+        acc.update(likert.iloc[chunk])
+    assert acc.rows_seen == len(likert)
+    assert_same_results(acc.results(), batch_oneway(likert, FACTORS, DEPENDENTS))
+
+
+def test_merge_matches_single_pass(likert):
+    # Split so that the second part sees Factor_D levels the first never did
+    first = likert[likert['Factor_D'] <= 6]
+    second = likert[~(likert['Factor_D'] <= 6)]
+    left = OnlineAnova(FACTORS, DEPENDENTS).update(first)
+    right = OnlineAnova(FACTORS, DEPENDENTS).update(second)
+    merged = left.merge(right)
+    single = OnlineAnova(FACTORS, DEPENDENTS).update(likert)
+    assert merged.rows_seen == single.rows_seen
+    assert_same_results(merged.results(), single.results())
+
+
+def test_merge_rejects_different_variables(likert):
+    with pytest.raises(ValueError):
+        OnlineAnova(FACTORS, DEPENDENTS).merge(OnlineAnova(FACTORS[:2], DEPENDENTS))
+
+
+def test_save_load_factor_without_levels(likert, tmp_path):
+    first = likert.copy()
+    first['Factor_C'] = np.nan  # no level of Factor_C answered yet
+    acc = OnlineAnova(FACTORS, DEPENDENTS).update(first)
+    acc.save(tmp_path / 'state.json')
+
+    loaded = OnlineAnova.load(tmp_path / 'state.json')
+    assert loaded.state['Factor_C']['n'].shape == (0, len(DEPENDENTS))
+    assert_same_results(loaded.results(), acc.results())
+
+    loaded.update(likert)
+    assert_same_results(loaded.results(), OnlineAnova(FACTORS, DEPENDENTS).update(first).update(likert).results())
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from anova_engine import group_stats
+from posthoc import studentized_range_ppf, studentized_range_sf, tukey_from_stats
+
+GROUPS = [2, 3, 5, 8, 12]
+DEGREES = [2, 5, 20, 120, 10_000, 99_999, 1_000_000]
+Q = np.array([0.2, 0.5, 1.0, 2.0, 3.0, 4.0, 5.0, 6.5, 8.0, 12.0])
+
+
+@pytest.mark.parametrize('df', DEGREES)
+@pytest.mark.parametrize('k', GROUPS)
+def test_studentized_range_sf(k, df):
+    np.testing.assert_allclose(studentized_range_sf(Q, k, df), stats.studentized_range.sf(Q, k, df),
+                               rtol=0, atol=1e-8)
+
+
+@pytest.mark.parametrize('df', DEGREES)
+@pytest.mark.parametrize('k', [2, 5, 12])
+def test_studentized_range_ppf(k, df):
+    assert studentized_range_ppf(0.95, k, float(df)) == pytest.approx(
+        stats.studentized_range.ppf(0.95, k, df), rel=1e-8)
+
+
+def test_tukey_matches_scipy(survey):
+    gs = group_stats(survey, 'WiFi_Speed_Score', ['Time_Lost_Score'])
+    res = tukey_from_stats(gs.n[:, 0], gs.s[:, 0], gs.ss[:, 0])
+    data = survey[['WiFi_Speed_Score', 'Time_Lost_Score']].dropna()
+    samples = [group['Time_Lost_Score'].to_numpy() for _, group in data.groupby('WiFi_Speed_Score')]
+    reference = stats.tukey_hsd(*samples)
+    interval = reference.confidence_interval(0.95)
+    for pair, (i, j) in enumerate(zip(res['i'], res['j'])):
+        # scipy reports mean_i - mean_j; tukey_from_stats reports mean_j - mean_i
+        assert res['diff'][pair] == pytest.approx(-reference.statistic[i, j], rel=1e-12)
+        assert res['p'][pair] == pytest.approx(reference.pvalue[i, j], abs=1e-8)
+        assert res['ci_low'][pair] == pytest.approx(-interval.high[i, j], rel=1e-8)
+        assert res['ci_high'][pair] == pytest.approx(-interval.low[i, j], rel=1e-8)
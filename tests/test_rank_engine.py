@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from rank_engine import kruskal_wallis, welch_anova
+from survey_variables import dependent_vars, independent_vars
+
+FACTORS = ['Factor_A', 'Factor_B', 'Factor_C', 'Factor_D']
+OUTCOMES = ['Outcome_X', 'Outcome_Y', 'Outcome_Z']
+
+
+def samples(df, factor, dependent):
+    data = df[[factor, dependent]].dropna()
+    return [group[dependent].to_numpy() for _, group in data.groupby(factor)]
+
+
+@pytest.mark.parametrize('data', ['survey', 'likert'])
+def test_kruskal_matches_scipy(data, request):
+    df = request.getfixturevalue(data)
+    factors, dependents = (independent_vars, dependent_vars) if data == 'survey' else (FACTORS, OUTCOMES)
+    results = kruskal_wallis(df, factors, dependents)
+    assert len(results)
+    for row in results.itertuples():
+        groups = samples(df, row.Independent_Variable, row.Dependent_Variable)
+        reference = stats.kruskal(*groups)
+        assert row.F_statistic == pytest.approx(reference.statistic, rel=1e-10)
+        assert row.P_value == pytest.approx(reference.pvalue, rel=1e-9)
+        assert row.df_between == len(groups) - 1
+
+
+def test_welch_matches_scipy(likert):
+    results = welch_anova(likert, FACTORS, OUTCOMES)
+    assert len(results) == len(FACTORS) * len(OUTCOMES)
+    for row in results.itertuples():
+        reference = stats.f_oneway(*samples(likert, row.Independent_Variable, row.Dependent_Variable),
+                                   equal_var=False)
+        assert row.F_statistic == pytest.approx(reference.statistic, rel=1e-10)
+        assert row.P_value == pytest.approx(reference.pvalue, rel=1e-9)
+
+
+def test_welch_undefined_for_singleton_or_constant_groups():
+    df = pd.DataFrame({'Factor': [1, 1, 1, 2, 2, 2, 3],
+                       'Varied': [1.0, 2.0, 4.0, 2.0, 5.0, 3.0, 4.0],
+                       'Constant': [1.0, 2.0, 4.0, 3.0, 3.0, 3.0, np.nan]})
+    results = welch_anova(df, ['Factor'], ['Varied', 'Constant'])
+    assert results[['F_statistic', 'P_value']].isna().all().all()
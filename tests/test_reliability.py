@@ -0,0 +1,93 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bootstrap import resample_counts
+from reliability import ReliabilityAccumulator, bootstrap_alpha
+from scaling_pipeline import INDEX_DEFINITIONS, SCALED_COLUMNS, fused_scale_and_index
+
+
+@pytest.fixture
+def responses():
+    """1-5 answers to every scaled question, driven by one shared trait so alpha is well above zero."""
+    rng = np.random.default_rng(11)
+    trait = rng.normal(size=(1200, 1))
+    noise = rng.normal(size=(1200, len(SCALED_COLUMNS)))
+    return pd.DataFrame(np.clip(np.round(3 + trait + noise), 1, 5), columns=SCALED_COLUMNS)
+
+
+def with_missing(df, rate=0.05, seed=3):
+    rng = np.random.default_rng(seed)
+    return df.mask(rng.random(df.shape) < rate)
+
+
+def alpha_from_cov(cov):
+    k = len(cov)
+    return k / (k - 1) * (1 - np.trace(cov) / cov.sum())
+
+
+def direct_statistics(items):
+    """Alpha, corrected item-total r and alpha-if-deleted straight from the complete item rows."""
+    items = items.dropna()
+    total = items.sum(axis=1)
+    item_total = [items[c].corr(total - items[c]) for c in items]
+    deleted = [alpha_from_cov(items.drop(columns=c).cov().to_numpy()) for c in items]
+    return alpha_from_cov(items.cov().to_numpy()), item_total, deleted, len(items)
+
+
+def test_complete_data_matches_direct(responses):
+    results = ReliabilityAccumulator().update(responses).results()
+    scaled = fused_scale_and_index(responses)
+    for definition in INDEX_DEFINITIONS:
+        rows = results[results['Index'] == definition.name]
+        alpha, item_total, deleted, n = direct_statistics(scaled[definition.items])
+        assert rows['Cronbach_Alpha'].iloc[0] == pytest.approx(alpha, rel=1e-10)
+        np.testing.assert_allclose(rows['Corrected_Item_Total'], item_total, rtol=1e-10)
+        np.testing.assert_allclose(rows['Alpha_If_Deleted'], deleted, rtol=1e-10)
+        np.testing.assert_allclose(rows['Item_Mean'], scaled[definition.items].mean(), rtol=1e-12)
+        assert (rows['N'] == n).all()
+
+
+def test_missing_data_uses_pairwise_deletion(responses):
+    df = with_missing(responses)
+    results = ReliabilityAccumulator().update(df).results()
+    scaled = fused_scale_and_index(df)
+    for definition in INDEX_DEFINITIONS:
+        rows = results[results['Index'] == definition.name]
+        items = scaled[definition.items]
+        # DataFrame.cov uses each pair's complete rows; N is the smallest of those counts
+        pairwise_n = items.notna().astype(int).T @ items.notna().astype(int)
+        assert rows['Cronbach_Alpha'].iloc[0] == pytest.approx(alpha_from_cov(items.cov().to_numpy()), rel=1e-10)
+        assert (rows['N'] == pairwise_n.to_numpy().min()).all()
+        assert rows['N'].iloc[0] > direct_statistics(items)[3]
+
+
+def test_merge_matches_single_pass(responses):
+    df = with_missing(responses)
+    merged = ReliabilityAccumulator().update(df.iloc[:500]).merge(ReliabilityAccumulator().update(df.iloc[500:]))
+    single = ReliabilityAccumulator().update(df)
+    assert merged.rows_seen == single.rows_seen
+    pd.testing.assert_frame_equal(merged.results(), single.results(), rtol=1e-10)
+
+
+def test_json_round_trip(responses, tmp_path):
+    acc = ReliabilityAccumulator().update(with_missing(responses))
+    restored = ReliabilityAccumulator.from_dict(json.loads(json.dumps(acc.to_dict())))
+    pd.testing.assert_frame_equal(restored.results(), acc.results())
+    acc.save(tmp_path / 'state.json')
+    loaded = ReliabilityAccumulator.load(tmp_path / 'state.json')
+    pd.testing.assert_frame_equal(loaded.update(responses).results(), acc.update(responses).results())
+
+
+def test_bootstrap_alpha_matches_resampled_rows(responses):
+    df = responses.iloc[:300]
+    acc = ReliabilityAccumulator().update(df)
+    intervals = bootstrap_alpha(df, acc, n_boot=40, method='percentile', seed=5)
+    scaled = fused_scale_and_index(df)
+    weights = np.concatenate(list(resample_counts(len(df), 40, seed=5))).astype(int)
+    for definition in INDEX_DEFINITIONS:
+        items = scaled[definition.items].to_numpy()
+        boot = [alpha_from_cov(np.cov(np.repeat(items, w, axis=0), rowvar=False)) for w in weights]
+        np.testing.assert_allclose(intervals[definition.name], np.quantile(boot, [0.025, 0.975]), rtol=1e-9)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scaling_pipeline import INDEX_DEFINITIONS, REVERSE_ITEMS, SCALED_COLUMNS, fused_scale_and_index
+
+
+def rescale_1to5(series):
+    """new-type/build_indices.py's row-wise reference."""
+    s_min, s_max = series.min(), series.max()
+    if pd.isna(s_min) or s_min == s_max:
+        return pd.Series([3.0] * len(series), index=series.index)
+    return (series - s_min) / (s_max - s_min) * 4 + 1
+
+
+def reference_indices(df):
+    df = df.copy()
+    for col in SCALED_COLUMNS:
+        df[col] = rescale_1to5(df[col])
+    for col in REVERSE_ITEMS:
+        df[f"{col}_R"] = 6 - df[col]
+    for definition in INDEX_DEFINITIONS:
+        df[definition.name] = df.apply(lambda row: row[definition.items].dropna().mean(), axis=1)
+    return df
+
+
+def with_missing(df, rate, seed):
+    return df.mask(np.random.default_rng(seed).random(df.shape) < rate)
+
+
+@pytest.mark.parametrize('missing', [0.0, 0.15])
+def test_bit_identical_to_reference(survey, missing):
+    df = with_missing(survey, missing, seed=1)
+    expected = reference_indices(df)
+    got = fused_scale_and_index(df)
+    columns = SCALED_COLUMNS + [f"{col}_R" for col in REVERSE_ITEMS] + [d.name for d in INDEX_DEFINITIONS]
+    np.testing.assert_array_equal(got[columns].to_numpy(), expected[columns].to_numpy(dtype=np.float64))
+
+
+def test_constant_column_is_centred(survey):
+    df = survey.assign(WiFi_Speed_Score=4.0)
+    df.loc[0, 'WiFi_Speed_Score'] = np.nan
+    assert (fused_scale_and_index(df)['WiFi_Speed_Score'] == 3.0).all()
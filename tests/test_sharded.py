@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from anova_engine import annotate_sweep, batch_oneway, sweep_variables
+from reliability import ReliabilityAccumulator
+from scaling_pipeline import fused_scale_and_index
+from sharded import ShardState, map_shards, reduce_partials, write_composite
+from survey_variables import dependent_vars, independent_vars
+from synthetic_survey import generate_responses
+
+PAIR = ['Independent_Variable', 'Dependent_Variable']
+
+
+def test_shards_match_single_process(tmp_path):
+    full = generate_responses(3000, seed=1, missing_rate=0.03).astype(np.float64)
+    shards = []
+    for i, (lo, hi) in enumerate([(0, 400), (400, 2100), (2100, 3000)]):
+        shards.append(tmp_path / f"shard{i}.csv")
+        full.iloc[lo:hi].to_csv(shards[-1], index=False)
+
+    partials = map_shards(shards, tmp_path / 'partials', chunk_rows=700, workers=1)
+    reduce_partials(partials).save(tmp_path / 'merged.json')
+    state = ShardState.load(tmp_path / 'merged.json')
+    assert state.rows_seen == len(full)
+    anova, reliability, ranges, edges = state.results()
+
+    factors, dependents = sweep_variables(full.columns, independent_vars, dependent_vars)
+    expected = annotate_sweep(batch_oneway(full, factors, dependents), independent_vars, dependent_vars)
+    anova = anova.sort_values(PAIR).reset_index(drop=True)
+    expected = expected.sort_values(PAIR).reset_index(drop=True)
+    pd.testing.assert_frame_equal(anova[PAIR + ['N', 'df_within']], expected[PAIR + ['N', 'df_within']])
+    for column in ('F_statistic', 'P_value', 'Effect_Size', 'P_holm', 'P_fdr_bh'):
+        np.testing.assert_allclose(anova[column], expected[column], rtol=1e-10)
+
+    pd.testing.assert_frame_equal(reliability, ReliabilityAccumulator().update(full).results(), rtol=1e-10)
+
+    output = write_composite(state, ranges, edges, tmp_path / 'composite.csv', tmp_path / 'partials', workers=1)
+    composite = pd.read_csv(output)
+    single = fused_scale_and_index(full)
+    single['Connectivity_Group'] = single['Connectivity_Group'].astype(str)
+    pd.testing.assert_frame_equal(composite, single, check_dtype=False, rtol=1e-12)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from anova_engine import batch_oneway
+from stratified_anova import MIN_DF_WITHIN, stratified_oneway
+
+
+def test_strata_match_batch_oneway(likert):
+    results = stratified_oneway(likert, ['Factor_A', 'Factor_B'], ['Outcome_X', 'Outcome_Z'],
+                                strata=['Factor_D'], workers=1)
+    for level, rows in likert.groupby('Factor_D'):
+        expected = batch_oneway(rows, ['Factor_A', 'Factor_B'], ['Outcome_X', 'Outcome_Z'])
+        got = results[results['Stratum'] == level].reset_index(drop=True)
+        np.testing.assert_allclose(got['F_statistic'], expected['F_statistic'], rtol=1e-10)
+        np.testing.assert_allclose(got['P_value'], expected['P_value'], rtol=1e-9)
+        assert (got['Untested_Reason'] == '').all()
+
+
+def test_degenerate_stratum_is_not_tested(likert):
+    # Stratum 2 holds three rows, one per factor level and one residual df: F = inf, eta-squared = 1
+    tiny = pd.DataFrame({'Stratum': 2.0, 'Factor_A': [1.0, 2.0, 2.0], 'Outcome_X': [1.0, 5.0, 5.0]})
+    df = pd.concat([likert.assign(Stratum=1.0), tiny], ignore_index=True)
+    results = stratified_oneway(df, ['Factor_A'], ['Outcome_X'], strata=['Stratum'], workers=1)
+
+    small = results[results['Stratum'] == 2].iloc[0]
+    assert small['df_within'] < MIN_DF_WITHIN
+    assert small['Untested_Reason'] == f'df_within < {MIN_DF_WITHIN}'
+    assert np.isnan(small[['F_statistic', 'P_value', 'Effect_Size', 'P_holm', 'P_fdr_bh']].astype(float)).all()
+    assert not small[['Significant', 'Significant_Holm', 'Significant_BH']].any()
+
+    large = results[results['Stratum'] == 1].iloc[0]
+    assert large['Untested_Reason'] == ''
+    assert large['P_holm'] == pytest.approx(large['P_value'])  # the only test left in the family
+
+
+def test_no_within_group_variance_is_not_tested():
+    df = pd.DataFrame({'Stratum': 1.0, 'Factor': np.repeat([1.0, 2.0], 10), 'Outcome': np.repeat([2.0, 4.0], 10)})
+    results = stratified_oneway(df, ['Factor'], ['Outcome'], strata=['Stratum'], workers=1)
+    assert results['Untested_Reason'].tolist() == ['no within-group variance']
+    assert results['P_value'].isna().all()
@@ -2,231 +2,412 @@
 """
 Visualization of ANOVA Results for IIT Internet Connectivity Study
 Creates comprehensive visualizations of the ANOVA analysis findings
+
+Every panel is a separate drawing function, so the nine panels can be drawn
+into the classic 3×3 figure or rendered as independent Agg figures in a
+process pool (``--panels DIR``), together with a box plot for every
+significant pair. Panel mode skips every panel whose inputs hash to the
+same value as in the last run and can tile the panels into the composite.
 """
 
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
-def create_anova_visualizations():
-    """Create comprehensive visualizations of ANOVA results"""
-    
-    # Load the data
-    print("📊 Loading ANOVA results and dataset...")
-    data = pd.read_csv('comprehensive_anova_data.csv')
-    anova_results = pd.read_csv('anova_results.csv')
-    
-    # Set up the plotting style
-    plt.style.use('seaborn-v0_8')
-    fig = plt.figure(figsize=(20, 15))
-    
-    # 1. ANOVA Results Summary (Effect Sizes and Significance)
-    ax1 = plt.subplot(3, 3, 1)
-    
-    # Prepare data for plotting
-    anova_results['Variable_Pair'] = anova_results['Independent_Variable'] + '\n→ ' + anova_results['Dependent_Variable']
-    anova_results['Log_P_Value'] = -np.log10(anova_results['P_value'])
-    
+from association import association_matrix, associations
+from plot_aggregates import bubble_counts, group_box_stats
+from report import (effect_magnitude, inputs_hash, pair_title, strongest_pairs, summary_text,
+                    variable_label)
+from result_cache import CACHE_DIR, ResultCache, stale_reasons
+from score_store import load_scores
+
+# Mapped scores: CSV, Parquet or a score_store.py .scores bundle
+DATA_FILE = 'comprehensive_anova_data.csv'
+PLOT_COLUMNS = ['WiFi_Speed_Score', 'Reliability_Score', 'Peak_Performance_Score',
+                'Task_Abandonment_Score', 'Time_Lost_Score', 'Productivity_Influence_Score']
+WIFI_GROUPS = {1: 'Very Poor', 2: 'Poor', 3: 'Average', 4: 'Good'}
+# Short axis labels of factor levels in the box plots (others show the score)
+LEVEL_LABELS = {'WiFi_Speed_Score': WIFI_GROUPS}
+# Panel 7 bubbles: area of the most crowded grid point, sideways offset per issue
+BUBBLE_AREA = 600
+BUBBLE_SHIFT = 0.08
+
+PANEL_DIR = 'anova_panels'
+PANEL_SIZE = (20 / 3, 5)  # one cell of the 20×15 composite
+PANEL_DPI = 150
+# Part of every panel hash: bump when a drawing function changes
+RENDER_VERSION = 4
+
+
+def load_inputs(data_file, results_file, columns):
+    """Stale-checked ANOVA results and the ``columns`` of the data they came from."""
+    # Refuse to plot results computed from different data
+    reasons = stale_reasons(results_file, lambda cols: load_scores(data_file, columns=cols))
+    if reasons is None:
+        print(f"⚠️  {results_file} has no fingerprint sidecar; cannot check it against the data")
+    elif reasons:
+        for reason in reasons:
+            print(f"❌ Stale {results_file}: {reason}")
+        raise SystemExit("Re-run perform_anova.py before plotting")
+    return load_scores(data_file, columns=columns), pd.read_csv(results_file)
+
+
+def draw_effect_vs_significance(ax, results):
+    """Panel 1: effect size against -log10 p, significant pairs numbered."""
+    log_p = -np.log10(results['P_value'])
+
     # Create scatter plot of effect size vs significance
-    colors = ['red' if sig else 'gray' for sig in anova_results['Significant']]
-    scatter = ax1.scatter(anova_results['Effect_Size'], anova_results['Log_P_Value'], 
-                         c=colors, s=100, alpha=0.7)
-    
+    colors = ['red' if sig else 'gray' for sig in results['Significant']]
+    ax.scatter(results['Effect_Size'], log_p, c=colors, s=100, alpha=0.7)
+
     # Add significance line
-    ax1.axhline(y=-np.log10(0.05), color='blue', linestyle='--', alpha=0.5, label='p=0.05 threshold')
-    
+    ax.axhline(y=-np.log10(0.05), color='blue', linestyle='--', alpha=0.5, label='p=0.05 threshold')
+
     # Annotate significant points
-    for i, row in anova_results.iterrows():
-        if row['Significant']:
-            ax1.annotate(f"{i+1}", (row['Effect_Size'], row['Log_P_Value']), 
-                        xytext=(5, 5), textcoords='offset points', fontsize=8)
-    
-    ax1.set_xlabel('Effect Size (η²)')
-    ax1.set_ylabel('-log₁₀(p-value)')
-    ax1.set_title('ANOVA Results: Effect Size vs Significance')
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
-    
-    # 2. WiFi Speed vs Task Abandonment (Most Significant Result)
-    ax2 = plt.subplot(3, 3, 2)
-    
-    # Create box plot for the most significant finding
-    wifi_groups = {1: 'Very Poor', 2: 'Poor', 3: 'Average', 4: 'Good'}
-    data['WiFi_Category'] = data['WiFi_Speed_Score'].map(wifi_groups)
-    
-    sns.boxplot(data=data, x='WiFi_Category', y='Task_Abandonment_Score', ax=ax2)
-    ax2.set_title('WiFi Speed → Task Abandonment\n(F=22.45, p<0.001)')
-    ax2.set_ylabel('Task Abandonment Score')
-    ax2.set_xlabel('WiFi Speed Category')
-    plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
-    
-    # 3. WiFi Speed vs Time Lost (Second Most Significant)
-    ax3 = plt.subplot(3, 3, 3)
-    
-    sns.boxplot(data=data, x='WiFi_Category', y='Time_Lost_Score', ax=ax3)
-    ax3.set_title('WiFi Speed → Time Lost\n(F=8.03, p=0.001)')
-    ax3.set_ylabel('Time Lost Score')
-    ax3.set_xlabel('WiFi Speed Category')
-    plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45)
-    
-    # 4. Effect Sizes Bar Chart
-    ax4 = plt.subplot(3, 3, 4)
-    
+    for i, (effect, lp, sig) in enumerate(zip(results['Effect_Size'], log_p, results['Significant'])):
+        if sig:
+            ax.annotate(f"{i+1}", (effect, lp), xytext=(5, 5), textcoords='offset points', fontsize=8)
+
+    ax.set_xlabel('Effect Size (η²)')
+    ax.set_ylabel('-log₁₀(p-value)')
+    ax.set_title('ANOVA Results: Effect Size vs Significance')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def draw_group_box(ax, stats, title, xlabel, ylabel):
+    """Box plot from per-group quantiles (``plot_aggregates.group_box_stats``), styled like ``sns.boxplot``."""
+    line = '.26'
+    ax.bxp(stats, widths=0.8, patch_artist=True,
+           boxprops={'facecolor': sns.desaturate(sns.color_palette()[0], 0.75), 'edgecolor': line},
+           medianprops={'color': line}, whiskerprops={'color': line}, capprops={'color': line},
+           flierprops={'marker': 'o', 'markerfacecolor': 'none', 'markeredgecolor': line})
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    ax.set_xlabel(xlabel)
+    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+
+
+def draw_effect_bars(ax, results):
+    """Panel 4: effect sizes, with bootstrap intervals when present."""
     # Sort by effect size
-    sorted_results = anova_results.sort_values('Effect_Size', ascending=True)
+    sorted_results = results.sort_values('Effect_Size', ascending=True)
     y_pos = np.arange(len(sorted_results))
-    
-    bars = ax4.barh(y_pos, sorted_results['Effect_Size'], 
-                   color=['red' if sig else 'gray' for sig in sorted_results['Significant']])
-    
-    ax4.set_yticks(y_pos)
-    ax4.set_yticklabels([f"{row['Independent_Variable'][:8]}→{row['Dependent_Variable'][:8]}" 
-                        for _, row in sorted_results.iterrows()], fontsize=8)
-    ax4.set_xlabel('Effect Size (η²)')
-    ax4.set_title('Effect Sizes by Variable Pair')
-    ax4.grid(True, alpha=0.3, axis='x')
-    
+
+    # Bootstrap intervals are only present when perform_anova.py ran with --bootstrap
+    xerr = None
+    if {'Effect_Size_CI_Low', 'Effect_Size_CI_High'}.issubset(sorted_results.columns):
+        xerr = np.vstack([sorted_results['Effect_Size'] - sorted_results['Effect_Size_CI_Low'],
+                          sorted_results['Effect_Size_CI_High'] - sorted_results['Effect_Size']])
+
+    ax.barh(y_pos, sorted_results['Effect_Size'], xerr=xerr, capsize=3,
+            color=['red' if sig else 'gray' for sig in sorted_results['Significant']])
+
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels([f"{iv[:8]}→{dv[:8]}" for iv, dv in
+                        zip(sorted_results['Independent_Variable'], sorted_results['Dependent_Variable'])],
+                       fontsize=8)
+    ax.set_xlabel('Effect Size (η²)')
+    ax.set_title('Effect Sizes by Variable Pair')
+    ax.grid(True, alpha=0.3, axis='x')
+
     # Add effect size interpretation lines
-    ax4.axvline(x=0.01, color='green', linestyle=':', alpha=0.5, label='Small (0.01)')
-    ax4.axvline(x=0.06, color='orange', linestyle=':', alpha=0.5, label='Medium (0.06)')
-    ax4.axvline(x=0.14, color='red', linestyle=':', alpha=0.5, label='Large (0.14)')
-    ax4.legend(loc='lower right', fontsize=8)
-    
-    # 5. Correlation Heatmap of Key Variables
-    ax5 = plt.subplot(3, 3, 5)
-    
-    key_vars = ['WiFi_Speed_Score', 'Reliability_Score', 'Peak_Performance_Score', 
-                'Task_Abandonment_Score', 'Time_Lost_Score', 'Productivity_Influence_Score']
-    corr_matrix = data[key_vars].corr()
-    
-    sns.heatmap(corr_matrix, annot=True, cmap='RdBu_r', center=0, 
-                square=True, ax=ax5, cbar_kws={'shrink': 0.8})
-    ax5.set_title('Correlation Matrix\n(Key Variables)')
-    plt.setp(ax5.xaxis.get_majorticklabels(), rotation=45, ha='right')
-    plt.setp(ax5.yaxis.get_majorticklabels(), rotation=0)
-    
-    # 6. Distribution of WiFi Speed Scores
-    ax6 = plt.subplot(3, 3, 6)
-    
-    counts = data['WiFi_Speed_Score'].value_counts().sort_index()
-    ax6.bar(counts.index, counts.values, color='skyblue', alpha=0.7)
-    ax6.set_xlabel('WiFi Speed Score')
-    ax6.set_ylabel('Number of Students')
-    ax6.set_title('Distribution of WiFi Speed Ratings')
-    ax6.set_xticks([1, 2, 3, 4])
-    ax6.set_xticklabels(['Very Poor', 'Poor', 'Average', 'Good'])
-    
+    ax.axvline(x=0.01, color='green', linestyle=':', alpha=0.5, label='Small (0.01)')
+    ax.axvline(x=0.06, color='orange', linestyle=':', alpha=0.5, label='Medium (0.06)')
+    ax.axvline(x=0.14, color='red', linestyle=':', alpha=0.5, label='Large (0.14)')
+    ax.legend(loc='lower right', fontsize=8)
+
+
+def draw_correlation(ax, corr_matrix):
+    """Panel 5: Spearman correlation heatmap of the key variables."""
+    sns.heatmap(corr_matrix, annot=True, cmap='RdBu_r', center=0,
+                square=True, ax=ax, cbar_kws={'shrink': 0.8})
+    ax.set_title('Spearman Correlation\n(Key Variables)')
+    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    plt.setp(ax.yaxis.get_majorticklabels(), rotation=0)
+
+
+def draw_wifi_distribution(ax, counts):
+    """Panel 6: how many students gave each WiFi speed rating (``counts`` indexed by score)."""
+    ax.bar(counts.index, counts.values, color='skyblue', alpha=0.7)
+    ax.set_xlabel('WiFi Speed Score')
+    ax.set_ylabel('Number of Students')
+    ax.set_title('Distribution of WiFi Speed Ratings')
+    ax.set_xticks([1, 2, 3, 4])
+    ax.set_xticklabels(['Very Poor', 'Poor', 'Average', 'Good'])
+
     # Add count labels on bars
     for i, v in enumerate(counts.values):
-        ax6.text(counts.index[i], v + 0.1, str(v), ha='center', va='bottom')
-    
-    # 7. Peak Performance vs Issues Scatter
-    ax7 = plt.subplot(3, 3, 7)
-    
-    ax7.scatter(data['Peak_Performance_Score'], data['Task_Abandonment_Score'], 
-               color='red', alpha=0.6, label='Task Abandonment')
-    ax7.scatter(data['Peak_Performance_Score'], data['Time_Lost_Score'], 
-               color='blue', alpha=0.6, label='Time Lost')
-    
-    ax7.set_xlabel('Peak Performance Score')
-    ax7.set_ylabel('Issue Score')
-    ax7.set_title('Peak Performance vs Performance Issues')
-    ax7.legend()
-    ax7.grid(True, alpha=0.3)
-    
-    # 8. F-Statistics Comparison
-    ax8 = plt.subplot(3, 3, 8)
-    
-    f_stats = anova_results['F_statistic'].values
-    labels = [f"{row['Independent_Variable'][:8]}\n→{row['Dependent_Variable'][:8]}" 
-              for _, row in anova_results.iterrows()]
-    
-    bars = ax8.bar(range(len(f_stats)), f_stats, 
-                  color=['red' if sig else 'gray' for sig in anova_results['Significant']])
-    
-    ax8.set_xticks(range(len(f_stats)))
-    ax8.set_xticklabels(labels, rotation=45, ha='right', fontsize=8)
-    ax8.set_ylabel('F-statistic')
-    ax8.set_title('F-statistics by Variable Pair')
-    ax8.grid(True, alpha=0.3, axis='y')
-    
+        ax.text(counts.index[i], v + 0.1, str(v), ha='center', va='bottom')
+
+
+def draw_peak_scatter(ax, task_abandonment, time_lost):
+    """Panel 7: peak-hour performance against both performance issues.
+
+    The scores sit on a 1–5 grid, so each issue is one bubble per grid point
+    with its area proportional to the number of students there; the two
+    issues are shifted apart so they do not hide each other.
+    """
+    largest = max(task_abandonment['Count'].max(), time_lost['Count'].max())
+    for counts, column, color, label, shift in [
+            (task_abandonment, 'Task_Abandonment_Score', 'red', 'Task Abandonment', -BUBBLE_SHIFT),
+            (time_lost, 'Time_Lost_Score', 'blue', 'Time Lost', BUBBLE_SHIFT)]:
+        ax.scatter(counts['Peak_Performance_Score'] + shift, counts[column],
+                   s=BUBBLE_AREA * counts['Count'] / largest, color=color, alpha=0.6, label=label)
+
+    ax.set_xlabel('Peak Performance Score')
+    ax.set_ylabel('Issue Score')
+    ax.set_title('Peak Performance vs Performance Issues')
+    for handle in ax.legend().legend_handles:
+        handle.set_sizes([40])
+    ax.grid(True, alpha=0.3)
+
+
+def draw_f_statistics(ax, results):
+    """Panel 8: F statistic of every pair."""
+    f_stats = results['F_statistic'].values
+    labels = [f"{iv[:8]}\n→{dv[:8]}" for iv, dv in zip(results['Independent_Variable'], results['Dependent_Variable'])]
+
+    ax.bar(range(len(f_stats)), f_stats, color=['red' if sig else 'gray' for sig in results['Significant']])
+
+    ax.set_xticks(range(len(f_stats)))
+    ax.set_xticklabels(labels, rotation=45, ha='right', fontsize=8)
+    ax.set_ylabel('F-statistic')
+    ax.set_title('F-statistics by Variable Pair')
+    ax.grid(True, alpha=0.3, axis='y')
+
     # Add F-statistic values on bars
     for i, v in enumerate(f_stats):
-        ax8.text(i, v + 0.5, f'{v:.1f}', ha='center', va='bottom', fontsize=8)
-    
-    # 9. Summary Statistics Table
-    ax9 = plt.subplot(3, 3, 9)
-    ax9.axis('off')
-    
-    # Create summary text
-    total_tests = len(anova_results)
-    significant_tests = anova_results['Significant'].sum()
-    max_effect = anova_results['Effect_Size'].max()
-    min_p_value = anova_results['P_value'].min()
-    
-    summary_text = f"""ANOVA ANALYSIS SUMMARY
-
-Total Tests Performed: {total_tests}
-Significant Results: {significant_tests} ({significant_tests/total_tests*100:.1f}%)
-
-Strongest Effects:
-• WiFi Speed → Task Abandonment
-  F = 22.45, p < 0.001, η² = 0.53
-
-• WiFi Speed → Time Lost  
-  F = 8.03, p = 0.001, η² = 0.29
-
-• Peak Performance → Time Lost
-  F = 6.66, p = 0.003, η² = 0.25
-
-Key Findings:
-✓ WiFi speed significantly affects 
-  task abandonment and time lost
-
-✓ Peak performance during high usage
-  impacts productivity issues
-
-✓ Reliability alone shows weaker
-  associations with outcomes
-
-Effect Size Interpretation:
-Small: η² ≥ 0.01, Medium: η² ≥ 0.06
-Large: η² ≥ 0.14
-"""
-    
-    ax9.text(0.05, 0.95, summary_text, transform=ax9.transAxes, fontsize=10,
-             verticalalignment='top', fontfamily='monospace',
-             bbox=dict(boxstyle='round,pad=0.5', facecolor='lightgray', alpha=0.8))
-    
+        ax.text(i, v + 0.5, f'{v:.1f}', ha='center', va='bottom', fontsize=8)
+
+
+def draw_summary(ax, text):
+    """Panel 9: summary text (``report.summary_text``)."""
+    ax.axis('off')
+    ax.text(0.05, 0.95, text, transform=ax.transAxes, fontsize=10,
+            verticalalignment='top', fontfamily='monospace',
+            bbox=dict(boxstyle='round,pad=0.5', facecolor='lightgray', alpha=0.8))
+
+
+def box_job(data, row):
+    """Inputs of a box plot of one result row's dependent by its factor, titled with its F and p."""
+    factor, dependent = row['Independent_Variable'], row['Dependent_Variable']
+    labels = LEVEL_LABELS.get(factor)
+    return {'stats': group_box_stats(data, factor, dependent, labels),
+            'title': pair_title(row),
+            'xlabel': variable_label(factor) + (' Category' if labels else ''),
+            'ylabel': variable_label(dependent) + ' Score'}
+
+
+def plot_columns(results, pairs=True):
+    """Data columns the panels need: the fixed ones, the two strongest pairs and, with ``pairs``,
+    every significant pair."""
+    shown = strongest_pairs(results, 2)
+    if pairs:
+        shown = pd.concat([shown, results[results['Significant'].astype(bool)]])
+    return list(dict.fromkeys(PLOT_COLUMNS + shown['Independent_Variable'].tolist()
+                              + shown['Dependent_Variable'].tolist()))
+
+
+def panel_jobs(data, results, pairs=True, cache_dir=CACHE_DIR):
+    """(name, drawing function, keyword inputs) of the nine panels and, with ``pairs``, every significant pair's box plot.
+
+    Each panel gets the aggregates it draws (group quantiles, grid counts,
+    correlations) rather than raw rows, so drawing and hashing scale with the
+    number of score levels, and a panel's hash changes only when what it
+    shows changes. Rank correlations are served from the association cache
+    in ``cache_dir`` when the columns are unchanged.
+    """
+    pair_columns = ['Independent_Variable', 'Dependent_Variable']
+    results = results.reset_index(drop=True)
+    strongest = strongest_pairs(results, 2)
+    spearman = association_matrix(associations(data, PLOT_COLUMNS, ResultCache(cache_dir)),
+                                  'Spearman_rho', PLOT_COLUMNS)
+    jobs = [
+        ('panel_1_effect_vs_significance', draw_effect_vs_significance,
+         {'results': results[['Effect_Size', 'P_value', 'Significant']]}),
+        ('panel_2_strongest_pair', draw_group_box, box_job(data, strongest.iloc[0])),
+        ('panel_3_second_pair', draw_group_box, box_job(data, strongest.iloc[-1])),
+        ('panel_4_effect_sizes', draw_effect_bars,
+         {'results': results[pair_columns + ['Effect_Size', 'Significant']
+                             + [c for c in ('Effect_Size_CI_Low', 'Effect_Size_CI_High') if c in results]]}),
+        ('panel_5_correlation', draw_correlation, {'corr_matrix': spearman}),
+        ('panel_6_wifi_distribution', draw_wifi_distribution,
+         {'counts': data['WiFi_Speed_Score'].value_counts().sort_index()}),
+        ('panel_7_peak_scatter', draw_peak_scatter,
+         {'task_abandonment': bubble_counts(data, 'Peak_Performance_Score', 'Task_Abandonment_Score'),
+          'time_lost': bubble_counts(data, 'Peak_Performance_Score', 'Time_Lost_Score')}),
+        ('panel_8_f_statistics', draw_f_statistics,
+         {'results': results[pair_columns + ['F_statistic', 'Significant']]}),
+        ('panel_9_summary', draw_summary, {'text': summary_text(results)}),
+    ]
+    if not pairs:
+        return jobs
+    for _, row in results[results['Significant'].astype(bool)].iterrows():
+        jobs.append((f"pair_{row['Independent_Variable']}__{row['Dependent_Variable']}", draw_group_box,
+                     box_job(data, row)))
+    return jobs
+
+
+def input_hash(draw, inputs, dpi):
+    """SHA-256 of a panel's drawing function, inputs and resolution."""
+    return inputs_hash(inputs, RENDER_VERSION, draw.__name__, dpi)
+
+
+def render_panel(draw, inputs, path, dpi=PANEL_DPI, figsize=PANEL_SIZE):
+    """Draw one panel into its own Agg figure and save it (runs in a worker process)."""
+    from matplotlib import style
+    from matplotlib.figure import Figure
+
+    with style.context('seaborn-v0_8'):
+        fig = Figure(figsize=figsize)  # no pyplot state, always the Agg canvas
+        draw(fig.add_subplot(), **inputs)
+        fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    return str(path)
+
+
+def render_panels(data, results, directory=PANEL_DIR, workers=None, dpi=PANEL_DPI, force=False):
+    """Render every panel of ``panel_jobs`` to ``directory``, skipping unchanged ones.
+
+    ``directory/manifest.json`` records each panel's input hash; panels of
+    pairs that are no longer significant are deleted. Returns
+    ({name: path} of all current panels, names redrawn).
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / 'manifest.json'
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    paths, todo, hashes = {}, [], {}
+    for name, draw, inputs in panel_jobs(data, results):
+        paths[name] = directory / f"{name}.png"
+        hashes[name] = input_hash(draw, inputs, dpi)
+        if force or manifest.get(name) != hashes[name] or not paths[name].exists():
+            todo.append((name, draw, inputs))
+
+    for name in set(manifest) - set(paths):
+        (directory / f"{name}.png").unlink(missing_ok=True)
+        del manifest[name]
+
+    if workers is None:
+        workers = min(len(todo), os.cpu_count() or 1)
+    if workers <= 1 or len(todo) <= 1:
+        for name, draw, inputs in todo:
+            render_panel(draw, inputs, paths[name], dpi)
+            manifest[name] = hashes[name]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(render_panel, draw, inputs, paths[name], dpi)
+                       for name, draw, inputs in todo}
+            for name, future in futures.items():
+                future.result()
+                manifest[name] = hashes[name]
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return paths, [name for name, _, _ in todo]
+
+
+def assemble_composite(paths, output, columns=3):
+    """Tile panel images row by row into one image (white padding to the largest panel)."""
+    from matplotlib import image
+
+    images = [image.imread(path) for path in paths]
+    height = max(img.shape[0] for img in images)
+    width = max(img.shape[1] for img in images)
+    rows = -(-len(images) // columns)
+    canvas = np.ones((rows * height, columns * width, 4), dtype=np.float32)
+    for i, img in enumerate(images):
+        if img.shape[2] == 3:
+            img = np.dstack([img, np.ones(img.shape[:2], dtype=img.dtype)])
+        top, left = (i // columns) * height, (i % columns) * width
+        canvas[top:top + img.shape[0], left:left + img.shape[1]] = img
+    image.imsave(output, canvas)
+    return output
+
+
+def render_anova_panels(data_file=DATA_FILE, results_file='anova_results.csv', directory=PANEL_DIR,
+                        workers=None, dpi=PANEL_DPI, force=False, composite=None):
+    """Panel mode: independent, incrementally re-rendered panel images plus an optional composite."""
+    print("📊 Loading ANOVA results and dataset...")
+    data, results = load_inputs(data_file, results_file, plot_columns(pd.read_csv(results_file)))
+    paths, redrawn = render_panels(data, results, directory, workers, dpi, force)
+    print(f"🖼️  {len(redrawn)} of {len(paths)} panels redrawn in {directory}/ "
+          f"({len(paths) - len(redrawn)} unchanged)")
+    if composite:
+        assemble_composite([path for name, path in paths.items() if name.startswith('panel_')], composite)
+        print(f"📊 Composite of the nine panels saved as '{composite}'")
+    return paths, redrawn
+
+
+def create_anova_visualizations(data_file=DATA_FILE, results_file='anova_results.csv',
+                                output='anova_results_visualization.png', show=True):
+    """Create comprehensive visualizations of ANOVA results"""
+
+    # Load the data
+    print("📊 Loading ANOVA results and dataset...")
+    data, anova_results = load_inputs(data_file, results_file,
+                                      plot_columns(pd.read_csv(results_file), pairs=False))
+
+    # Set up the plotting style
+    plt.style.use('seaborn-v0_8')
+    fig = plt.figure(figsize=(20, 15))
+
+    # The same nine panels panel mode renders separately
+    for position, (_, draw, inputs) in enumerate(panel_jobs(data, anova_results, pairs=False), start=1):
+        draw(plt.subplot(3, 3, position), **inputs)
+
     plt.tight_layout()
-    plt.savefig('anova_results_visualization.png', dpi=300, bbox_inches='tight')
-    print("📊 Visualization saved as 'anova_results_visualization.png'")
-    
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    print(f"📊 Visualization saved as '{output}'")
+
     # Create a detailed results table
     print("\n" + "="*80)
     print("DETAILED ANOVA RESULTS TABLE")
     print("="*80)
-    
+
     for i, row in anova_results.iterrows():
         sig_symbol = "✅" if row['Significant'] else "❌"
-        effect_size_interpretation = (
-            "Large" if row['Effect_Size'] >= 0.14 else
-            "Medium" if row['Effect_Size'] >= 0.06 else
-            "Small" if row['Effect_Size'] >= 0.01 else
-            "Negligible"
-        )
-        
+        effect_size_interpretation = effect_magnitude(row['Effect_Size'])
+
         print(f"\n{i+1}. {row['Independent_Variable']} → {row['Dependent_Variable']}")
         print(f"   F-statistic: {row['F_statistic']:.3f}")
         print(f"   P-value: {row['P_value']:.6f}")
         print(f"   Significant: {sig_symbol}")
         print(f"   Effect Size (η²): {row['Effect_Size']:.3f} ({effect_size_interpretation})")
-    
-    plt.show()
+
+    if show:
+        plt.show()
     return anova_results, data
 
-if __name__ == "__main__":
-    results, data = create_anova_visualizations()
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Plot the ANOVA results")
+    parser.add_argument('--data', default=DATA_FILE, help="mapped scores: CSV, Parquet or a .scores bundle")
+    parser.add_argument('--results', default='anova_results.csv', help="ANOVA results from perform_anova.py")
+    parser.add_argument('-o', '--output', default='anova_results_visualization.png')
+    parser.add_argument('--no-show', action='store_true', help="only save the figure")
+    parser.add_argument('--panels', nargs='?', const=PANEL_DIR, metavar='DIR',
+                        help=f"render each panel and significant pair separately into DIR (default: {PANEL_DIR}), "
+                             "redrawing only panels whose inputs changed")
+    parser.add_argument('--workers', type=int, help="processes for panel mode (default: one per CPU)")
+    parser.add_argument('--dpi', type=int, default=PANEL_DPI, help="panel mode resolution")
+    parser.add_argument('--force', action='store_true', help="panel mode: redraw every panel")
+    parser.add_argument('--composite', action='store_true', help="panel mode: also tile the nine panels into --output")
+    args = parser.parse_args(argv)
+    if args.panels:
+        return render_anova_panels(args.data, args.results, args.panels, args.workers, args.dpi,
+                                   args.force, args.output if args.composite else None)
+    if args.no_show:
+        plt.switch_backend('Agg')
+    results, data = create_anova_visualizations(args.data, args.results, args.output, show=not args.no_show)
     print("\n🎉 ANOVA analysis and visualization complete!")
     print("📋 All results saved and visualized successfully!")
+    return results, data
+
+if __name__ == "__main__":
+    main()